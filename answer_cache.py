@@ -0,0 +1,160 @@
+"""
+answer_cache.py
+---------------
+Remembers the voice agent's answers so repeated questions skip the LLM.
+
+An entry is keyed by the normalised question text and remembers which
+tools the agent called (with their arguments) and a fingerprint of what
+those tools returned. On a repeat question the same tool calls are re-run
+— cheap HTTP requests, usually served from room_booking_client's GET
+cache — and the stored answer is reused only if the fingerprint still
+matches, so an answer never outlives the booking data it was based on.
+Answers that used a volatile tool (the clock) are never stored.
+
+Entries also expire after ttl seconds, the cache is bounded to
+max_entries, and invalidate() drops everything (the voice agent calls it
+whenever room_booking_client books or cancels). Fuzzy matching of
+near-identical wording is available through fuzzy_threshold but off by
+default: "bookings for room A" and "... room B" differ by one letter.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from intent_router import normalize
+
+DEFAULT_TTL = 600
+DEFAULT_MAX_ENTRIES = 256
+VOLATILE_TOOLS = ("get_current_datetime",)
+
+_FILLER = re.compile(r"\b(please|hey|hi|ok|okay|um|uh|so|can you tell me|could you tell me|tell me)\b")
+
+ToolCall = Tuple[str, Dict]
+
+
+def cache_key(text: str) -> str:
+    """normalize() plus dropping filler words and stray colons, so wording noise maps to one key."""
+    text = re.sub(r"(?<!\d):|:(?!\d)", " ", normalize(text))
+    return re.sub(r"\s+", " ", _FILLER.sub(" ", text)).strip()
+
+
+def fingerprint(outputs: List[str]) -> str:
+    return hashlib.sha1(json.dumps(outputs).encode()).hexdigest()
+
+
+class ToolRecorder(BaseCallbackHandler):
+    """LangChain callback that records each tool call and its output, in order."""
+
+    def __init__(self):
+        self._pending: Dict[Any, ToolCall] = {}
+        self.calls: List[Tuple[str, Dict, str]] = []
+
+    def on_tool_start(self, serialized, input_str, *, run_id=None, inputs=None, **kwargs):
+        self._pending[run_id] = (serialized.get("name", ""), dict(inputs or {}))
+
+    def on_tool_end(self, output, *, run_id=None, **kwargs):
+        name, args = self._pending.pop(run_id, ("", {}))
+        self.calls.append((name, args, str(getattr(output, "content", output))))
+
+
+@dataclass
+class CachedAnswer:
+    answer: str
+    tool_calls: List[ToolCall]
+    fingerprint: str
+    expires_at: float
+
+
+class AnswerCache:
+    """
+    run_tool(name, args) -> str re-executes a recorded tool call when an
+    entry is validated; fuzzy_threshold (0–1, e.g. 0.9) enables matching
+    of similar questions by difflib ratio.
+    """
+
+    def __init__(self, run_tool: Callable[[str, Dict], str], ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, fuzzy_threshold: Optional[float] = None):
+        self.run_tool = run_tool
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold
+        self._entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.fuzzy_hits = self.misses = self.stale = 0
+
+    def _find(self, key: str) -> Tuple[Optional[str], Optional[CachedAnswer]]:
+        entry = self._entries.get(key)
+        if entry is not None or not self.fuzzy_threshold:
+            return key, entry
+        best, best_ratio = None, self.fuzzy_threshold
+        for other in self._entries:
+            ratio = SequenceMatcher(None, key, other).ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = other, ratio
+        return best, self._entries.get(best) if best else None
+
+    def get(self, text: str) -> Optional[str]:
+        """The cached answer to text if its tool data is unchanged, else None."""
+        key = cache_key(text)
+        with self._lock:
+            found, entry = self._find(key)
+            if entry is not None and time.monotonic() >= entry.expires_at:
+                del self._entries[found]
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # Re-run the recorded tool calls outside the lock (network I/O)
+        outputs = [self.run_tool(name, args) for name, args in entry.tool_calls]
+        with self._lock:
+            if fingerprint(outputs) != entry.fingerprint:
+                self._entries.pop(found, None)
+                self.stale += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(found)
+            self.hits += 1
+            self.fuzzy_hits += found != key
+        return entry.answer
+
+    def put(self, text: str, answer: str, calls: List[Tuple[str, Dict, str]]) -> bool:
+        """Store an answer with the (name, args, output) tool calls behind it."""
+        if any(name in VOLATILE_TOOLS for name, _, _ in calls):
+            return False
+        entry = CachedAnswer(
+            answer=answer,
+            tool_calls=[(name, args) for name, args, _ in calls],
+            fingerprint=fingerprint([output for _, _, output in calls]),
+            expires_at=time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            self._entries[cache_key(text)] = entry
+            self._entries.move_to_end(cache_key(text))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,148 @@
+"""
+batch_transcribe.py
+-------------------
+Transcribe many WAV files in parallel and write the results as JSONL.
+
+Files are spread across a process pool; each worker loads the Vosk model
+once when it starts (see speech_to_text.get_model) and reuses it for every
+file it is handed. Results are yielded and written as soon as each file
+finishes, so a long overnight run can be followed with ``tail -f``.
+
+Each output line looks like:
+
+  {"file": "...", "text": "...", "audio_seconds": 12.4,
+   "elapsed_seconds": 1.9, "worker": 4242, "error": null}
+
+Usage:
+    python batch_transcribe.py recordings/ -o transcripts.jsonl
+    python batch_transcribe.py "recordings/**/*.wav" --workers 8
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import speech_to_text  # noqa: E402
+
+DEFAULT_MODEL_PATH = "vosk-model-small-en-us-0.15"
+
+
+def collect_audio_files(source: str) -> List[str]:
+    """Return the sorted .wav files in a directory, or the files matching a glob."""
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.wav")
+    else:
+        pattern = source
+    return sorted(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+
+
+def _init_worker(model_path: str) -> None:
+    """Pool initializer: load the model once per worker process."""
+    speech_to_text.get_model(model_path)
+
+
+def transcribe_one(file_path: str, model_path: str, vad_threshold: Optional[float] = None,
+                   chunk_frames: int = 4000) -> dict:
+    """Transcribe one file and return its JSONL record; errors are captured, not raised."""
+    started = time.perf_counter()
+    record = {"file": file_path, "text": None, "audio_seconds": None,
+              "elapsed_seconds": None, "worker": os.getpid(), "error": None}
+    try:
+        with wave.open(file_path, "rb") as wf:
+            record["audio_seconds"] = round(wf.getnframes() / wf.getframerate(), 3)
+        record["text"] = speech_to_text.transcribe_file(
+            file_path, model_path, vad_threshold, chunk_frames=chunk_frames
+        )
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    record["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def transcribe_batch(
+    files: List[str],
+    model_path: str,
+    output_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    vad_threshold: Optional[float] = None,
+    chunk_frames: int = 4000,
+) -> Iterator[dict]:
+    """
+    Transcribe *files* and yield one record per file in completion order.
+
+    workers — pool size (default: os.cpu_count()); 1 runs in this process
+    output_path — when given, each record is also appended there as a JSONL line
+    vad_threshold — skip audio quieter than this RMS level (see EnergyGate)
+    chunk_frames — frames handed to the recognizer per call
+    """
+    out = open(output_path, "a", encoding="utf-8") if output_path else None
+    try:
+        for record in _run(files, model_path, workers or os.cpu_count() or 1,
+                           (vad_threshold, chunk_frames)):
+            if out:
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+            yield record
+    finally:
+        if out:
+            out.close()
+
+
+def _run(files: List[str], model_path: str, workers: int, options: tuple) -> Iterator[dict]:
+    if workers == 1 or len(files) <= 1:
+        for path in files:
+            yield transcribe_one(path, model_path, *options)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(files)),
+        initializer=_init_worker,
+        initargs=(model_path,),
+    ) as pool:
+        futures = [pool.submit(transcribe_one, path, model_path, *options) for path in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch-transcribe WAV files with Vosk.")
+    parser.add_argument("source", help="directory of .wav files or a glob pattern")
+    parser.add_argument("-o", "--output", default="transcripts.jsonl", help="JSONL file to append to")
+    parser.add_argument("-m", "--model", default=DEFAULT_MODEL_PATH, help="Vosk model folder")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--vad-threshold", type=float, default=None,
+                        help="skip audio below this RMS level (e.g. 300); default feeds everything")
+    parser.add_argument("--chunk-frames", type=int, default=4000,
+                        help="frames per recognizer call (see bench_transcribe.py)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"ERROR: Vosk model not found: {args.model}")
+        sys.exit(1)
+    files = collect_audio_files(args.source)
+    if not files:
+        print(f"No .wav files found for: {args.source}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    failed = 0
+    records = transcribe_batch(files, args.model, args.output, args.workers,
+                               args.vad_threshold, args.chunk_frames)
+    for done, record in enumerate(records, start=1):
+        status = "ERROR " + record["error"] if record["error"] else f"{record['elapsed_seconds']:.2f}s"
+        print(f"[{done}/{len(files)}] {record['file']}  {status}")
+        failed += bool(record["error"])
+
+    print(f"\n{len(files)} files in {time.perf_counter() - started:.1f}s, {failed} failed → {args.output}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+bench_transcribe.py
+-------------------
+Compare chunk sizes for feeding a WAV file to the recognizer.
+
+For each chunk size the file is read end to end twice — once through
+``wave.readframes`` (a fresh bytes copy per chunk) and once through
+speech_to_text.WavSource (zero-copy memoryview slices of an mmap) — and,
+when a model is given, transcribed in full. Every run is repeated and the
+best time is reported, so page-cache warm-up does not skew the table.
+
+Usage:
+    python bench_transcribe.py board_meeting.wav
+    python bench_transcribe.py board_meeting.wav -m vosk-model-small-en-us-0.15 \
+        --sizes 1000,4000,16000,64000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+import wave
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import speech_to_text  # noqa: E402
+
+DEFAULT_SIZES = (1000, 4000, 16000, 64000)
+
+
+def read_with_wave(file_path: str, chunk_frames: int) -> int:
+    """Read the file with wave.readframes; returns the number of bytes seen."""
+    total = 0
+    with wave.open(file_path, "rb") as wf:
+        while True:
+            data = wf.readframes(chunk_frames)
+            if not data:
+                return total
+            total += len(data)
+
+
+def read_with_mmap(file_path: str, chunk_frames: int) -> int:
+    """Read the file through WavSource; returns the number of bytes seen."""
+    return sum(len(chunk) for chunk in speech_to_text.WavSource(file_path, chunk_frames))
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_benchmark(file_path: str, sizes: List[int], model_path: Optional[str] = None,
+                  repeat: int = 3) -> List[dict]:
+    """Time each reader (and transcription, with a model) per chunk size."""
+    if model_path:
+        speech_to_text.get_model(model_path)     # keep model loading out of the timings
+    results = []
+    for size in sizes:
+        row = {
+            "chunk_frames": size,
+            "wave_seconds": best_of(repeat, lambda: read_with_wave(file_path, size)),
+            "mmap_seconds": best_of(repeat, lambda: read_with_mmap(file_path, size)),
+            "transcribe_seconds": None,
+        }
+        if model_path:
+            row["transcribe_seconds"] = best_of(
+                repeat, lambda: speech_to_text.transcribe_file(file_path, model_path, chunk_frames=size)
+            )
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark WAV chunk sizes for transcription.")
+    parser.add_argument("file", help="WAV file to read")
+    parser.add_argument("-m", "--model", default=None, help="Vosk model folder (also time transcription)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated chunk sizes in frames")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    with wave.open(args.file, "rb") as wf:
+        audio_seconds = wf.getnframes() / wf.getframerate()
+    print(f"{args.file}: {audio_seconds:.1f}s of audio, best of {args.repeat}\n")
+
+    print(f"{'frames':>8}  {'readframes':>11}  {'mmap':>9}  {'transcribe':>11}  {'x realtime':>10}")
+    for row in run_benchmark(args.file, sizes, args.model, args.repeat):
+        line = f"{row['chunk_frames']:>8}  {row['wave_seconds']:>10.4f}s  {row['mmap_seconds']:>8.4f}s"
+        if row["transcribe_seconds"] is not None:
+            speed = audio_seconds / row["transcribe_seconds"]
+            line += f"  {row['transcribe_seconds']:>10.2f}s  {speed:>9.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
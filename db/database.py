@@ -12,22 +12,139 @@ Schema (from the real db.sqlite3 provided for Sprint 4):
   member_customuser      (id, username, email, ...)
 """
 
+import atexit
 import os
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from typing import Optional
 
 
 # ---------------------------------------------------------------------------
-# Connection helper
+# Connection manager
 # ---------------------------------------------------------------------------
 
+# Applied once, when a pooled connection is first opened.
+DEFAULT_PRAGMAS = {
+    "foreign_keys": "ON",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,           # negative = KiB, so ~16 MB
+    "mmap_size": 64 * 1024 * 1024,
+    "busy_timeout": 5000,           # ms to wait on a locked DB
+}
+
+# Size of sqlite3's per-connection prepared-statement cache.
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionManager:
+    """
+    Keeps one long-lived SQLite connection per thread for a single
+    database file.
+
+    Pragmas are applied once when a thread's connection is opened and
+    sqlite3 re-uses prepared statements from its statement cache, so
+    repeated calls skip the connect / configure / compile work.
+    If the file on disk is replaced (different inode) the stale
+    connection is dropped and a new one opened.
+    """
+
+    def __init__(self, db_path: str, pragmas: Optional[dict] = None):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = []             # every live connection, for close()
+
+    def _file_id(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._open.append(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if conn in self._open:
+                self._open.remove(conn)
+        conn.close()
+
+    def get(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        file_id = self._file_id()
+        if conn is not None and file_id != self._local.file_id:
+            self._discard(conn)
+            conn = None
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            self._local.file_id = self._file_id()
+        return conn
+
+    def close(self) -> None:
+        """Close every connection opened by any thread."""
+        with self._lock:
+            conns, self._open = self._open, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+
+_managers: dict = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path: str) -> ConnectionManager:
+    """Return the shared ConnectionManager for *db_path*."""
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = ConnectionManager(db_path)
+    return manager
+
+
+def close_connections(db_path: Optional[str] = None) -> None:
+    """
+    Close pooled connections for *db_path*, or for every database
+    when no path is given. Safe to call more than once.
+    """
+    with _managers_lock:
+        if db_path is None:
+            managers = list(_managers.values())
+            _managers.clear()
+        else:
+            manager = _managers.pop(os.path.abspath(db_path), None)
+            managers = [manager] if manager else []
+    for manager in managers:
+        manager.close()
+
+
+atexit.register(close_connections)
+
+
 def get_connection(db_path: str) -> sqlite3.Connection:
-    """Return a row_factory-enabled connection with FK enforcement on."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    """
+    Return the pooled, row_factory-enabled connection for *db_path*
+    (FK enforcement on). Use it as ``with get_connection(p) as conn:``
+    — the block commits or rolls back but leaves the connection open.
+    """
+    return get_manager(db_path).get()
 
 
 # ---------------------------------------------------------------------------
@@ -55,10 +172,61 @@ def get_room_by_id(db_path: str, room_id: int) -> Optional[dict]:
     return dict(row) if row else None
 
 
+def get_rooms_with_booking_counts(db_path: str,
+                                  now: Optional[str] = None) -> list:
+    """
+    Return every room (ordered by id) with two aggregate columns added:
+
+      booking_count — total bookings referencing the room
+      next_booking  — earliest start_time at or after *now*, or None
+
+    Everything comes from one grouped query, so callers that only need
+    counts don't have to fetch each room's full booking list.
+    *now* defaults to the current UTC time in the DB's text format, since
+    Django stores start_time in UTC (USE_TZ = True).
+    """
+    if now is None:
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    with get_connection(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT r.id, r.room_name, r.capacity, r.is_active,
+                   COUNT(b.id) AS booking_count,
+                   MIN(CASE WHEN b.start_time >= ? THEN b.start_time END)
+                       AS next_booking
+              FROM booking_meetingroom r
+              LEFT JOIN booking_bookinghistory b
+                     ON b.meeting_room_id = r.id
+             GROUP BY r.id
+             ORDER BY r.id
+            """,
+            (now,),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
 # ---------------------------------------------------------------------------
 # Room mutations
 # ---------------------------------------------------------------------------
 
+def validate_room_name(name: str) -> str:
+    """Return *name* stripped; raise ValueError if it is not text or is blank."""
+    if not isinstance(name, str):
+        raise ValueError("Room name must be text.")
+    name = name.strip()
+    if not name:
+        raise ValueError("Room name cannot be empty.")
+    return name
+
+
+def validate_capacity(capacity: int) -> None:
+    """Raise ValueError unless *capacity* is a whole number >= 1."""
+    if isinstance(capacity, bool) or not isinstance(capacity, int):
+        raise ValueError("Capacity must be a whole number.")
+    if capacity < 1:
+        raise ValueError("Capacity must be at least 1.")
+
+
 def add_room(db_path: str, name: str, capacity: int,
              amenities: str = "") -> int:
     """
@@ -68,13 +236,10 @@ def add_room(db_path: str, name: str, capacity: int,
     schema does not have an amenities column — the value is silently
     ignored.
 
-    Raises ValueError for empty name or capacity < 1.
+    Raises ValueError for a missing/empty name or capacity < 1.
     """
-    name = name.strip()
-    if not name:
-        raise ValueError("Room name cannot be empty.")
-    if capacity < 1:
-        raise ValueError("Capacity must be at least 1.")
+    name = validate_room_name(name)
+    validate_capacity(capacity)
 
     with get_connection(db_path) as conn:
         cur = conn.execute(
@@ -136,8 +301,7 @@ def update_room_capacity(db_path: str, room_id: int,
 
     Raises ValueError for capacity < 1 or unknown room_id.
     """
-    if new_capacity < 1:
-        raise ValueError("Capacity must be at least 1.")
+    validate_capacity(new_capacity)
 
     with get_connection(db_path) as conn:
         result = conn.execute(
@@ -149,6 +313,91 @@ def update_room_capacity(db_path: str, room_id: int,
             raise ValueError(f"Room {room_id} does not exist.")
 
 
+# ---------------------------------------------------------------------------
+# Bulk mutations (one transaction, one commit)
+# ---------------------------------------------------------------------------
+
+def add_rooms_bulk(db_path: str, rooms: list) -> list:
+    """
+    Insert many rooms in a single transaction. *rooms* is a list of
+    ``(name, capacity)`` pairs. Returns the new ids in input order.
+
+    Every row is validated before anything is written; if any row is
+    invalid a ValueError naming each bad row (0-based) is raised and
+    the database is left untouched.
+    """
+    rows, errors = [], []
+    for i, (name, capacity) in enumerate(rooms):
+        try:
+            validate_capacity(capacity)
+            rows.append((validate_room_name(name), capacity))
+        except ValueError as exc:
+            errors.append(f"row {i}: {exc}")
+    if errors:
+        raise ValueError("; ".join(errors))
+    if not rows:
+        return []
+
+    with get_connection(db_path) as conn:
+        # Take the write lock first so the new ids are exactly those
+        # above the current maximum.
+        conn.execute("BEGIN IMMEDIATE")
+        last_id = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM booking_meetingroom"
+        ).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO booking_meetingroom "
+            "(room_name, capacity, is_active) VALUES (?, ?, 1)",
+            rows,
+        )
+        ids = conn.execute(
+            "SELECT id FROM booking_meetingroom WHERE id > ? ORDER BY id",
+            (last_id,),
+        ).fetchall()
+    return [r["id"] for r in ids]
+
+
+def update_capacities_bulk(db_path: str, updates: list) -> None:
+    """
+    Set many room capacities in a single transaction. *updates* is a
+    list of ``(room_id, new_capacity)`` pairs.
+
+    Raises ValueError (and writes nothing) if any capacity is invalid
+    or any room_id does not exist.
+    """
+    errors = []
+    for i, (room_id, capacity) in enumerate(updates):
+        try:
+            validate_capacity(capacity)
+        except ValueError as exc:
+            errors.append(f"row {i}: {exc}")
+    if errors:
+        raise ValueError("; ".join(errors))
+    if not updates:
+        return
+
+    wanted = {room_id for room_id, _ in updates}
+    with get_connection(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        placeholders = ", ".join("?" * len(wanted))
+        found = {
+            r["id"] for r in conn.execute(
+                f"SELECT id FROM booking_meetingroom "
+                f"WHERE id IN ({placeholders})",
+                tuple(wanted),
+            )
+        }
+        missing = sorted(wanted - found)
+        if missing:
+            raise ValueError(
+                "Rooms do not exist: " + ", ".join(map(str, missing))
+            )
+        conn.executemany(
+            "UPDATE booking_meetingroom SET capacity = ? WHERE id = ?",
+            [(capacity, room_id) for room_id, capacity in updates],
+        )
+
+
 # ---------------------------------------------------------------------------
 # Booking helpers (read-only)
 # ---------------------------------------------------------------------------
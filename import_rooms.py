@@ -0,0 +1,114 @@
+"""
+import_rooms.py
+---------------
+Bulk-load rooms into the meeting-room database from a CSV or JSON file.
+
+Each row either adds a new room or, when it carries an ``id``, sets the
+capacity of that existing room:
+
+  CSV  — header row with ``room_name,capacity`` and an optional ``id``
+  JSON — a list of objects with the same keys
+
+Bad rows are reported and skipped; every valid row is applied with one
+transaction for new rooms and one for capacity updates.
+
+Usage:
+    python import_rooms.py db.sqlite3 rooms.csv
+    python import_rooms.py db.sqlite3 rooms.json
+"""
+
+import csv
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from db.database import (  # noqa: E402
+    add_rooms_bulk,
+    get_all_rooms,
+    update_capacities_bulk,
+    validate_capacity,
+    validate_room_name,
+)
+
+
+def read_rows(path: str) -> list:
+    """Return the rows of a .csv or .json file as a list of dicts."""
+    ext = os.path.splitext(path)[1].lower()
+    # utf-8-sig drops the byte-order mark Excel puts at the start of CSV exports
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        if ext == ".csv":
+            return list(csv.DictReader(fh))
+        if ext == ".json":
+            rows = json.load(fh)
+            if not isinstance(rows, list):
+                raise ValueError("JSON import file must contain a list.")
+            return rows
+    raise ValueError(f"Unsupported file type: {ext or path}")
+
+
+def _parse_int(value, field: str) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{field} must be a whole number.") from None
+
+
+def import_rooms(db_path: str, path: str) -> dict:
+    """
+    Import every row of *path* into *db_path*.
+
+    Returns a report dict:
+      added   — ids of the newly created rooms
+      updated — number of capacities changed
+      errors  — list of (row_number, message) for skipped rows,
+                row_number being 1-based over the data rows
+    """
+    existing = {r["id"] for r in get_all_rooms(db_path)}
+    new_rooms, updates, errors = [], [], []
+
+    for row_no, row in enumerate(read_rows(path), start=1):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("Row must be an object.")
+            capacity = _parse_int(row.get("capacity", ""), "Capacity")
+            validate_capacity(capacity)
+            room_id = row.get("id")
+            if room_id not in (None, ""):
+                room_id = _parse_int(room_id, "id")
+                if room_id not in existing:
+                    raise ValueError(f"Room {room_id} does not exist.")
+                updates.append((room_id, capacity))
+            else:
+                name = validate_room_name(row.get("room_name", ""))
+                new_rooms.append((name, capacity))
+        except ValueError as exc:
+            errors.append((row_no, str(exc)))
+
+    added = add_rooms_bulk(db_path, new_rooms)
+    update_capacities_bulk(db_path, updates)
+    return {"added": added, "updated": len(updates), "errors": errors}
+
+
+def main() -> None:
+    if len(sys.argv) != 3:
+        print("Usage: python import_rooms.py <db.sqlite3> <rooms.csv|json>")
+        sys.exit(2)
+    db_path, path = sys.argv[1], sys.argv[2]
+    if not os.path.exists(db_path):
+        print(f"ERROR: database not found: {db_path}")
+        sys.exit(1)
+
+    report = import_rooms(db_path, path)
+    print(f"Rooms added       : {len(report['added'])}")
+    print(f"Capacities updated: {report['updated']}")
+    print(f"Rows skipped      : {len(report['errors'])}")
+    for row_no, message in report["errors"]:
+        print(f"  row {row_no}: {message}")
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
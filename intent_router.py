@@ -0,0 +1,199 @@
+"""
+intent_router.py
+----------------
+Fast path for the voice agent's everyday questions.
+
+Most questions map straight onto one of the read-only booking tools
+("do I have bookings today", "what rooms are free", "what time is it").
+IntentRouter recognises those with regular expressions that must match the
+whole question (after polite filler such as "hey" or "please" is dropped),
+calls the tool directly and phrases the result for speech, so they skip the
+LLM's tool-calling round trip. Anything it is not confident about — other
+days, booking or cancelling, extra qualifiers ("... with Bob"), unrecognised
+wording — returns None and goes to the LangChain agent as before.
+
+Every answered question is timed per path ("fast" or "agent"); report()
+gives the fast-path hit rate and the latency of each path.
+"""
+
+import re
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+DEFAULT_CONFIDENCE = 0.75
+
+# Questions about other days, or asking us to change something, are beyond
+# what the read-only tools answer — leave those to the agent.
+_OUT_OF_SCOPE = re.compile(
+    r"\b(tomorrow|yesterday|next|last|week|month|monday|tuesday|wednesday|thursday|friday|"
+    r"saturday|sunday|book|cancel|reserve|move|change|delete|and|also|then)\b"
+)
+
+# A "room" that is really a time ("bookings for today", "... this week")
+_NOT_A_DATE = (r"(?!.*\b(today|tonight|tomorrow|yesterday|this|next|last|week|weekend|month|"
+               r"monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b)")
+
+# Politeness around a question that doesn't change what is asked
+_FILLER_PREFIX = re.compile(r"^((hey|hi|ok|okay|so|um|uh|please)\s+)+")
+_FILLER_SUFFIX = re.compile(r"(\s+(please|thanks|thank you))+$")
+
+
+def normalize(text: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace."""
+    text = re.sub(r"[^\w\s:']", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+@dataclass
+class Intent:
+    """A question shape answered by a single tool call."""
+    name: str
+    tool: str
+    patterns: List[Pattern]
+    args: Callable[[re.Match], Dict] = lambda match: {}
+    scoped: bool = True   # False: _OUT_OF_SCOPE words don't apply (e.g. the clock)
+
+
+def strip_filler(query: str) -> str:
+    """Drop polite words before and after a normalised question."""
+    return _FILLER_SUFFIX.sub("", _FILLER_PREFIX.sub("", query))
+
+
+def _room_args(match: re.Match) -> Dict:
+    room = re.sub(r"^the\s+", "", match.group("room").strip())
+    return {"room_name": room}
+
+
+INTENTS = [
+    Intent(
+        "current_time", "get_current_datetime",
+        [re.compile(r"^(what'?s|what is|tell me) the (time|date)( now| today)?$"),
+         re.compile(r"^what time is it( now)?$"),
+         re.compile(r"^what (day|date) is (it|today)( today)?$"),
+         re.compile(r"^(what'?s|what is) (today'?s|the current) date$"),
+         re.compile(r"^(what'?s|what is) today$")],
+        scoped=False,
+    ),
+    Intent(
+        "bookings_today", "get_my_bookings_today",
+        [re.compile(r"^(do|have) i (got |have )?(any )?(bookings?|reservations?|meetings?)( booked)? (for )?today$"),
+         re.compile(r"^((what are|show me|list) )?my (bookings?|reservations?|meetings?|schedule) (for )?today$"),
+         re.compile(r"^what('?s| is) on my schedule (for )?today$"),
+         re.compile(r"^what do i have (on )?today$")],
+    ),
+    Intent(
+        "available_rooms", "list_available_rooms_now_or_soon",
+        [re.compile(r"^(what|which|any|are there( any)?) (meeting )?rooms? (are |is )?"
+                    r"(free|available|open|empty)( right)?( now)?$"),
+         re.compile(r"^(is there|are there) (a |any )?(free|available|open|empty) (meeting )?rooms?( right)?( now)?$")],
+    ),
+    Intent(
+        "room_bookings", "get_bookings_for_room",
+        [re.compile(r"^((what are|show me|list) )?(the |my )?(bookings?|reservations?) (for|in|of) "
+                    r"(?P<room>" + _NOT_A_DATE + r"(room )?[\w' ]{1,40})$"),
+         re.compile(r"^when is my (booking|reservation|meeting) (for|in) "
+                    r"(?P<room>" + _NOT_A_DATE + r"(room )?[\w' ]{1,40})$")],
+        args=_room_args,
+    ),
+]
+
+
+def speakable(tool_output: str) -> str:
+    """Turn a tool's bullet-list text into sentences that read well aloud."""
+    lines = [line.strip().lstrip("•").strip() for line in tool_output.splitlines() if line.strip()]
+    if len(lines) <= 1:
+        return tool_output.strip()
+    heading, items = lines[0].rstrip(":"), [item.replace(" – ", " to ") for item in lines[1:]]
+    return f"{heading}: " + "; ".join(items) + "."
+
+
+def _say_datetime(iso: str) -> str:
+    moment = datetime.fromisoformat(iso)
+    return f"It's {moment.strftime('%I:%M %p').lstrip('0')} on {moment.strftime('%A, %B')} {moment.day}."
+
+
+@dataclass
+class RouterStats:
+    """Per-path answer counts and latencies (seconds)."""
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: {"fast": [], "agent": []})
+    intents: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, path: str, seconds: float, intent: Optional[str] = None) -> None:
+        self.latencies.setdefault(path, []).append(seconds)
+        if intent:
+            self.intents[intent] = self.intents.get(intent, 0) + 1
+
+    def report(self) -> Dict:
+        total = sum(len(v) for v in self.latencies.values())
+        report = {
+            "questions": total,
+            "fast_path_hit_rate": len(self.latencies["fast"]) / total if total else 0.0,
+            "intents": dict(self.intents),
+        }
+        for path, values in self.latencies.items():
+            report[path] = {
+                "count": len(values),
+                "mean_ms": round(statistics.fmean(values) * 1000, 1) if values else None,
+                "median_ms": round(statistics.median(values) * 1000, 1) if values else None,
+            }
+        return report
+
+
+class IntentRouter:
+    """
+    Answers common questions by calling the matching tool directly.
+
+    tools — the agent's LangChain tools; intents whose tool is missing are ignored
+    min_confidence — classify() scores below this fall back to the agent
+    """
+
+    def __init__(self, tools: Iterable, intents: Optional[List[Intent]] = None,
+                 min_confidence: float = DEFAULT_CONFIDENCE):
+        self.tools = {t.name: t for t in tools}
+        self.intents = [i for i in (intents or INTENTS) if i.tool in self.tools]
+        self.min_confidence = min_confidence
+        self.stats = RouterStats()
+
+    def classify(self, text: str) -> Tuple[Optional[Intent], Dict, float]:
+        """
+        Best matching intent, its tool arguments and a 0–1 confidence.
+
+        Confidence scales with the share of the question's words the pattern
+        matched, so words left over (a pattern without ^...$ anchors matching
+        only part of the question) push it below min_confidence.
+        """
+        query = strip_filler(normalize(text))
+        words = len(query.split()) or 1
+        out_of_scope = bool(_OUT_OF_SCOPE.search(query))
+        best: Tuple[Optional[Intent], Dict, float] = (None, {}, 0.0)
+        for intent in self.intents:
+            for pattern in intent.patterns:
+                match = pattern.search(query)
+                if match is None:
+                    continue
+                base = 0.3 if out_of_scope and intent.scoped else 0.9
+                confidence = base * min(1.0, len(match.group(0).split()) / words)
+                if confidence > best[2]:
+                    best = (intent, intent.args(match), confidence)
+        return best
+
+    def answer(self, text: str) -> Optional[str]:
+        """The spoken answer to text, or None to hand it to the agent."""
+        started = time.perf_counter()
+        intent, args, confidence = self.classify(text)
+        if intent is None or confidence < self.min_confidence:
+            return None
+        output = self.tools[intent.tool].invoke(args)
+        answer = _say_datetime(output) if intent.name == "current_time" else speakable(output)
+        self.stats.record("fast", time.perf_counter() - started, intent.name)
+        return answer
+
+    def record_agent(self, seconds: float) -> None:
+        """Log a question that went through the LangChain agent."""
+        self.stats.record("agent", seconds)
+
+    def report(self) -> Dict:
+        return self.stats.report()
@@ -0,0 +1,138 @@
+"""
+latency_trace.py
+----------------
+Per-stage timing spans for the voice pipeline.
+
+Tracer.span(stage) times a block (calibration, listening, recognition,
+the fast path, the agent, TTS …) and SpanCallbackHandler, passed to the
+LangChain agent as a callback, adds a span for every model call ("llm")
+and every tool call ("tool", with the tool's name) made inside it. Spans
+are kept in memory for summary() — count, p50 and p95 per stage — and,
+when a path is given, appended to a JSONL trace file as they finish:
+
+    {"ts": 1760709900.12, "turn": 3, "stage": "tool", "ms": 84.2, "tool": "get_my_bookings_today"}
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """q-th percentile (0–100) of values, linearly interpolated; None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Tracer:
+    """
+    Collects timing spans. Thread-safe: the TTS worker records its spans
+    from its own thread. turn numbers group the spans of one question.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.turn = 0
+        self.durations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    def new_turn(self) -> int:
+        with self._lock:
+            self.turn += 1
+            return self.turn
+
+    def record(self, stage: str, seconds: float, **attrs: Any) -> None:
+        """Log a finished span of the given length."""
+        ms = round(seconds * 1000, 2)
+        with self._lock:
+            self.durations.setdefault(stage, []).append(ms)
+            if self._file is not None:
+                entry = {"ts": round(time.time(), 3), "turn": self.turn, "stage": stage, "ms": ms, **attrs}
+                self._file.write(json.dumps(entry) + "\n")
+                self._file.flush()
+
+    @contextmanager
+    def span(self, stage: str, **attrs: Any):
+        """Time the with-block as one span; an exception is noted and re-raised."""
+        started = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - started, **attrs)
+
+    def summary(self) -> Dict[str, Dict]:
+        """count, p50_ms and p95_ms for every stage seen."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": len(values),
+                    "p50_ms": round(percentile(values, 50), 1),
+                    "p95_ms": round(percentile(values, 95), 1),
+                }
+                for stage, values in self.durations.items()
+            }
+
+    def format_summary(self) -> str:
+        lines = [f"{'stage':<12} {'count':>5} {'p50 ms':>9} {'p95 ms':>9}"]
+        for stage, row in sorted(self.summary().items()):
+            lines.append(f"{stage:<12} {row['count']:>5} {row['p50_ms']:>9} {row['p95_ms']:>9}")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class SpanCallbackHandler(BaseCallbackHandler):
+    """LangChain callback that records an "llm" span per model call and a "tool" span per tool call."""
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._started: Dict[Any, tuple] = {}
+
+    def _start(self, run_id, stage: str, **attrs) -> None:
+        self._started[run_id] = (stage, time.perf_counter(), attrs)
+
+    def _end(self, run_id, error: Optional[BaseException] = None) -> None:
+        stage, started, attrs = self._started.pop(run_id, (None, 0.0, {}))
+        if stage is None:
+            return
+        if error is not None:
+            attrs["error"] = type(error).__name__
+        self.tracer.record(stage, time.perf_counter() - started, **attrs)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id=None, **kwargs):
+        self._start(run_id, "llm")
+
+    def on_llm_start(self, serialized, prompts, *, run_id=None, **kwargs):
+        self._start(run_id, "llm")
+
+    def on_llm_end(self, response, *, run_id=None, **kwargs):
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id=None, **kwargs):
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id=None, **kwargs):
+        self._start(run_id, "tool", tool=(serialized or {}).get("name", ""))
+
+    def on_tool_end(self, output, *, run_id=None, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id=None, **kwargs):
+        self._end(run_id, error)
@@ -0,0 +1,113 @@
+"""
+ollama_warmup.py
+----------------
+Keeps the voice agent's Ollama model loaded.
+
+Ollama loads a model on its first request and unloads it after keep_alive
+(5 minutes by default) without one, so the first question after start-up,
+or after a quiet spell, pays the whole model load. OllamaKeepAlive sends a
+load-only request (an empty prompt to /api/generate) as soon as it starts,
+then again every interval seconds. Each request also renews keep_alive.
+Everything runs on a daemon thread, so the listen loop never waits on it.
+A failed request (Ollama not running yet) is counted and retried on the
+next heartbeat.
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, Optional
+
+DEFAULT_KEEP_ALIVE = "30m"
+DEFAULT_INTERVAL = 240      # seconds; well inside Ollama's default 5 minute unload
+DEFAULT_TIMEOUT = 120       # a cold load of a large model can take a while
+
+
+def load_model(base_url: str, model: str, keep_alive: str = DEFAULT_KEEP_ALIVE,
+               timeout: float = DEFAULT_TIMEOUT) -> float:
+    """Ask Ollama to load model (no generation); returns the seconds it took."""
+    body = json.dumps({"model": model, "prompt": "", "stream": False, "keep_alive": keep_alive})
+    request = urllib.request.Request(
+        base_url.rstrip("/") + "/api/generate",
+        data=body.encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+class OllamaKeepAlive:
+    """
+    Background warm-up and heartbeat for one Ollama model.
+
+    interval — seconds between heartbeats; 0 or None warms up once only
+    on_request(kind, seconds, error) — optional hook per request, where kind
+    is "warm_up" or "heartbeat" and error is None on success (e.g. for tracing)
+    """
+
+    def __init__(self, base_url: str, model: str, keep_alive: str = DEFAULT_KEEP_ALIVE,
+                 interval: Optional[float] = DEFAULT_INTERVAL, timeout: float = DEFAULT_TIMEOUT,
+                 on_request: Optional[Callable[[str, float, Optional[Exception]], None]] = None):
+        self.base_url = base_url
+        self.model = model
+        self.keep_alive = keep_alive
+        self.interval = interval
+        self.timeout = timeout
+        self.on_request = on_request
+        self.ready = threading.Event()      # set once the model has loaded
+        self.warm_up_seconds: Optional[float] = None
+        self.heartbeats = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ollama-keep-alive", daemon=True)
+
+    def ping(self, kind: str = "heartbeat") -> bool:
+        """Send one load request now; returns True on success."""
+        started = time.perf_counter()
+        try:
+            seconds = load_model(self.base_url, self.model, self.keep_alive, self.timeout)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            if self.on_request is not None:
+                self.on_request(kind, time.perf_counter() - started, e)
+            return False
+        if self.ready.is_set():
+            self.heartbeats += 1
+        else:
+            self.warm_up_seconds = seconds
+            self.ready.set()
+        if self.on_request is not None:
+            self.on_request(kind, seconds, None)
+        return True
+
+    def _run(self) -> None:
+        self.ping("warm_up")
+        if not self.interval:
+            return
+        while not self._stop.wait(self.interval):
+            self.ping("heartbeat" if self.ready.is_set() else "warm_up")
+
+    def start(self) -> "OllamaKeepAlive":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2)
+
+    def stats(self) -> Dict:
+        return {
+            "ready": self.ready.is_set(),
+            "warm_up_seconds": self.warm_up_seconds,
+            "heartbeats": self.heartbeats,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
@@ -1,37 +1,379 @@
+import base64
+import json
 import requests
 import os
+import threading
+import time
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
 from langchain_core.tools import tool
 
-load_dotenv() # loads .env file
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (3.05, 15)  # (connect, read) seconds
+TOKEN_REFRESH_MARGIN = 60     # refresh the access token this many seconds before it expires
+DEFAULT_CACHE_TTL = 30        # seconds a GET response is served from memory
+DEFAULT_CACHE_SIZE = 128      # GET responses kept at most (least recently used go first)
 
-SERVER_URL = os.getenv("SERVER_URL")
-EMAIL = os.getenv("EMAIL")
-PASSWORD = os.getenv("PASSWORD")
+LOGIN_ENDPOINT = "/api/v1/member/login/"
+REFRESH_ENDPOINT = "/api/v1/member/token/refresh/"
 
-if not all([SERVER_URL, EMAIL, PASSWORD]):
-    raise ValueError("Missing SERVER_URL, EMAIL or PASSWORD in .env file")
 
+def decode_token_expiry(token: str) -> Optional[float]:
+    """
+    Returns the 'exp' claim (epoch seconds) of a JWT without verifying it,
+    or None if the token can't be decoded. Only used to schedule refreshes;
+    the server still validates every token.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
 
-def get_auth_token() -> str:
+
+_change_listeners: List[Callable[[], None]] = []
+
+
+def add_change_listener(listener: Callable[[], None]) -> None:
+    """Call listener() after every successful booking change (POST/DELETE)."""
+    if listener not in _change_listeners:
+        _change_listeners.append(listener)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache whose entries also expire after ttl seconds.
+    A ttl of 0 disables caching. Counters are exposed through stats().
     """
-    Logs in once and returns a fresh access token.
-    Caches in memory for the current process (simple approach).
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.expired = self.evictions = self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.expired += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+
+class RoomBookingClient:
     """
-    global _cached_token
-    if _cached_token is None:
-        endpoint = "/api/v1/member/login/"
-        data = {"email": EMAIL, "password": PASSWORD}
-        response = requests.post(SERVER_URL + endpoint, json=data)
+    Room booking API client built on one pooled requests.Session.
+
+    Connections are kept alive and reused across calls (no new TCP/TLS
+    handshake per request). pool_size caps the connections kept open per
+    host and timeout is passed to every request.
+
+    GET responses (each page of a list) are cached for cache_ttl seconds,
+    keyed by endpoint and query params, up to cache_size entries. Any
+    successful POST/DELETE — booking or cancelling — clears the cache.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        email: str,
+        password: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.server_url = server_url.rstrip("/")
+        self.email = email
+        self.password = password
+        self.timeout = timeout
+        self._token: Optional[str] = None
+        self._token_expiry: Optional[float] = None
+        self._refresh_token: Optional[str] = None
+        # Tool calls may run in parallel threads: only one of them refreshes or logs in
+        self._auth_lock = threading.Lock()
+        self.cache = ResponseCache(cache_ttl, cache_size)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "RoomBookingClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _set_access_token(self, token: str) -> None:
+        self._token = token
+        self._token_expiry = decode_token_expiry(token)
+
+    def _login(self) -> None:
+        """Full email/password login; caches both access and refresh tokens."""
+        data = {"email": self.email, "password": self.password}
+        response = self.session.post(
+            self.server_url + LOGIN_ENDPOINT, json=data, timeout=self.timeout
+        )
         response.raise_for_status()
-        json_data = response.json()
-        _cached_token = json_data["token"]["access"]
-    return _cached_token
+        tokens = response.json()["token"]
+        self._refresh_token = tokens.get("refresh")
+        self._set_access_token(tokens["access"])
+
+    def _refresh(self) -> bool:
+        """Swaps the cached refresh token for a new access token. Returns success."""
+        if not self._refresh_token:
+            return False
+        response = self.session.post(
+            self.server_url + REFRESH_ENDPOINT,
+            json={"refresh": self._refresh_token},
+            timeout=self.timeout,
+        )
+        if not response.ok:
+            self._refresh_token = None   # expired or revoked – fall back to login
+            return False
+        tokens = response.json()
+        if tokens.get("refresh"):
+            self._refresh_token = tokens["refresh"]
+        self._set_access_token(tokens["access"])
+        return True
+
+    def _token_is_fresh(self) -> bool:
+        if self._token is None:
+            return False
+        if self._token_expiry is None:
+            return True   # can't tell – rely on the 401 path
+        return time.time() < self._token_expiry - TOKEN_REFRESH_MARGIN
+
+    def get_auth_token(self) -> str:
+        """
+        Returns a valid access token. Refreshes it shortly before it expires
+        using the cached refresh token, and only logs in with email/password
+        when there is no usable refresh token.
+        """
+        if self._token_is_fresh():
+            return self._token
+        with self._auth_lock:
+            # Another thread may have renewed it while we waited for the lock
+            if not self._token_is_fresh():
+                if not self._refresh():
+                    self._login()
+            return self._token
+
+    def _discard_token(self, token: str) -> None:
+        """Forget a rejected access token, unless another thread already replaced it."""
+        with self._auth_lock:
+            if self._token == token:
+                self._token = None
+
+    def _send(self, method: str, url: str, params: Optional[Dict], json: Optional[Dict], token: str):
+        headers = {"Authorization": f"Bearer {token}"}
+        return self.session.request(
+            method, url, headers=headers, params=params, json=json, timeout=self.timeout
+        )
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+    ) -> requests.Response:
+        """Authenticated request with automatic token refresh on 401; returns the raw response."""
+        method = method.upper()
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+        url = self.server_url + endpoint
+
+        token = self.get_auth_token()
+        response = self._send(method, url, params, json, token)
+        if response.status_code == 401:
+            # token was rejected early (clock skew, revoked) – renew and retry once
+            self._discard_token(token)
+            response = self._send(method, url, params, json, self.get_auth_token())
+
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _decode(response: requests.Response):
+        if response.status_code == 204:
+            return {"success": True}
+        try:
+            return response.json()
+        except ValueError:
+            return {"message": response.text.strip()}
+
+    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Tuple[Any, Optional[str]]:
+        """GET through the response cache; returns (decoded body, next-page URL)."""
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = self._request("GET", endpoint, params=params)
+        value = (self._decode(response), response.links.get("next", {}).get("url"))
+        self.cache.put(key, value)
+        return value
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+    ) -> Dict:
+        """Authenticated request returning the decoded JSON body (GETs may come from the cache)."""
+        if method.upper() == "GET":
+            return self._get(endpoint, params)[0]
+        response = self._request(method, endpoint, params=params, json=json)
+        self.cache.clear()   # bookings changed – cached lists are stale
+        for listener in list(_change_listeners):
+            listener()
+        return self._decode(response)
+
+    def iter_pages(self, endpoint: str, params: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Yields the items of a paginated list endpoint one by one, fetching the next
+        page (from the response's Link: rel="next" header) only when needed.
+        """
+        items, next_url = self._get(endpoint, params)
+        while True:
+            yield from items
+            if not next_url:
+                return
+            # next links are server-relative and already carry every query param
+            items, next_url = self._get(next_url)
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters of the GET response cache."""
+        return self.cache.stats()
+
+    def get_available_rooms(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[Dict]:
+        """Retrieves available rooms, optionally filtered by time range (all pages)."""
+        params = {}
+        if start_time:
+            params["start_time"] = start_time
+        if end_time:
+            params["end_time"] = end_time
+        return list(self.iter_pages("/api/v1/meeting-rooms/available/", params=params))
+
+    def book_room(self, room_id: int, start_time: str, end_time: str, no_of_persons: int = 1) -> Dict:
+        """Books a room for the given time range."""
+        data = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "no_of_persons": no_of_persons,
+        }
+        return self.request("POST", f"/api/v1/meeting-rooms/{room_id}/book/", json=data)
+
+    def get_my_bookings(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        room: Optional[str] = None,
+        room_id: Optional[int] = None,
+        upcoming: bool = False,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Lazily yields the authenticated user's bookings, ordered by start time,
+        requesting further pages from the server only as the caller iterates.
+        The optional filters are applied by the server (see MyBookingsView):
+        date_from/date_to are ISO dates or datetimes, room is a partial room name.
+        """
+        params = {
+            "date_from": date_from,
+            "date_to": date_to,
+            "room": room,
+            "room_id": room_id,
+            "upcoming": "true" if upcoming else None,
+            "limit": limit,
+            "page_size": page_size,
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+        return self.iter_pages("/api/v1/meeting-rooms/my-bookings/", params=params)
+
+    def cancel_booking(self, booking_id: int) -> bool:
+        """Cancels a single booking by ID."""
+        result = self.request("DELETE", f"/api/v1/meeting-rooms/{booking_id}/cancel-booking/")
+        return result.get("success", False)
+
+
+def load_settings() -> Tuple[str, str, str]:
+    """
+    Reads SERVER_URL, EMAIL and PASSWORD from the environment (and .env).
+    Called when the shared client is first needed, not at import time.
+    """
+    load_dotenv() # loads .env file
+    server_url = os.getenv("SERVER_URL")
+    email = os.getenv("EMAIL")
+    password = os.getenv("PASSWORD")
+    if not all([server_url, email, password]):
+        raise ValueError("Missing SERVER_URL, EMAIL or PASSWORD in .env file")
+    return server_url, email, password
 
 
-_cached_token: Optional[str] = None
+_client: Optional[RoomBookingClient] = None
+
+
+def get_client() -> RoomBookingClient:
+    """Returns the shared process-wide client used by the module functions."""
+    global _client
+    if _client is None:
+        _client = RoomBookingClient(*load_settings())
+    return _client
+
+
+def get_auth_token() -> str:
+    """
+    Returns a valid access token for the shared client, refreshing it
+    ahead of expiry instead of logging in again.
+    """
+    return get_client().get_auth_token()
 
 
 def _make_authenticated_request(
@@ -41,39 +383,7 @@ def _make_authenticated_request(
     json: Optional[Dict] = None,
 ) -> Dict:
     """Helper: authenticated request with automatic token refresh on 401."""
-    token = get_auth_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    url = SERVER_URL + endpoint
-
-    if method.upper() == "GET":
-        response = requests.get(url, headers=headers, params=params)
-    elif method.upper() == "POST":
-        response = requests.post(url, headers=headers, json=json)
-    elif method.upper() == "DELETE":
-        response = requests.delete(url, headers=headers)
-    else:
-        raise ValueError(f"Unsupported method: {method}")
-
-    if response.status_code == 401:
-        # token is probably expired
-        global _cached_token
-        _cached_token = None
-        token = get_auth_token()
-        headers["Authorization"] = f"Bearer {token}"
-        if method.upper() == "GET":
-            response = requests.get(url, headers=headers, params=params)
-        elif method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=json)
-        elif method.upper() == "DELETE":
-            response = requests.delete(url, headers=headers)
-
-    response.raise_for_status()
-    if response.status_code == 204:
-        return {"success": True}
-    try:
-        return response.json()
-    except ValueError:
-        return {"message": response.text.strip()}
+    return get_client().request(method, endpoint, params=params, json=json)
 
 
 #   Original functions (kept from sprint 2 and minorly edited)
@@ -87,37 +397,32 @@ def login() -> str:
 
 def get_available_rooms(start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[Dict]:
     """Retrieves available rooms, optionally filtered by time range."""
-    endpoint = "/api/v1/meeting-rooms/available/"
-    params = {}
-    if start_time:
-        params["start_time"] = start_time
-    if end_time:
-        params["end_time"] = end_time
-    return _make_authenticated_request("GET", endpoint, params=params)
+    return get_client().get_available_rooms(start_time, end_time)
 
 
 def book_room(room_id: int, start_time: str, end_time: str, no_of_persons: int = 1) -> Dict:
     """Books a room for the given time range."""
-    endpoint = f"/api/v1/meeting-rooms/{room_id}/book/"
-    data = {
-        "start_time": start_time,
-        "end_time": end_time,
-        "no_of_persons": no_of_persons,
-    }
-    return _make_authenticated_request("POST", endpoint, json=data)
+    return get_client().book_room(room_id, start_time, end_time, no_of_persons)
 
 
-def get_my_bookings() -> List[Dict]:
-    """Retrieves the authenticated user's booking history."""
-    endpoint = "/api/v1/meeting-rooms/my-bookings/"
-    return _make_authenticated_request("GET", endpoint)
+def get_my_bookings(**filters) -> Iterator[Dict]:
+    """Lazily yields the authenticated user's bookings (see RoomBookingClient.get_my_bookings)."""
+    return get_client().get_my_bookings(**filters)
 
 
 def cancel_booking(booking_id: int) -> bool:
     """Cancels a single booking by ID."""
-    endpoint = f"/api/v1/meeting-rooms/{booking_id}/cancel-booking/"
-    result = _make_authenticated_request("DELETE", endpoint)
-    return result.get("success", False)
+    return get_client().cancel_booking(booking_id)
+
+
+def cache_stats() -> Dict:
+    """Hit/miss counters of the shared client's GET cache."""
+    return get_client().cache_stats()
+
+
+def clear_cache() -> None:
+    """Forget every cached GET response of the shared client."""
+    get_client().cache.clear()
 
 
 
@@ -130,49 +435,45 @@ Use this for questions involving 'today', 'now', 'current time', etc."""
     return datetime.now().isoformat()
 
 
+def _room_name(booking: Dict) -> str:
+    """Room name of a booking as returned by my-bookings (nested meeting_room)."""
+    room = booking.get("meeting_room")
+    if isinstance(room, dict):
+        return room.get("room_name", "Unknown room")
+    return booking.get("room_name", booking.get("room", "Unknown room"))
+
+
 @tool
 def get_my_bookings_today() -> str:
     """Returns a human-readable summary of the user's bookings scheduled for today."""
-    bookings = get_my_bookings()
-    if not bookings:
-        return "You have no bookings at all."
-
-    today_str = datetime.now().strftime("%Y-%m-%d")
-    today_bookings = [
-        b for b in bookings
-        if b.get("start_time", "").startswith(today_str)
-    ]
+    # Local midnight → next midnight, with UTC offset so the server filters the right day
+    today = datetime.now().astimezone().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_bookings = list(get_my_bookings(
+        date_from=today.isoformat(),
+        date_to=(today + timedelta(days=1)).isoformat(),
+    ))
 
     if not today_bookings:
         return "You have no bookings today."
 
     lines = ["Your bookings today:"]
-    for b in sorted(today_bookings, key=lambda x: x.get("start_time", "")):
+    for b in today_bookings:
         start = b.get("start_time", "??").split("T")[-1][:5]  # HH:MM
         end = b.get("end_time", "??").split("T")[-1][:5]
-        room = b.get("room_name", b.get("room", "Unknown room"))
-        lines.append(f"• {room}  {start} – {end}")
+        lines.append(f"• {_room_name(b)}  {start} – {end}")
     return "\n".join(lines)
 
 
 @tool
 def get_bookings_for_room(room_name: str) -> str:
     """Returns a summary of all bookings for a given room name (case-insensitive partial match)."""
-    bookings = get_my_bookings()  #currently returns my bookings
-
-    if not bookings:
-        return "No bookings found (you have none)."
-
-    matching = [
-        b for b in bookings
-        if room_name.lower() in str(b.get("room_name", "") + b.get("room", "")).lower()
-    ]
+    matching = list(get_my_bookings(room=room_name))  # currently returns my bookings
 
     if not matching:
         return f"No bookings found for rooms matching '{room_name}'."
 
     lines = [f"Bookings matching '{room_name}':"]
-    for b in sorted(matching, key=lambda x: x.get("start_time", "")):
+    for b in matching:
         start = b.get("start_time", "?")
         end = b.get("end_time", "?")
         who = "you" if True else b.get("user", "someone")  # currently only bookings
@@ -189,7 +490,7 @@ def list_available_rooms_now_or_soon() -> str:
 
     lines = ["Available rooms right now:"]
     for r in rooms:
-        name = r.get("name", "Unnamed")
+        name = r.get("room_name", r.get("name", "Unnamed"))
         capacity = r.get("capacity", "?")
         lines.append(f"• {name} (capacity {capacity})")
     return "\n".join(lines)
@@ -203,7 +504,7 @@ def main():
     token = get_auth_token()
     print("Authenticated successfully.")
 
-    bookings = get_my_bookings()
+    bookings = list(get_my_bookings())
     print("My bookings:", bookings)
 
     avail = get_available_rooms()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MeetingRoom, BookingHistory
+from .models import MeetingRoom, BookingHistory, EmailOutbox
 
 @admin.register(MeetingRoom)
 class MeetingRoomAdmin(admin.ModelAdmin):
@@ -10,5 +10,12 @@ class MeetingRoomAdmin(admin.ModelAdmin):
 @admin.register(BookingHistory)
 class BookingHistoryAdmin(admin.ModelAdmin):
     list_display = ('meeting_room', 'id', 'start_time', 'end_time', 'no_of_persons', 'booked_by')
+    list_select_related = ('meeting_room', 'booked_by')
     search_fields = ('meeting_room__room_name', 'booked_by__email')
     list_filter = ('start_time', 'end_time', 'no_of_persons', 'booked_by', 'meeting_room')
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'id', 'to_email', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    search_fields = ('to_email', 'subject')
+    list_filter = ('status',)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BookingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.booking'
+
+    def ready(self):
+        # Register the signal handlers that keep the availability index in sync
+        from apps.booking import signals  # noqa: F401
@@ -0,0 +1,200 @@
+from bisect import bisect_left, insort
+from threading import RLock
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def _aware(value):
+    """
+    Return an aware datetime, treating naive values as being in the default timezone.
+    """
+    if timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+
+class RoomIntervals:
+    """
+    Sorted interval index of the bookings of one meeting room.
+
+    Bookings are kept sorted by start time alongside a running maximum of their
+    end times, so "does anything overlap [start, end)" is a single binary search:
+    every booking starting before ``end`` sits left of the bisection point, and one
+    of them overlaps iff the largest end time among them is after ``start``.
+
+    Attributes:
+        entries (list): (start_time, end_time, booking_id) tuples sorted by start.
+        max_ends (list): max_ends[i] is the latest end_time in entries[0..i].
+        loaded_at (float): Monotonic timestamp of the last full load from the database.
+        since (datetime): Bookings that ended before this were not loaded, so only
+            ranges starting at or after it can be answered (None: full history).
+    """
+
+    def __init__(self, bookings=(), loaded_at=None, since=None):
+        self.entries = sorted((_aware(s), _aware(e), pk) for s, e, pk in bookings)
+        self.by_id = {pk: (s, e) for s, e, pk in self.entries}
+        self.max_ends = []
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+        self.since = since
+        self._rebuild_max_ends(0)
+
+    def _rebuild_max_ends(self, index):
+        del self.max_ends[index:]
+        current = self.max_ends[-1] if self.max_ends else None
+        for _, end, _ in self.entries[index:]:
+            current = end if current is None or end > current else current
+            self.max_ends.append(current)
+
+    def add(self, booking_id, start_time, end_time):
+        """
+        Insert or move a booking in the index.
+        """
+        self.remove(booking_id)
+        entry = (_aware(start_time), _aware(end_time), booking_id)
+        insort(self.entries, entry)
+        self.by_id[booking_id] = entry[:2]
+        self._rebuild_max_ends(bisect_left(self.entries, entry))
+
+    def remove(self, booking_id):
+        """
+        Drop a booking from the index, if present.
+        """
+        times = self.by_id.pop(booking_id, None)
+        if times is None:
+            return
+        index = bisect_left(self.entries, (times[0], times[1], booking_id))
+        del self.entries[index]
+        self._rebuild_max_ends(index)
+
+    def covers(self, start_time):
+        """
+        Whether ranges starting at start_time can be answered from the loaded bookings.
+        A booking left out ended before ``since``, so it cannot overlap such a range.
+        """
+        return self.since is None or _aware(start_time) >= self.since
+
+    def is_free(self, start_time, end_time):
+        """
+        Checks whether no booking overlaps the half-open range [start_time, end_time).
+
+        Returns:
+            bool: True if the room is free for the whole range, False otherwise.
+        """
+        start_time, end_time = _aware(start_time), _aware(end_time)
+        index = bisect_left(self.entries, (end_time,))
+        return index == 0 or self.max_ends[index - 1] <= start_time
+
+
+class AvailabilityIndex:
+    """
+    Process-wide free/busy index of meeting rooms, keyed by room id.
+
+    Rooms are loaded lazily from BookingHistory the first time they are queried and
+    kept in sync with writes from this process by the signal handlers in
+    ``apps.booking.signals``. Only bookings that had not ended at load time are
+    loaded; ranges starting before that are answered by the database. Each room is
+    reloaded after
+    ``settings.BOOKING_AVAILABILITY_TTL`` seconds so writes made by other worker
+    processes are picked up. Because of that delay it only serves the room list;
+    booking requests check for conflicts in the database.
+    """
+
+    def __init__(self):
+        self._rooms = {}
+        self._lock = RLock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'BOOKING_AVAILABILITY_TTL', 60)
+
+    def _is_stale(self, intervals, now):
+        return intervals is None or now - intervals.loaded_at > self.ttl
+
+    def _load(self, room_ids):
+        """
+        Load the bookings of the given rooms that have not ended yet, in one query.
+        Past bookings are left out so a reload stays small as history grows.
+        """
+        from apps.booking.models import BookingHistory
+
+        since = timezone.now()
+        grouped = {room_id: [] for room_id in room_ids}
+        rows = BookingHistory.objects.filter(
+            meeting_room_id__in=room_ids, end_time__gt=since
+        ).values_list('meeting_room_id', 'start_time', 'end_time', 'id')
+        for room_id, start_time, end_time, pk in rows.iterator():
+            grouped[room_id].append((start_time, end_time, pk))
+
+        now = time.monotonic()
+        for room_id, bookings in grouped.items():
+            self._rooms[room_id] = RoomIntervals(bookings, loaded_at=now, since=since)
+
+    def _free_in_database(self, room_ids, start_time, end_time):
+        from apps.booking.models import BookingHistory
+
+        busy = set(BookingHistory.objects.filter(
+            meeting_room_id__in=room_ids, start_time__lt=end_time, end_time__gt=start_time
+        ).values_list('meeting_room_id', flat=True))
+        return [pk for pk in room_ids if pk not in busy]
+
+    def is_free(self, room_id, start_time, end_time):
+        """
+        Checks whether a single room is free for the given time range.
+        """
+        return room_id in self.free_room_ids([room_id], start_time, end_time)
+
+    def free_room_ids(self, room_ids, start_time, end_time):
+        """
+        Returns the subset of ``room_ids`` that are free for the given time range.
+
+        The interval lookups run under the lock, since booking signals edit the
+        same lists in place; rooms whose loaded window doesn't cover the range
+        are checked in the database instead.
+        """
+        room_ids = list(room_ids)
+        now = time.monotonic()
+        free, uncovered = [], []
+        with self._lock:
+            missing = [pk for pk in room_ids if self._is_stale(self._rooms.get(pk), now)]
+            if missing:
+                self._load(missing)
+            for pk in room_ids:
+                intervals = self._rooms[pk]
+                if not intervals.covers(start_time):
+                    uncovered.append(pk)
+                elif intervals.is_free(start_time, end_time):
+                    free.append(pk)
+        if uncovered:
+            free += self._free_in_database(uncovered, start_time, end_time)
+        free = set(free)
+        return [pk for pk in room_ids if pk in free]
+
+    def booking_saved(self, booking_id, room_id, start_time, end_time):
+        with self._lock:
+            # A booking may have moved between rooms, so drop it everywhere first.
+            for intervals in self._rooms.values():
+                intervals.remove(booking_id)
+            intervals = self._rooms.get(room_id)
+            if intervals is not None:
+                intervals.add(booking_id, start_time, end_time)
+
+    def booking_deleted(self, booking_id, room_id):
+        with self._lock:
+            intervals = self._rooms.get(room_id)
+            if intervals is not None:
+                intervals.remove(booking_id)
+
+    def invalidate(self, room_id=None):
+        """
+        Forget one room (or every room when room_id is None) so it is reloaded on next use.
+        """
+        with self._lock:
+            if room_id is None:
+                self._rooms.clear()
+            else:
+                self._rooms.pop(room_id, None)
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.booking.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    """
+    Management command that delivers queued booking emails from the EmailOutbox table.
+
+    Usage:
+    - python manage.py send_outbox_emails            # drain everything due, then exit
+    - python manage.py send_outbox_emails --loop     # keep polling (run as a service)
+    """
+    help = "Send pending emails from the outbox in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help="Emails per batch / SMTP connection.")
+        parser.add_argument('--max-attempts', type=int, default=None, help="Attempts before an email is marked failed.")
+        parser.add_argument('--loop', action='store_true', help="Keep running and poll for new emails.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = drain_outbox(options['batch_size'], options['max_attempts'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+            elif options['loop']:
+                time.sleep(options['interval'])
+            else:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_sent} sent, {total_failed} failed."))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-17 02:43
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_alter_bookinghistory_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subject', models.CharField(help_text='Subject line of the email.', max_length=255)),
+                ('message', models.TextField(help_text='Plain-text body of the email.')),
+                ('from_email', models.CharField(help_text='Sender address.', max_length=255)),
+                ('to_email', models.CharField(help_text='Recipient address.', max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', help_text='Delivery status.', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Number of delivery attempts made so far.')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time of the next delivery attempt.')),
+                ('last_error', models.TextField(blank=True, default='', help_text='Error of the most recent failed attempt.')),
+                ('sent_at', models.DateTimeField(blank=True, help_text='When the email was delivered.', null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Email Outbox',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='booking_ema_status_26d273_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
+from django.utils import timezone
 
+from apps.core.models import TimestampModel
 from apps.member.models import CustomUser
 
 class MeetingRoom(models.Model):
@@ -66,3 +68,56 @@ class BookingHistory(models.Model):
             models.Index(fields=['meeting_room', 'start_time', 'end_time']),
         ]
         verbose_name_plural = "Booking Histories"
+
+
+class EmailOutbox(TimestampModel):
+    """
+    Model representing an email queued for delivery by the outbox worker.
+
+    Views write a row here instead of sending mail inline; the ``send_outbox_emails``
+    management command drains pending rows in batches over one SMTP connection and
+    retries failures with exponential backoff.
+
+    Attributes:
+        subject (str): Subject line of the email.
+        message (str): Plain-text body of the email.
+        from_email (str): Sender address.
+        to_email (str): Recipient address.
+        status (str): One of pending, sent or failed (gave up after max attempts).
+        attempts (int): Number of delivery attempts made so far.
+        next_attempt_at (datetime): Earliest time the next attempt may be made.
+        last_error (str): Error message of the most recent failed attempt.
+        sent_at (datetime): When the email was delivered.
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255, help_text="Subject line of the email.")
+    message = models.TextField(help_text="Plain-text body of the email.")
+    from_email = models.CharField(max_length=255, help_text="Sender address.")
+    to_email = models.CharField(max_length=255, help_text="Recipient address.")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, help_text="Delivery status.")
+    attempts = models.PositiveIntegerField(default=0, help_text="Number of delivery attempts made so far.")
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Earliest time of the next delivery attempt.")
+    last_error = models.TextField(blank=True, default='', help_text="Error of the most recent failed attempt.")
+    sent_at = models.DateTimeField(null=True, blank=True, help_text="When the email was delivered.")
+
+    def __str__(self):
+        """
+        Returns a string representation of the queued email.
+        """
+        return f"{self.subject} to {self.to_email} ({self.status})"
+
+    class Meta:
+        # The worker polls for due pending rows
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+        verbose_name_plural = "Email Outbox"
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from apps.booking.models import EmailOutbox
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff before the next attempt: base * 2^(attempts - 1), capped.
+
+    Parameters:
+    - attempts (int): Number of attempts made so far (>= 1).
+
+    Returns:
+    - timedelta: Time to wait before retrying.
+    """
+    base = getattr(settings, 'OUTBOX_RETRY_BASE_SECONDS', 30)
+    cap = getattr(settings, 'OUTBOX_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+
+def _open_quietly(connection):
+    try:
+        connection.open()
+    except Exception:
+        pass  # the next send retries the connection and records the error
+
+
+def _reconnect(connection):
+    """
+    Drop a connection that may have died mid-batch (e.g. SMTPServerDisconnected)
+    and open a fresh one, so the remaining emails get a real delivery attempt.
+    """
+    try:
+        connection.close()
+    except Exception:
+        pass
+    _open_quietly(connection)
+
+
+def drain_outbox(batch_size=None, max_attempts=None, now=None):
+    """
+    Deliver one batch of due pending emails over a single mail connection.
+
+    Each email that fails is rescheduled with ``retry_delay``; after ``max_attempts``
+    failures it is marked failed and no longer retried. After a failure the
+    connection is closed and reopened for the next email. Only one worker should
+    drain the outbox at a time.
+
+    Parameters:
+    - batch_size (int): Maximum number of emails to send (default settings.OUTBOX_BATCH_SIZE).
+    - max_attempts (int): Attempts before giving up (default settings.OUTBOX_MAX_ATTEMPTS).
+    - now (datetime): Current time, for tests.
+
+    Returns:
+    - tuple: (sent, failed) counts for this batch.
+    """
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 50)
+    max_attempts = max_attempts or getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+    now = now or timezone.now()
+
+    batch = list(
+        EmailOutbox.objects.filter(status=EmailOutbox.PENDING, next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'id')[:batch_size]
+    )
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        _open_quietly(connection)
+        for email in batch:
+            email.attempts += 1
+            try:
+                EmailMessage(
+                    email.subject, email.message, email.from_email, [email.to_email],
+                    connection=connection,
+                ).send()
+            except Exception as e:
+                failed += 1
+                email.last_error = f"{type(e).__name__}: {e}"
+                _reconnect(connection)
+                if email.attempts >= max_attempts:
+                    email.status = EmailOutbox.FAILED
+                else:
+                    email.next_attempt_at = now + retry_delay(email.attempts)
+            else:
+                sent += 1
+                email.status = EmailOutbox.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ''
+            email.save(update_fields=['attempts', 'status', 'next_attempt_at', 'last_error', 'sent_at', 'updated_at'])
+    finally:
+        connection.close()
+    return sent, failed
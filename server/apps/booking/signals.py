@@ -0,0 +1,45 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.booking.availability import availability_index
+from apps.booking.models import BookingHistory, MeetingRoom
+
+# The index is only updated once the write has committed, so a rolled-back
+# booking never shows up in it. The values are captured now: by commit time
+# delete() has already cleared instance.pk.
+
+
+@receiver(post_save, sender=BookingHistory)
+def update_availability_on_booking_save(sender, instance, **kwargs):
+    """
+    Keep the availability index in sync when a booking is created or edited.
+    """
+    transaction.on_commit(partial(
+        availability_index.booking_saved,
+        instance.pk, instance.meeting_room_id, instance.start_time, instance.end_time,
+    ))
+
+
+@receiver(post_delete, sender=BookingHistory)
+def update_availability_on_booking_delete(sender, instance, **kwargs):
+    """
+    Remove a cancelled or deleted booking from the availability index.
+    """
+    transaction.on_commit(partial(availability_index.booking_deleted, instance.pk, instance.meeting_room_id))
+
+
+@receiver(post_save, sender=MeetingRoom)
+@receiver(post_delete, sender=MeetingRoom)
+def invalidate_availability_on_room_change(sender, instance, **kwargs):
+    """
+    Drop any cached intervals for a room that was (re)created or deleted.
+
+    Forgetting a room is always safe, so this happens right away (a rolled
+    back room id can be reused) and again once the write has committed.
+    """
+    if kwargs.get('created', True):
+        availability_index.invalidate(instance.pk)
+        transaction.on_commit(partial(availability_index.invalidate, instance.pk))
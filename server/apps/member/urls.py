@@ -1,9 +1,12 @@
 from django.urls import path
 
-from rest_api.member.api import UserLoginView
+from rest_api.member.api import UserLoginView, UserTokenRefreshView
 
 
 urlpatterns = [
     # Endpoint for user login
     path('login/', UserLoginView.as_view(), name='user-login'),
+
+    # Endpoint for exchanging a refresh token for a new access token
+    path('token/refresh/', UserTokenRefreshView.as_view(), name='token-refresh'),
 ]
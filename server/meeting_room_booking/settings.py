@@ -160,3 +160,19 @@ EMAIL_USE_TLS = True
 
 # Default "from" address for email messages sent by Django
 DEFAULT_FROM_EMAIL = 'no-reply@meetingroom.com' 
+
+# Seconds before a room's in-memory availability index is reloaded from the database,
+# so bookings written by other worker processes become visible in the room list.
+# Booking requests always check for overlaps in the database. Only bookings that have
+# not ended are loaded; room lists for past ranges are answered from the database.
+BOOKING_AVAILABILITY_TTL = 60
+
+# Keyset pagination (rest_api/booking/pagination.py): default and maximum rows per page
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 500
+
+# Email outbox worker (python manage.py send_outbox_emails)
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_RETRY_MAX_SECONDS = 3600
@@ -1,15 +1,16 @@
 # imports
 from rest_framework import generics
-from django.db.models import Q
+from apps.booking.availability import availability_index
 from apps.booking.models import BookingHistory, MeetingRoom
-from rest_api.booking.utils import is_meeting_room_available, send_cancellation_email, send_confirmation_email
+from rest_api.booking.utils import is_meeting_room_available, parse_bound, queue_cancellation_email, queue_confirmation_email
+from .pagination import KeysetPagination
 from .serializers import MeetingRoomSerializer
 from .serializers import BookingHistorySerializer
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
-import threading
+from django.db import transaction
 from django.utils import timezone
 from datetime import datetime
 from rest_framework.views import APIView
@@ -18,10 +19,14 @@ from rest_framework.views import APIView
 class MeetingRoomListView(generics.ListCreateAPIView):
     """
     API View to list available meeting rooms during a specific time range.
+
+    Results are ordered by id and paginated with ``KeysetPagination``; follow the
+    ``Link: rel="next"`` response header for further pages.
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = MeetingRoomSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         start_time = self.request.query_params.get('start_time', None)
@@ -33,11 +38,13 @@ class MeetingRoomListView(generics.ListCreateAPIView):
             if not parse_datetime(start_time) or not parse_datetime(end_time):
                 return MeetingRoom.objects.none()
 
-            # Filter meeting rooms based on availability during the specified time range
-            queryset = MeetingRoom.objects.filter(
-                Q(booking_histories__end_time__lte=start_time) | Q(booking_histories__start_time__gte=end_time) | Q(booking_histories__isnull=True),
-                is_active=True
-            ).distinct()
+            start_time, end_time = parse_datetime(start_time), parse_datetime(end_time)
+
+            # Filter meeting rooms based on availability during the specified time range,
+            # using the per-room interval index rather than joining every booking row
+            active_ids = MeetingRoom.objects.filter(is_active=True).values_list('id', flat=True)
+            free_ids = availability_index.free_room_ids(active_ids, start_time, end_time)
+            queryset = MeetingRoom.objects.filter(id__in=free_ids)
         else:
             # If start_time and end_time are not provided, return all meeting rooms
             queryset = MeetingRoom.objects.filter(is_active=True)
@@ -79,36 +86,35 @@ class MeetingRoomBookingView(generics.CreateAPIView):
         start_time = datetime.strptime(start_time_str, '%Y-%m-%d %I:%M %p')
         end_time = datetime.strptime(end_time_str, '%Y-%m-%d %I:%M %p')
         
-        try:
-            meeting_room = MeetingRoom.objects.get(pk=room_id, is_active=True)
-        except MeetingRoom.DoesNotExist:
-            return Response({"error": "Meeting room not found."}, status=status.HTTP_404_NOT_FOUND)
-
         # Use ISO 8601 format when saving to serializer
         serializer = self.get_serializer(data={
             "start_time": start_time.isoformat(),
             "end_time": end_time.isoformat(),
             "no_of_persons": no_of_persons,
         })
-        serializer.is_valid(raise_exception=True)
 
-        # Check if the meeting room is available for booking and has sufficient capacity
-        if not is_meeting_room_available(meeting_room, start_time, end_time) or meeting_room.capacity < no_of_persons:
-            return Response({"error": "Meeting room is not available or does not have sufficient capacity for the specified time range and number of persons."}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            # Lock the room so two concurrent requests cannot both pass the overlap check
+            try:
+                meeting_room = MeetingRoom.objects.select_for_update().get(pk=room_id, is_active=True)
+            except MeetingRoom.DoesNotExist:
+                return Response({"error": "Meeting room not found."}, status=status.HTTP_404_NOT_FOUND)
+
+            serializer.is_valid(raise_exception=True)
 
-        serializer.save(meeting_room=meeting_room, booked_by=request.user, no_of_persons=no_of_persons)
+            # Check if the meeting room is available for booking and has sufficient capacity
+            if not is_meeting_room_available(meeting_room, start_time, end_time) or meeting_room.capacity < no_of_persons:
+                return Response({"error": "Meeting room is not available or does not have sufficient capacity for the specified time range and number of persons."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Create a thread to send the confirmation email with necessary data
-        thread = threading.Thread(
-            target=send_confirmation_email,
-            args=(
+            serializer.save(meeting_room=meeting_room, booked_by=request.user, no_of_persons=no_of_persons)
+
+            # Queue the confirmation email; the send_outbox_emails worker delivers it
+            queue_confirmation_email(
                 meeting_room.room_name,
                 serializer.instance.start_time,
                 serializer.instance.end_time,
                 request.user.email,
             )
-        )
-        thread.start()
 
         return Response({"message": "Meeting room booked successfully."}, status=status.HTTP_201_CREATED)
 
@@ -118,17 +124,69 @@ class MyBookingsView(APIView):
     """
     API View to retrieve a list of bookings made by the authenticated user.
 
+    Query Parameters (all optional, applied in the database):
+    - date_from (str): Only bookings starting at or after this ISO 8601 date or datetime.
+    - date_to (str): Only bookings starting before this datetime, or on/before this date.
+    - room (str): Case-insensitive substring of the meeting room name.
+    - room_id (int): ID of the meeting room.
+    - upcoming (bool): If true, only bookings that have not ended yet.
+    - limit (int): Return only the first ``limit`` bookings, without a next page.
+    - page_size (int), cursor (str): Keyset pagination, see ``KeysetPagination``.
+
     Returns:
-    - 200 OK: List of bookings for the authenticated user.
+    - 200 OK: One page of the authenticated user's bookings, ordered by start time and id.
+      A ``Link: rel="next"`` header points to the next page when there is one.
+    - 400 Bad Request: A query parameter could not be parsed.
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def filter_bookings(self, bookings, params):
+        """
+        Apply the query parameters to ``bookings``. Raises ValueError on bad input.
+        """
+        date_from = params.get('date_from')
+        if date_from:
+            bookings = bookings.filter(start_time__gte=parse_bound(date_from))
+
+        date_to = params.get('date_to')
+        if date_to:
+            bookings = bookings.filter(start_time__lt=parse_bound(date_to, end_of_day=True))
+
+        room = params.get('room')
+        if room:
+            bookings = bookings.filter(meeting_room__room_name__icontains=room)
+
+        room_id = params.get('room_id')
+        if room_id:
+            bookings = bookings.filter(meeting_room_id=int(room_id))
+
+        if params.get('upcoming', '').lower() in ('1', 'true', 'yes'):
+            bookings = bookings.filter(end_time__gte=timezone.now())
+
+        return bookings.order_by('start_time', 'id')
+
     def get(self, request, *args, **kwargs):
         user = self.request.user
-        bookings = BookingHistory.objects.filter(booked_by=user)
-        serializer = BookingHistorySerializer(bookings, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # select_related avoids one MeetingRoom query per row in the nested serializer
+        bookings = BookingHistory.objects.filter(booked_by=user).select_related('meeting_room')
+        try:
+            bookings = self.filter_bookings(bookings, request.query_params)
+            limit = request.query_params.get('limit')
+            limit = int(limit) if limit else None
+            if limit is not None and limit < 1:
+                raise ValueError("limit must be a positive integer.")
+        except ValueError as e:
+            return Response({"error": f"Invalid query parameter: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if limit is not None:
+            serializer = BookingHistorySerializer(bookings[:limit], many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        paginator = KeysetPagination(ordering=('start_time', 'id'))
+        page = paginator.paginate_queryset(bookings, request, view=self)
+        serializer = BookingHistorySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
 
 
@@ -153,7 +211,7 @@ class CancelMeetingRoomBookingView(generics.DestroyAPIView):
         print(request.user)
 
         try:
-            booking = BookingHistory.objects.get(pk=booking_id, booked_by=request.user)
+            booking = BookingHistory.objects.select_related('meeting_room').get(pk=booking_id, booked_by=request.user)
         except BookingHistory.DoesNotExist:
             return Response({"error": "Meeting room booking not found or you are not authorized to cancel this booking."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -164,17 +222,13 @@ class CancelMeetingRoomBookingView(generics.DestroyAPIView):
 
         booking.delete()
 
-        # Create a thread to send the cancellation email with necessary data
-        thread = threading.Thread(
-            target=send_cancellation_email,
-            args=(
-                booking.meeting_room.room_name,
-                booking.start_time,
-                booking.end_time,
-                request.user.email,
-            )
+        # Queue the cancellation email; the send_outbox_emails worker delivers it
+        queue_cancellation_email(
+            booking.meeting_room.room_name,
+            booking.start_time,
+            booking.end_time,
+            request.user.email,
         )
-        thread.start()
 
         return Response({"message": "Your Meeting Room Booking has been cancelled!"}, status=status.HTTP_204_NO_CONTENT)
     
\ No newline at end of file
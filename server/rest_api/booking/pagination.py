@@ -0,0 +1,108 @@
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination that keeps the response body a plain list.
+
+    Rows are ordered by ``ordering`` and each page continues strictly after the last
+    row of the previous one, so the database seeks straight to the page through its
+    index instead of counting or skipping rows. When more rows exist, the response
+    carries a ``Link: <...>; rel="next"`` header whose URL includes an opaque
+    ``cursor`` query parameter.
+
+    Query Parameters:
+    - cursor (str): Opaque position returned in the previous page's next link.
+    - page_size (int): Rows per page, capped at ``settings.API_MAX_PAGE_SIZE``.
+    """
+    ordering = ('id',)
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def get_page_size(self, request):
+        default = getattr(settings, 'API_PAGE_SIZE', 100)
+        maximum = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+        value = request.query_params.get(self.page_size_query_param)
+        if not value:
+            return default
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError({"error": "page_size must be a positive integer."})
+        if page_size < 1:
+            raise ValidationError({"error": "page_size must be a positive integer."})
+        return min(page_size, maximum)
+
+    def encode_cursor(self, row):
+        values = [getattr(row, field) for field in self.ordering]
+        # Full-precision isoformat: truncating microseconds would repeat rows across pages
+        raw = json.dumps(values, default=datetime.isoformat).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            values = json.loads(raw)
+        except ValueError:
+            raise ValidationError({"error": "Invalid cursor."})
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValidationError({"error": "Invalid cursor."})
+        return values
+
+    def after(self, values):
+        """
+        Build the lexicographic "row > cursor" filter over the ordering fields.
+        """
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            step = Q(**{f'{field}__gt': values[index]})
+            for prev_field, prev_value in zip(self.ordering[:index], values[:index]):
+                step &= Q(**{prev_field: prev_value})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.after(cursor))
+
+        # Fetch one extra row to learn whether another page exists
+        try:
+            rows = list(queryset[:page_size + 1])
+        except (DjangoValidationError, ValueError, TypeError):
+            raise ValidationError({"error": "Invalid cursor."})
+        self.next_cursor = self.encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.get_full_path(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers['Link'] = f'<{next_link}>; rel="next"'
+        return Response(data, headers=headers)
@@ -1,12 +1,22 @@
 
+from datetime import datetime, time, timedelta
+
 from django.conf import settings
 from django.core.mail import send_mail
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.booking.models import EmailOutbox
 
 
 def is_meeting_room_available(booking, start_time, end_time):
     """
     Checks if the meeting room is available for the current booking.
 
+    This is the write-path check, so it asks the database (using the
+    ``(meeting_room, start_time, end_time)`` index) rather than the in-memory
+    availability index, which can miss bookings made by other worker processes.
+
     Returns:
         bool: True if the meeting room is available, False otherwise.
     """
@@ -16,6 +26,94 @@ def is_meeting_room_available(booking, start_time, end_time):
     ).exists()
 
 
+def parse_bound(value, end_of_day=False):
+    """
+    Parse an ISO 8601 date or datetime query parameter into an aware datetime.
+
+    Parameters:
+    - value (str): The date ("2026-03-20") or datetime ("2026-03-20T09:00:00+00:00") string.
+    - end_of_day (bool): For a plain date, return midnight of the following day instead,
+      so the whole day is included when used as an exclusive upper bound.
+
+    Raises:
+    - ValueError: If the value is neither a valid date nor datetime.
+    """
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is not None:
+        if end_of_day:
+            day += timedelta(days=1)
+        parsed = datetime.combine(day, time.min)
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"'{value}' is not an ISO 8601 date or datetime.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def build_confirmation_email(room_name, start_time, end_time):
+    """
+    Build the subject and body of a booking confirmation email.
+
+    Returns:
+    - tuple: (subject, message)
+    """
+    subject = 'Meeting Room Booking Confirmation'
+    formatted_start_time = start_time.strftime("%d-%B-%Y %I:%M %p")
+    formatted_end_time = end_time.strftime("%I:%M %p")
+    message = f'You have successfully booked meeting room {room_name}. Your booking details:\nDate & Time: {formatted_start_time}  -  {formatted_end_time}.'
+    return subject, message
+
+
+def build_cancellation_email(room_name, start_time, end_time):
+    """
+    Build the subject and body of a booking cancellation email.
+
+    Returns:
+    - tuple: (subject, message)
+    """
+    subject = 'Meeting Room Booking Cancellation'
+    formatted_start_time = start_time.strftime("%d-%B-%Y %I:%M %p")
+    formatted_end_time = end_time.strftime("%I:%M %p")
+    message = f'Your booking for meeting room {room_name} from {formatted_start_time} to {formatted_end_time} has been canceled.'
+    return subject, message
+
+
+def queue_email(subject, message, to_email):
+    """
+    Store an email in the outbox for the ``send_outbox_emails`` worker to deliver.
+
+    Returns:
+    - EmailOutbox: The queued outbox row.
+    """
+    return EmailOutbox.objects.create(
+        subject=subject,
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to_email=to_email,
+    )
+
+
+def queue_confirmation_email(room_name, start_time, end_time, booked_by_email):
+    """
+    Queue a confirmation email for a meeting room booking (see ``send_confirmation_email``).
+    """
+    subject, message = build_confirmation_email(room_name, start_time, end_time)
+    return queue_email(subject, message, booked_by_email)
+
+
+def queue_cancellation_email(room_name, start_time, end_time, booked_by_email):
+    """
+    Queue a cancellation email for a meeting room booking (see ``send_cancellation_email``).
+    """
+    subject, message = build_cancellation_email(room_name, start_time, end_time)
+    return queue_email(subject, message, booked_by_email)
+
+
 def send_confirmation_email(room_name, start_time, end_time, booked_by_email):
     """
     Send a confirmation email for a meeting room booking.
@@ -31,10 +129,7 @@ def send_confirmation_email(room_name, start_time, end_time, booked_by_email):
     Example:
     send_confirmation_email('Conference Room A', datetime(2023, 12, 15, 10, 0), datetime(2023, 12, 15, 12, 0), 'user@example.com')
     """
-    subject = 'Meeting Room Booking Confirmation'
-    formatted_start_time = start_time.strftime("%d-%B-%Y %I:%M %p")
-    formatted_end_time = end_time.strftime("%I:%M %p")
-    message = f'You have successfully booked meeting room {room_name}. Your booking details:\nDate & Time: {formatted_start_time}  -  {formatted_end_time}.'
+    subject, message = build_confirmation_email(room_name, start_time, end_time)
     from_email = settings.DEFAULT_FROM_EMAIL
     to_email = booked_by_email
     try:
@@ -58,29 +153,10 @@ def send_cancellation_email(room_name, start_time, end_time, booked_by_email):
     Example:
     send_cancellation_email('Conference Room A', datetime(2023, 12, 15, 10, 0), datetime(2023, 12, 15, 12, 0), 'user@example.com')
     """
-    subject = 'Meeting Room Booking Cancellation'
-    formatted_start_time = start_time.strftime("%d-%B-%Y %I:%M %p")
-    formatted_end_time = end_time.strftime("%I:%M %p")
-    message = f'Your booking for meeting room {room_name} from {formatted_start_time} to {formatted_end_time} has been canceled.'
+    subject, message = build_cancellation_email(room_name, start_time, end_time)
     from_email = settings.DEFAULT_FROM_EMAIL
     to_email = booked_by_email
     try:
         send_mail(subject, message, from_email, [to_email])
     except Exception as e:
         print(f"Error sending cancellation email: {e}")
-
-
-
-
-
-def send_cancellation_email(room_name, start_time, end_time, booked_by_email):
-    subject = 'Meeting Room Booking Cancellation'
-    formatted_start_time = start_time.strftime("%d-%B-%Y %I:%M %p")
-    formatted_end_time = end_time.strftime("%I:%M %p")
-    message = f'Your booking for meeting room {room_name} from {formatted_start_time} to {formatted_end_time} has been canceled.'
-    from_email = settings.DEFAULT_FROM_EMAIL
-    to_email = booked_by_email
-    try:
-        send_mail(subject, message, from_email, [to_email])
-    except Exception as e:
-        print(f"Error sending cancellation email: {e}")
\ No newline at end of file
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from apps.core.utils import is_valid_email
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
 
 
 class UserLoginView(APIView):
@@ -32,4 +33,12 @@ class UserLoginView(APIView):
             return Response({"token": token}, status=status.HTTP_200_OK)
 
         return Response({"error": "Invalid email or password"}, status=status.HTTP_401_UNAUTHORIZED)
-    
+
+
+class UserTokenRefreshView(TokenRefreshView):
+    """
+    API View that exchanges the refresh token returned by login for a new access token.
+
+    Unlike login this does not re-check the password, so clients can renew their
+    access token cheaply before it expires.
+    """
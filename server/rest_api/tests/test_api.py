@@ -1,12 +1,16 @@
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from apps.member.models import CustomUser
+from apps.booking.availability import AvailabilityIndex, RoomIntervals
 from apps.booking.models import MeetingRoom, BookingHistory
 from django.utils import timezone
 from datetime import timedelta, datetime
 import json
+import threading
 
 class MeetingRoomAPITestCase(TestCase):
     def setUp(self):
@@ -47,6 +51,27 @@ class MeetingRoomAPITestCase(TestCase):
         self.assertIn('token', response.data)
         self.assertIn('access', response.data['token'])
 
+    def test_token_refresh(self):
+        self.client.credentials()
+        response = self.client.post(self.login_url, {
+            'email': self.user.email,
+            'password': self.user_password
+        }, format='json')
+        refresh = response.data['token']['refresh']
+
+        response = self.client.post(reverse('token-refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+
+        # The refreshed access token is accepted by protected endpoints
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get(self.my_bookings_url).status_code, status.HTTP_200_OK)
+
+    def test_token_refresh_invalid_token(self):
+        self.client.credentials()
+        response = self.client.post(reverse('token-refresh'), {'refresh': 'not-a-token'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
     def test_user_login_invalid_credentials(self):
         self.client.credentials()
         response = self.client.post(self.login_url, {
@@ -130,6 +155,116 @@ class MeetingRoomAPITestCase(TestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['meeting_room']['id'], self.room.id)
 
+    def test_list_my_bookings_filters(self):
+        other_room = MeetingRoom.objects.create(room_name='Beta Room', capacity=4, is_active=True)
+        base = (timezone.now() + timedelta(days=5)).replace(hour=9, minute=0, second=0, microsecond=0)
+        past = BookingHistory.objects.create(
+            meeting_room=self.room, booked_by=self.user, no_of_persons=2,
+            start_time=base - timedelta(days=10), end_time=base - timedelta(days=10, hours=-1),
+        )
+        day_alpha = BookingHistory.objects.create(
+            meeting_room=self.room, booked_by=self.user, no_of_persons=2,
+            start_time=base, end_time=base + timedelta(hours=1),
+        )
+        day_beta = BookingHistory.objects.create(
+            meeting_room=other_room, booked_by=self.user, no_of_persons=2,
+            start_time=base + timedelta(hours=3), end_time=base + timedelta(hours=4),
+        )
+        later = BookingHistory.objects.create(
+            meeting_room=self.room, booked_by=self.user, no_of_persons=2,
+            start_time=base + timedelta(days=2), end_time=base + timedelta(days=2, hours=1),
+        )
+
+        def ids(params):
+            response = self.client.get(self.my_bookings_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [b['id'] for b in response.data]
+
+        self.assertEqual(ids({}), [past.id, day_alpha.id, day_beta.id, later.id])
+        day = base.date().isoformat()
+        self.assertEqual(ids({'date_from': day, 'date_to': day}), [day_alpha.id, day_beta.id])
+        self.assertEqual(ids({'room': 'beta'}), [day_beta.id])
+        self.assertEqual(ids({'room_id': self.room.id, 'upcoming': 'true'}), [day_alpha.id, later.id])
+        self.assertEqual(ids({'upcoming': 'true', 'limit': 1}), [day_alpha.id])
+
+    def test_list_my_bookings_invalid_filter(self):
+        for params in ({'date_from': 'not-a-date'}, {'limit': 'ten'}, {'limit': 0}):
+            response = self.client.get(self.my_bookings_url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
+
+    def _follow_pages(self, url, params):
+        """Collect every page by following the Link: rel="next" header."""
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            link = response.headers.get('Link')
+            if not link:
+                return pages
+            next_url = link[link.index('<') + 1:link.index('>')]
+            response = self.client.get(next_url)
+
+    def test_list_my_bookings_cursor_pagination(self):
+        base = (timezone.now() + timedelta(days=6)).replace(microsecond=123456)
+        created = []
+        for offset in (0, 0, 1, 2, 2):  # ties on start_time are broken by id
+            created.append(BookingHistory.objects.create(
+                meeting_room=self.room, booked_by=self.user, no_of_persons=1,
+                start_time=base + timedelta(hours=offset), end_time=base + timedelta(hours=offset, minutes=30),
+            ).id)
+
+        pages = self._follow_pages(self.my_bookings_url, {'page_size': 2})
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual([b['id'] for page in pages for b in page], created)
+
+    def test_list_my_bookings_invalid_cursor(self):
+        response = self.client.get(self.my_bookings_url, {'cursor': 'garbage!'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_available_rooms_cursor_pagination(self):
+        for n in range(4):
+            MeetingRoom.objects.create(room_name=f'Room {n}', capacity=4, is_active=True)
+        pages = self._follow_pages(self.room_list_url, {'page_size': 2})
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        ids = [r['id'] for page in pages for r in page]
+        self.assertEqual(ids, sorted(ids))
+
+    def _create_bookings(self, count, days_ahead):
+        start = (timezone.now() + timedelta(days=days_ahead)).replace(microsecond=0)
+        for n in range(count):
+            room = MeetingRoom.objects.create(room_name=f'Room {days_ahead}-{n}', capacity=4, is_active=True)
+            BookingHistory.objects.create(
+                meeting_room=room, booked_by=self.user, no_of_persons=1,
+                start_time=start + timedelta(hours=n), end_time=start + timedelta(hours=n, minutes=30),
+            )
+
+    def _count_queries(self, method, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def test_my_bookings_query_count_is_constant(self):
+        self._create_bookings(1, days_ahead=7)
+        few = self._count_queries('get', self.my_bookings_url)
+        self._create_bookings(10, days_ahead=8)
+        many = self._count_queries('get', self.my_bookings_url)
+        self.assertEqual(few, many)
+
+    def test_admin_booking_list_query_count_is_constant(self):
+        admin_user = CustomUser.objects.create_superuser(
+            email='admin@example.com', username='admin', password='password123'
+        )
+        self.client.force_login(admin_user)
+        url = reverse('admin:booking_bookinghistory_changelist')
+        self._create_bookings(1, days_ahead=7)
+        few = self._count_queries('get', url)
+        self._create_bookings(10, days_ahead=8)
+        many = self._count_queries('get', url)
+        self.assertEqual(few, many)
+
     def test_cancel_booking(self):
         start_time = (timezone.now() + timedelta(days=1)).replace(microsecond=0)
         end_time = start_time + timedelta(hours=2)
@@ -268,6 +403,163 @@ class MeetingRoomAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 0)
 
+    def test_list_available_rooms_excludes_room_with_mixed_bookings(self):
+        start_time = (timezone.now() + timedelta(days=3)).replace(microsecond=0)
+        end_time = start_time + timedelta(hours=2)
+
+        # One booking well before the query window and one overlapping it
+        BookingHistory.objects.create(
+            meeting_room=self.room,
+            booked_by=self.user,
+            start_time=start_time - timedelta(days=1),
+            end_time=end_time - timedelta(days=1),
+            no_of_persons=5
+        )
+        BookingHistory.objects.create(
+            meeting_room=self.room,
+            booked_by=self.user,
+            start_time=start_time,
+            end_time=end_time,
+            no_of_persons=5
+        )
+
+        response = self.client.get(self.room_list_url, {
+            'start_time': (start_time + timedelta(minutes=30)).isoformat(),
+            'end_time': (end_time + timedelta(minutes=30)).isoformat()
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 0)
+
+        # Back-to-back with the existing booking is still free
+        response = self.client.get(self.room_list_url, {
+            'start_time': end_time.isoformat(),
+            'end_time': (end_time + timedelta(hours=1)).isoformat()
+        })
+        self.assertEqual(len(response.data), 1)
+
+    def test_list_available_rooms_reflects_new_and_cancelled_bookings(self):
+        start_time = (timezone.now() + timedelta(days=4)).replace(microsecond=0)
+        end_time = start_time + timedelta(hours=1)
+        query = {'start_time': start_time.isoformat(), 'end_time': end_time.isoformat()}
+
+        self.assertEqual(len(self.client.get(self.room_list_url, query).data), 1)
+
+        # The index is updated when the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = BookingHistory.objects.create(
+                meeting_room=self.room,
+                booked_by=self.user,
+                start_time=start_time,
+                end_time=end_time,
+                no_of_persons=5
+            )
+        self.assertEqual(len(self.client.get(self.room_list_url, query).data), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        self.assertEqual(len(self.client.get(self.room_list_url, query).data), 1)
+
+    def test_rolled_back_booking_not_added_to_availability_index(self):
+        start_time = (timezone.now() + timedelta(days=4)).replace(microsecond=0)
+        query = {'start_time': start_time.isoformat(), 'end_time': (start_time + timedelta(hours=1)).isoformat()}
+        self.assertEqual(len(self.client.get(self.room_list_url, query).data), 1)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    BookingHistory.objects.create(
+                        meeting_room=self.room,
+                        booked_by=self.user,
+                        start_time=start_time,
+                        end_time=start_time + timedelta(hours=1),
+                        no_of_persons=5
+                    )
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(len(self.client.get(self.room_list_url, query).data), 1)
+
+    def test_list_available_rooms_for_past_range_checks_database(self):
+        start_time = (timezone.now() - timedelta(days=2)).replace(microsecond=0)
+        end_time = start_time + timedelta(hours=1)
+        BookingHistory.objects.create(
+            meeting_room=self.room,
+            booked_by=self.user,
+            start_time=start_time,
+            end_time=end_time,
+            no_of_persons=5
+        )
+        # The index only loads bookings that have not ended; this one has
+        response = self.client.get(self.room_list_url, {
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat()
+        })
+        self.assertEqual(len(response.data), 0)
+
+    def test_availability_index_reads_never_see_half_rebuilt_intervals(self):
+        reading, truncated, resume = threading.Event(), threading.Event(), threading.Event()
+
+        class PausingIntervals(RoomIntervals):
+            def is_free(self, start_time, end_time):
+                # Give a concurrent writer the chance to cut max_ends short mid-lookup
+                reading.set()
+                truncated.wait(0.5)
+                return super().is_free(start_time, end_time)
+
+            def _rebuild_max_ends(self, index):
+                del self.max_ends[index:]
+                if reading.is_set() and not truncated.is_set():
+                    truncated.set()
+                    resume.wait(5)
+                super()._rebuild_max_ends(index)
+
+        index = AvailabilityIndex()
+        start_time = (timezone.now() + timedelta(days=6)).replace(microsecond=0)
+        end_time = start_time + timedelta(hours=1)
+        index._rooms[self.room.id] = PausingIntervals([(start_time, start_time + timedelta(hours=8), 1)])
+        results = []
+
+        def read():
+            try:
+                results.append(index.free_room_ids([self.room.id], start_time, end_time))
+            except Exception as e:
+                results.append(e)
+
+        reader = threading.Thread(target=read)
+        writer = threading.Thread(target=index.booking_saved, args=(
+            2, self.room.id, start_time - timedelta(days=1), start_time - timedelta(hours=23)))
+        reader.start()
+        self.assertTrue(reading.wait(5))
+        writer.start()
+        reader.join(5)
+        resume.set()
+        writer.join(5)
+        self.assertEqual(results, [[]])
+
+    def test_book_rejects_overlap_unseen_by_availability_index(self):
+        start_time = (timezone.now() + timedelta(days=5)).replace(microsecond=0)
+        end_time = start_time + timedelta(hours=2)
+        query = {'start_time': start_time.isoformat(), 'end_time': end_time.isoformat()}
+        # Load the room into this process's index, then write a booking the
+        # index never hears about (as another worker or bulk_create would)
+        self.assertEqual(len(self.client.get(self.room_list_url, query).data), 1)
+        BookingHistory.objects.bulk_create([BookingHistory(
+            meeting_room=self.room,
+            booked_by=self.user,
+            start_time=start_time,
+            end_time=end_time,
+            no_of_persons=5
+        )])
+
+        response = self.client.post(reverse('book-meeting-room', kwargs={'room_id': self.room.id}), {
+            'start_time': (start_time + timedelta(hours=1)).strftime('%Y-%m-%d %I:%M %p'),
+            'end_time': (end_time + timedelta(hours=1)).strftime('%Y-%m-%d %I:%M %p'),
+            'no_of_persons': 5
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(BookingHistory.objects.filter(meeting_room=self.room).count(), 1)
+
     def test_book_meeting_room_invalid_time_format(self):
         url = reverse('book-meeting-room', kwargs={'room_id': self.room.id})
         data = {
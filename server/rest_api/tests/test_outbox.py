@@ -0,0 +1,143 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.booking.models import BookingHistory, EmailOutbox, MeetingRoom
+from apps.booking.outbox import drain_outbox, retry_delay
+from apps.member.models import CustomUser
+from rest_api.booking.utils import queue_confirmation_email
+
+
+class DroppingSMTPBackend(BaseEmailBackend):
+    """
+    Behaves like the SMTP backend when the server hangs up: the session dies
+    on the ``drop_on``-th send and every later send on it fails until reopened.
+    """
+    drop_on = 2
+    sends = 0
+    opens = 0
+    delivered = []
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.alive = False
+
+    def open(self):
+        if not self.alive:
+            type(self).opens += 1
+            self.alive = True
+        return True
+
+    def close(self):
+        self.alive = False
+
+    def send_messages(self, messages):
+        cls = type(self)
+        cls.sends += 1
+        if cls.sends == cls.drop_on:
+            self.alive = False
+        if not self.alive:
+            raise SMTPServerDisconnected('Connection unexpectedly closed')
+        cls.delivered.extend(messages)
+        return len(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailOutboxTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email='testuser@example.com', username='testuser', password='password123'
+        )
+        self.client.force_authenticate(self.user)
+        self.room = MeetingRoom.objects.create(room_name='Alpha Room', capacity=10, is_active=True)
+        self.start_time = (timezone.now() + timedelta(days=1)).replace(microsecond=0)
+        self.end_time = self.start_time + timedelta(hours=1)
+
+    def test_booking_and_cancel_queue_emails_instead_of_sending(self):
+        url = reverse('book-meeting-room', kwargs={'room_id': self.room.id})
+        response = self.client.post(url, {
+            'start_time': self.start_time.strftime('%Y-%m-%d %I:%M %p'),
+            'end_time': self.end_time.strftime('%Y-%m-%d %I:%M %p'),
+            'no_of_persons': 2,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        booking = BookingHistory.objects.get(booked_by=self.user)
+        url = reverse('cancel-meeting-room-booking', kwargs={'booking_id': booking.id})
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(len(mail.outbox), 0)
+        subjects = list(EmailOutbox.objects.order_by('id').values_list('subject', flat=True))
+        self.assertEqual(subjects, ['Meeting Room Booking Confirmation', 'Meeting Room Booking Cancellation'])
+
+    def test_drain_sends_batch_over_one_connection(self):
+        for _ in range(3):
+            queue_confirmation_email('Alpha Room', self.start_time, self.end_time, 'a@example.com')
+
+        with patch('apps.booking.outbox.get_connection', wraps=mail.get_connection) as get_connection:
+            self.assertEqual(drain_outbox(batch_size=2), (2, 0))
+            self.assertEqual(drain_outbox(batch_size=2), (1, 0))
+            self.assertEqual(drain_outbox(batch_size=2), (0, 0))
+        self.assertEqual(get_connection.call_count, 2)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].to, ['a@example.com'])
+        self.assertFalse(EmailOutbox.objects.exclude(status=EmailOutbox.SENT).exists())
+
+    def test_failed_send_is_retried_with_backoff_then_given_up(self):
+        email = queue_confirmation_email('Alpha Room', self.start_time, self.end_time, 'a@example.com')
+        now = timezone.now()
+
+        with patch('apps.booking.outbox.EmailMessage.send', side_effect=OSError('SMTP down')):
+            self.assertEqual(drain_outbox(max_attempts=2, now=now), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.status, EmailOutbox.PENDING)
+            self.assertEqual(email.next_attempt_at, now + retry_delay(1))
+            self.assertIn('SMTP down', email.last_error)
+
+            # Not due yet
+            self.assertEqual(drain_outbox(max_attempts=2, now=now), (0, 0))
+
+            later = email.next_attempt_at
+            self.assertEqual(drain_outbox(max_attempts=2, now=later), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.status, EmailOutbox.FAILED)
+            self.assertEqual(email.attempts, 2)
+
+    @override_settings(EMAIL_BACKEND='rest_api.tests.test_outbox.DroppingSMTPBackend')
+    def test_connection_reopened_after_failure_mid_batch(self):
+        DroppingSMTPBackend.sends = DroppingSMTPBackend.opens = 0
+        DroppingSMTPBackend.delivered = []
+        emails = [
+            queue_confirmation_email('Alpha Room', self.start_time, self.end_time, f'{n}@example.com')
+            for n in range(4)
+        ]
+
+        self.assertEqual(drain_outbox(), (3, 1))
+        self.assertEqual(DroppingSMTPBackend.opens, 2)
+        self.assertEqual([m.to for m in DroppingSMTPBackend.delivered],
+                         [['0@example.com'], ['2@example.com'], ['3@example.com']])
+
+        statuses = [EmailOutbox.objects.get(pk=e.pk).status for e in emails]
+        self.assertEqual(statuses, [EmailOutbox.SENT, EmailOutbox.PENDING, EmailOutbox.SENT, EmailOutbox.SENT])
+        self.assertIn('SMTPServerDisconnected', EmailOutbox.objects.get(pk=emails[1].pk).last_error)
+
+    def test_retry_delay_grows_and_is_capped(self):
+        self.assertLess(retry_delay(1), retry_delay(2))
+        self.assertEqual(retry_delay(50), retry_delay(60))
+
+    def test_management_command_drains_outbox(self):
+        queue_confirmation_email('Alpha Room', self.start_time, self.end_time, 'a@example.com')
+        call_command('send_outbox_emails', '--batch-size', '10', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
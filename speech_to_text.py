@@ -1,84 +1,563 @@
+import asyncio
 import json
+import mmap
 import os
+import threading
 import wave
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-import pyaudio
+from typing import AsyncIterator, Deque, Dict, Iterable, Iterator, Optional
+import numpy as np
+import vosk
 from vosk import Model, KaldiRecognizer
 
+SUPPORTED_SAMPLE_RATES = (8000, 16000, 22050, 32000, 44100, 48000)
 
-def get_recognizer(model_path: str, sample_rate: int = 16000) -> KaldiRecognizer:
-    """Create and configure Vosk recognizer."""
-    if not os.path.exists(model_path):
-        raise FileNotFoundError(
-            f"Vosk model not found at: {model_path}\n"
-            "Download from: https://alphacephei.com/vosk/models"
-        )
+# Energy gate defaults: RMS of int16 samples (a quiet room sits well below
+# this, normal speech well above), and how long to keep feeding audio after
+# speech stops — Kaldi needs that trailing silence to close an utterance.
+DEFAULT_VAD_THRESHOLD = 300.0
+DEFAULT_VAD_HANGOVER = 0.8
+
+
+# Process-wide cache of loaded Vosk models, keyed by absolute model path.
+# Loading a model from disk costs far more than transcribing a short clip.
+_models: Dict[str, Model] = {}
+_models_lock = threading.Lock()
+
+
+def get_model(model_path: str) -> Model:
+    """Return the cached Vosk model for model_path, loading it on first use."""
+    key = os.path.abspath(model_path)
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(
+                    f"Vosk model not found at: {model_path}\n"
+                    "Download from: https://alphacephei.com/vosk/models"
+                )
+            model = _models[key] = Model(model_path)
+    return model
 
-    model = Model(model_path)
-    recognizer = KaldiRecognizer(model, sample_rate)
+
+def unload_model(model_path: Optional[str] = None) -> None:
+    """Drop one cached model (or all of them) so its memory can be freed."""
+    with _models_lock:
+        if model_path is None:
+            _models.clear()
+        else:
+            _models.pop(os.path.abspath(model_path), None)
+
+
+def get_recognizer(model_path: str, sample_rate: int = 16000) -> KaldiRecognizer:
+    """Create and configure a Vosk recognizer backed by the cached model."""
+    recognizer = KaldiRecognizer(get_model(model_path), sample_rate)
     recognizer.SetWords(False)
     recognizer.SetMaxAlternatives(0)
     return recognizer
 
 
-def transcribe_file(file_path: str, model_path: str) -> str:
+# ---------------------------------------------------------------------------
+# PCM sources — any iterable of 16-bit mono PCM byte chunks will do; these
+# two also carry the sample_rate the recognizer needs.
+# ---------------------------------------------------------------------------
+
+class PcmConverter:
     """
-    Transcribes a pre-recorded WAV file using Vosk.
-    Used for unit tests and batch processing.
+    Streaming converter from any integer PCM layout to mono 16-bit PCM.
+
+    Channels are averaged, samples of 1-4 bytes are rescaled to int16, and
+    when out_rate differs from in_rate the signal is linearly interpolated.
+    When downsampling, a windowed-sinc low-pass first removes content above
+    the new Nyquist frequency so it cannot alias into the speech band; the
+    filter delays its output by half its length, which flush() releases at
+    the end of the stream. Filter and resampler state carry across convert()
+    calls, so converting a file chunk by chunk gives the same samples as
+    converting it in one go.
     """
-    if not os.path.exists(model_path):
-        raise FileNotFoundError(f"Model not found: {model_path}")
 
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Audio file not found: {file_path}")
+    def __init__(self, channels: int, sampwidth: int, in_rate: int, out_rate: Optional[int] = None):
+        if sampwidth not in (1, 2, 3, 4):
+            raise ValueError(f"Unsupported sample width: {sampwidth * 8}-bit")
+        self.channels = channels
+        self.sampwidth = sampwidth
+        self.in_rate = in_rate
+        self.out_rate = out_rate or in_rate
+        self._consumed = 0          # input samples seen so far
+        self._produced = 0          # output samples emitted so far
+        self._last = None           # final input sample of the previous chunk
+        self._kernel = None
+        if self.out_rate < self.in_rate:
+            self._kernel = self._lowpass_kernel(self.in_rate, self.out_rate)
+            self._half = self._kernel.size // 2
+            self._history = np.zeros(self._kernel.size - 1)   # filter input carried over
+            self._skip = self._half                            # warm-up outputs to drop
 
-    model = Model(model_path)
-    wf = wave.open(file_path, "rb")
+    @staticmethod
+    def _lowpass_kernel(in_rate: int, out_rate: int) -> np.ndarray:
+        """Hamming-windowed sinc passing up to ~0.45 * out_rate, unity gain at DC."""
+        half = int(np.ceil(33 * in_rate / out_rate))
+        cutoff = 0.45 * out_rate / in_rate            # in cycles per input sample
+        n = np.arange(-half, half + 1)
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(n.size)
+        return kernel / kernel.sum()
 
-    if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
-        raise ValueError("Audio must be mono 16-bit PCM")
+    @property
+    def is_passthrough(self) -> bool:
+        return self.channels == 1 and self.sampwidth == 2 and self.in_rate == self.out_rate
 
-    sample_rate = wf.getframerate()
-    if sample_rate not in [8000, 16000, 22050, 32000, 44100, 48000]:
-        raise ValueError(f"Unsupported sample rate: {sample_rate} Hz")
+    def _decode(self, data) -> np.ndarray:
+        """Raw little-endian PCM → float32 in int16 units, shape (frames, channels)."""
+        width = self.sampwidth
+        if width == 1:      # 8-bit WAV is unsigned
+            samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) * 256
+        elif width == 2:
+            samples = np.frombuffer(data, dtype="<i2").astype(np.float32)
+        elif width == 3:
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            packed = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+            samples = ((packed << 8) >> 16).astype(np.float32)   # sign-extend, keep top 16 bits
+        else:
+            samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 65536
+        return samples.reshape(-1, self.channels)
 
-    recognizer = KaldiRecognizer(model, sample_rate)
-    recognizer.SetWords(False)
-    recognizer.SetMaxAlternatives(0)
+    def _lowpass(self, mono: np.ndarray) -> np.ndarray:
+        x = np.concatenate((self._history, mono))
+        filtered = np.convolve(x, self._kernel, mode="valid")
+        self._history = x[x.size - self._history.size:]
+        if self._skip:
+            dropped = min(self._skip, filtered.size)
+            filtered, self._skip = filtered[dropped:], self._skip - dropped
+        return filtered
+
+    def _resample(self, mono: np.ndarray) -> np.ndarray:
+        if mono.size == 0:
+            return mono
+        if self._last is None:
+            base, x = 0, mono
+        else:
+            base, x = self._consumed - 1, np.concatenate(([self._last], mono))
+        self._consumed += mono.size
+        self._last = mono[-1]
+
+        # Output sample k sits at input position k * in_rate / out_rate; emit
+        # every one that falls at or before the last input sample seen so far.
+        last_index = self._consumed - 1
+        count = last_index * self.out_rate // self.in_rate + 1 - self._produced
+        positions = (self._produced + np.arange(count)) * (self.in_rate / self.out_rate)
+        self._produced += count
+        return np.interp(positions, base + np.arange(x.size), x)
+
+    def convert(self, data) -> bytes:
+        if self.is_passthrough:
+            return bytes(data)
+        frames = self._decode(data)
+        if frames.size == 0:
+            return b""
+        mono = frames.mean(axis=1) if self.channels > 1 else frames[:, 0]
+        if self._kernel is not None:
+            mono = self._lowpass(mono)
+        if self.in_rate != self.out_rate:
+            mono = self._resample(mono)
+        return np.clip(np.rint(mono), -32768, 32767).astype("<i2").tobytes()
+
+    def flush(self) -> bytes:
+        """The samples still held back by the anti-alias filter; call once at the end."""
+        if self._kernel is None or (self._consumed == 0 and self._skip == self._half):
+            return b""
+        mono = self._resample(self._lowpass(np.zeros(self._half)))
+        return np.clip(np.rint(mono), -32768, 32767).astype("<i2").tobytes()
+
+
+def find_wav_data(buf) -> tuple:
+    """
+    Locate the sample data of a RIFF/WAVE file held in buf.
+    Returns (offset, size) of the "data" chunk, clamped to the buffer for
+    files whose header was never finalised.
+    """
+    if bytes(buf[0:4]) != b"RIFF" or bytes(buf[8:12]) != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+    pos = 12
+    while pos + 8 <= len(buf):
+        chunk_id = bytes(buf[pos:pos + 4])
+        size = int.from_bytes(buf[pos + 4:pos + 8], "little")
+        if chunk_id == b"data":
+            return pos + 8, min(size, len(buf) - pos - 8)
+        pos += 8 + size + (size & 1)   # chunks are word-aligned
+    raise ValueError("WAV file has no data chunk")
+
+
+class WavSource:
+    """
+    Reads a PCM WAV file in chunks of chunk_frames frames as mono 16-bit PCM.
+
+    The file is memory-mapped and mono 16-bit audio is yielded as zero-copy
+    memoryview slices of the mapping; bigger chunk_frames means fewer
+    recognizer calls (see bench_transcribe.py). Stereo/multichannel audio
+    and 8/24/32-bit samples are converted in the same pass; rates Vosk is
+    not set up for are resampled to target_rate.
+    """
+
+    def __init__(self, file_path: str, chunk_frames: int = 4000, target_rate: int = 16000):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+        self.file_path = file_path
+        self.chunk_frames = chunk_frames
+        with wave.open(file_path, "rb") as wf:
+            self.channels = wf.getnchannels()
+            self.sampwidth = wf.getsampwidth()
+            self.source_rate = wf.getframerate()
+        if self.source_rate in SUPPORTED_SAMPLE_RATES:
+            self.sample_rate = self.source_rate
+        else:
+            self.sample_rate = target_rate
+        # Validates the sample width up front
+        PcmConverter(self.channels, self.sampwidth, self.source_rate, self.sample_rate)
+
+    def __iter__(self) -> Iterator[memoryview]:
+        converter = PcmConverter(self.channels, self.sampwidth, self.source_rate, self.sample_rate)
+        frame_bytes = self.channels * self.sampwidth
+        step = self.chunk_frames * frame_bytes
+        with open(self.file_path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            offset, size = find_wav_data(view)
+            end = offset + size - size % frame_bytes
+            for pos in range(offset, end, step):
+                data = view[pos:min(pos + step, end)]
+                if not converter.is_passthrough:
+                    data = converter.convert(data)
+                if data:
+                    yield data
+            tail = converter.flush()
+            if tail:
+                yield tail
+        finally:
+            # Slices still held by the consumer keep the mapping alive; it is
+            # then unmapped when the last of them is garbage-collected.
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                pass
+
+
+class PcmRingBuffer:
+    """
+    Bounded, thread-safe queue of PCM chunks between a capture thread and
+    the recognizer. put() never blocks: when the buffer is full the oldest
+    chunk is discarded and counted, so a slow consumer loses the stalest
+    audio instead of stalling the device.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1 chunk")
+        self._chunks: Deque[bytes] = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.capacity = capacity
+        self.chunks_in = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.high_water = 0
+
+    def put(self, data: bytes) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._chunks) == self.capacity:
+                self.dropped_chunks += 1
+                self.dropped_bytes += len(self._chunks[0])
+            self._chunks.append(data)
+            self.chunks_in += 1
+            self.high_water = max(self.high_water, len(self._chunks))
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next chunk; None once closed and drained, or on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._chunks or self._closed, timeout):
+                return None
+            return self._chunks.popleft() if self._chunks else None
+
+    def clear(self) -> int:
+        """Discard everything buffered (not counted as dropped); returns the chunk count."""
+        with self._cond:
+            count = len(self._chunks)
+            self._chunks.clear()
+            return count
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+
+class MicrophoneSource:
+    """
+    Reads the default input device until Ctrl+C or stop(); Ctrl+C ends the
+    stream cleanly so the last phrase is still finalised.
+
+    PyAudio delivers audio on its own callback thread into a PcmRingBuffer
+    of buffer_seconds, so slow recognition never blocks capture. stats()
+    reports dropped chunks and device-level input overflows.
+    pyaudio is imported here so file and socket sources work without it.
+    """
+
+    def __init__(self, sample_rate: int = 16000, chunk_frames: int = 4000,
+                 buffer_seconds: float = 10.0):
+        self.sample_rate = sample_rate
+        self.chunk_frames = chunk_frames
+        capacity = max(1, int(buffer_seconds * sample_rate / chunk_frames))
+        self.buffer = PcmRingBuffer(capacity)
+        self.device_overflows = 0
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        if status & self._pyaudio.paInputOverflow:
+            self.device_overflows += 1
+        self.buffer.put(in_data)
+        return None, self._pyaudio.paContinue
+
+    def stop(self) -> None:
+        """End iteration once the buffered audio has been consumed."""
+        self.buffer.close()
 
-    result_text = ""
+    def stats(self) -> dict:
+        return {
+            "chunks_captured": self.buffer.chunks_in,
+            "dropped_chunks": self.buffer.dropped_chunks,
+            "dropped_seconds": self.buffer.dropped_bytes / 2 / self.sample_rate,
+            "buffer_high_water": self.buffer.high_water,
+            "buffer_capacity": self.buffer.capacity,
+            "device_overflows": self.device_overflows,
+        }
+
+    def __iter__(self) -> Iterator[bytes]:
+        import pyaudio
+
+        self._pyaudio = pyaudio
+        p = pyaudio.PyAudio()
+        stream = p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk_frames,
+            stream_callback=self._callback,
+        )
+        stream.start_stream()
+        try:
+            while True:
+                # Short waits keep Ctrl+C responsive on the main thread
+                data = self.buffer.get(timeout=0.25)
+                if data is not None:
+                    yield data
+                elif self.buffer.closed:
+                    return
+        except KeyboardInterrupt:
+            return
+        finally:
+            self.buffer.close()
+            stream.stop_stream()
+            stream.close()
+            p.terminate()
+
+
+class EnergyGate:
+    """
+    Wraps a PCM source and drops silent chunks before they reach Kaldi.
+
+    A chunk passes when its RMS energy is at least threshold, or while
+    within hangover seconds of the last loud chunk. The most recent skipped
+    chunk is held back and replayed ahead of the next loud one so word
+    onsets are not clipped. stats() reports how much audio was skipped.
+    """
+
+    def __init__(self, source: Iterable[bytes], threshold: float = DEFAULT_VAD_THRESHOLD,
+                 hangover: float = DEFAULT_VAD_HANGOVER, sample_rate: Optional[int] = None):
+        self.source = source
+        self.threshold = threshold
+        self.hangover = hangover
+        self.sample_rate = sample_rate or getattr(source, "sample_rate", 16000)
+        self.chunks_in = 0
+        self.chunks_skipped = 0
+        self.seconds_in = 0.0
+        self.seconds_skipped = 0.0
+
+    @staticmethod
+    def rms(data) -> float:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32)
+        return float(np.sqrt(np.mean(samples * samples))) if samples.size else 0.0
+
+    def _skip(self, seconds: float) -> None:
+        self.chunks_skipped += 1
+        self.seconds_skipped += seconds
+
+    def __iter__(self) -> Iterator[bytes]:
+        quiet_for = self.hangover      # start closed: leading silence is skipped
+        held = None                    # (chunk, seconds) of the last skipped chunk
+        for data in self.source:
+            seconds = len(data) / 2 / self.sample_rate
+            self.chunks_in += 1
+            self.seconds_in += seconds
+            if self.rms(data) >= self.threshold:
+                if held is not None:
+                    yield held[0]
+                    held = None
+                quiet_for = 0.0
+                yield data
+            elif quiet_for < self.hangover:
+                quiet_for += seconds
+                yield data
+            else:
+                if held is not None:
+                    self._skip(held[1])
+                held = (data, seconds)
+        if held is not None:
+            self._skip(held[1])
+
+    def stats(self) -> dict:
+        return {
+            "chunks_in": self.chunks_in,
+            "chunks_skipped": self.chunks_skipped,
+            "seconds_in": round(self.seconds_in, 3),
+            "seconds_skipped": round(self.seconds_skipped, 3),
+            "skipped_ratio": self.seconds_skipped / self.seconds_in if self.seconds_in else 0.0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Streaming recognition
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class RecognitionEvent:
+    """A recognition update: kind is "partial" (may still change) or "final"."""
+    kind: str
+    text: str
+
+    @property
+    def is_final(self) -> bool:
+        return self.kind == "final"
+
+
+def _waveform(recognizer, data):
+    """
+    The Vosk binding only accepts bytes (or a cffi buffer) for audio, so
+    memoryview chunks are wrapped with cffi's from_buffer rather than copied.
+    vosk._ffi is not public API; without it the chunk is copied to bytes.
+    """
+    if isinstance(data, bytes) or not isinstance(recognizer, vosk.KaldiRecognizer):
+        return data
+    ffi = getattr(vosk, "_ffi", None)
+    if ffi is None:
+        return bytes(data)
+    return ffi.from_buffer(data)
+
+
+def stream_transcribe(
+    source: Iterable[bytes],
+    model_path: str,
+    sample_rate: Optional[int] = None,
+    partials: bool = True,
+) -> Iterator[RecognitionEvent]:
+    """
+    Feed PCM chunks from source to Vosk and yield recognition events.
+
+    A "final" event is yielded whenever Vosk closes an utterance (after a
+    pause) and once more for whatever remains when the source ends. With
+    partials=True, a "partial" event is yielded each time the in-progress
+    hypothesis changes. sample_rate defaults to source.sample_rate, else 16000.
+    A Ctrl+C while decoding still yields that last final event before the
+    KeyboardInterrupt is raised.
+    """
+    if sample_rate is None:
+        sample_rate = getattr(source, "sample_rate", 16000)
+    recognizer = get_recognizer(model_path, sample_rate)
+
+    last_partial = ""
+    interrupted = False
+    try:
+        for data in source:
+            if recognizer.AcceptWaveform(_waveform(recognizer, data)):
+                last_partial = ""
+                text = json.loads(recognizer.Result()).get("text", "").strip()
+                if text:
+                    yield RecognitionEvent("final", text)
+            elif partials:
+                text = json.loads(recognizer.PartialResult()).get("partial", "").strip()
+                if text and text != last_partial:
+                    last_partial = text
+                    yield RecognitionEvent("partial", text)
+    except KeyboardInterrupt:
+        interrupted = True
+
+    text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+    if text:
+        yield RecognitionEvent("final", text)
+    if interrupted:
+        raise KeyboardInterrupt
+
+
+async def astream_transcribe(
+    source: Iterable[bytes],
+    model_path: str,
+    sample_rate: Optional[int] = None,
+    partials: bool = True,
+) -> AsyncIterator[RecognitionEvent]:
+    """Async iterator over stream_transcribe; blocking reads run in a worker thread."""
+    events = stream_transcribe(source, model_path, sample_rate, partials)
+    done = object()
     while True:
-        data = wf.readframes(4000)
-        if len(data) == 0:
+        event = await asyncio.to_thread(next, events, done)
+        if event is done:
             break
-        if recognizer.AcceptWaveform(data):
-            result = json.loads(recognizer.Result())
-            result_text += result.get("text", "") + " "
+        yield event
+
 
-    final = json.loads(recognizer.FinalResult())
-    result_text += final.get("text", "")
+def transcribe_file(file_path: str, model_path: str,
+                    vad_threshold: Optional[float] = None,
+                    vad_hangover: float = DEFAULT_VAD_HANGOVER,
+                    chunk_frames: int = 4000) -> str:
+    """
+    Transcribes a pre-recorded WAV file using Vosk.
+    Used for unit tests and batch processing. The model is loaded once per
+    process and reused (see get_model / unload_model). Any PCM WAV is
+    accepted; see WavSource for the conversion.
+    With vad_threshold set, silent stretches are skipped by an EnergyGate.
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found: {model_path}")
 
-    wf.close()
-    return result_text.strip()
+    source = WavSource(file_path, chunk_frames)
+    if vad_threshold is not None:
+        source = EnergyGate(source, vad_threshold, vad_hangover)
+    finals = stream_transcribe(source, model_path, partials=False)
+    return " ".join(event.text for event in finals)
 
 
-def listen_and_transcribe(model_path: str, sample_rate: int = 16000):
+def listen_and_transcribe(model_path: str, sample_rate: int = 16000,
+                          vad_threshold: Optional[float] = DEFAULT_VAD_THRESHOLD):
     """
     Listen to microphone indefinitely, print final recognitions to console,
     and append them to a new timestamped file for this session.
+    Silence below vad_threshold is skipped (None feeds every frame).
     Stops with Ctrl+C.
     """
-    recognizer = get_recognizer(model_path, sample_rate)
-
-    p = pyaudio.PyAudio()
-
-    stream = p.open(
-        format=pyaudio.paInt16,
-        channels=1,
-        rate=sample_rate,
-        input=True,
-        frames_per_buffer=8192,  # larger buffer → fewer calls, but still low latency
-    )
+    microphone = MicrophoneSource(sample_rate)
+    source = microphone if vad_threshold is None else EnergyGate(microphone, vad_threshold)
+    events = stream_transcribe(source, model_path, partials=False)
 
     print("\n🎤 Listening... (Speak into the microphone.)")
     print("Press Ctrl+C to stop and save.\n")
@@ -92,36 +571,31 @@ def listen_and_transcribe(model_path: str, sample_rate: int = 16000):
             f"Transcription started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
         )
 
-        stream.start_stream()
+        def save(event: RecognitionEvent) -> None:
+            print(event.text)
+            f.write(event.text + "\n")
+            f.flush()  # ensure it's written immediately
 
         try:
-            while True:
-                data = stream.read(4000, exception_on_overflow=False)
-
-                if recognizer.AcceptWaveform(data):
-                    # Final result after pause/silence
-                    result = json.loads(recognizer.Result())
-                    text = result.get("text", "").strip()
-
-                    if text:
-                        print(text)
-                        f.write(text + "\n")
-                        f.flush()  # ensure it's written immediately
-
+            for event in events:
+                save(event)
         except KeyboardInterrupt:
-            print("\n\nStopping...")
-
-        # Grab any partial final phrase that wasn't ended by silence
-        final = json.loads(recognizer.FinalResult())
-        final_text = final.get("text", "").strip()
-        if final_text:
-            print(final_text)
-            f.write(final_text + "\n")
-
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
+            # Stop capturing and let the decoder finish the phrase in progress.
+            # (If Ctrl+C hit the decoder itself, it has already flushed.)
+            microphone.stop()
+            for event in events:
+                save(event)
+        print("\n\nStopping...")
 
+    stats = microphone.stats()
+    if stats["dropped_chunks"] or stats["device_overflows"]:
+        print(
+            f"⚠ Audio lost: {stats['dropped_seconds']:.1f}s dropped from the buffer, "
+            f"{stats['device_overflows']} device overflows"
+        )
+    if isinstance(source, EnergyGate):
+        gated = source.stats()
+        print(f"Silence skipped: {gated['seconds_skipped']:.1f}s of {gated['seconds_in']:.1f}s")
     print(f"\nSaved to: {os.path.abspath(output_file)}")
 
 
@@ -0,0 +1,88 @@
+"""
+tests/test_answer_cache.py
+==========================
+Offline tests for answer_cache.AnswerCache.
+"""
+
+import time
+
+from answer_cache import AnswerCache, cache_key
+
+
+class FakeTools:
+    def __init__(self):
+        self.data = {"get_my_bookings_today": "Room A 09:00", "get_current_datetime": "now"}
+        self.calls = []
+
+    def run(self, name, args):
+        self.calls.append((name, args))
+        return self.data[name]
+
+
+def today_calls(tools):
+    return [("get_my_bookings_today", {}, tools.data["get_my_bookings_today"])]
+
+
+def test_cache_key_ignores_wording_noise():
+    assert cache_key("Hey, please tell me: do I have bookings today?") == "do i have bookings today"
+
+
+def test_hit_for_reworded_question_reruns_tools():
+    tools = FakeTools()
+    cache = AnswerCache(tools.run)
+    cache.put("Do I have bookings today?", "Yes, Room A at nine.", today_calls(tools))
+
+    assert cache.get("please, do I have bookings today") == "Yes, Room A at nine."
+    assert tools.calls == [("get_my_bookings_today", {})]
+    assert cache.stats()["hits"] == 1
+
+
+def test_changed_tool_data_makes_entry_stale():
+    tools = FakeTools()
+    cache = AnswerCache(tools.run)
+    cache.put("do I have bookings today", "Yes, Room A at nine.", today_calls(tools))
+
+    tools.data["get_my_bookings_today"] = "Room B 10:00"
+    assert cache.get("do I have bookings today") is None
+    assert cache.stats()["stale"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_volatile_answers_not_stored():
+    tools = FakeTools()
+    cache = AnswerCache(tools.run)
+    assert not cache.put("what time is it", "Noon.", [("get_current_datetime", {}, "now")])
+    assert cache.get("what time is it") is None
+
+
+def test_entries_expire_and_invalidate():
+    tools = FakeTools()
+    cache = AnswerCache(tools.run, ttl=0.05)
+    cache.put("hello", "Hi there.", [])
+    assert cache.get("hello") == "Hi there."
+    time.sleep(0.06)
+    assert cache.get("hello") is None
+
+    cache.put("hello", "Hi there.", [])
+    cache.invalidate()
+    assert cache.get("hello") is None
+
+
+def test_fuzzy_matching_is_opt_in():
+    tools = FakeTools()
+    exact = AnswerCache(tools.run)
+    fuzzy = AnswerCache(tools.run, fuzzy_threshold=0.85)
+    for cache in (exact, fuzzy):
+        cache.put("do i have any bookings today", "Yes.", today_calls(tools))
+
+    assert exact.get("do i have any booking today") is None
+    assert fuzzy.get("do i have any booking today") == "Yes."
+    assert fuzzy.stats()["fuzzy_hits"] == 1
+
+
+def test_size_bounded():
+    cache = AnswerCache(FakeTools().run, max_entries=2)
+    for question in ("one", "two", "three"):
+        cache.put(question, question.upper(), [])
+    assert cache.stats()["size"] == 2
+    assert cache.get("one") is None
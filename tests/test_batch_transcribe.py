@@ -0,0 +1,89 @@
+"""
+tests/test_batch_transcribe.py
+==============================
+Offline tests for batch_transcribe.py. The Vosk calls are replaced with
+fakes so no model or audio hardware is needed.
+"""
+
+import json
+import multiprocessing
+import os
+import wave
+
+import pytest
+
+import batch_transcribe
+import speech_to_text
+
+
+def write_wav(path, seconds=0.5, rate=16000):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"\x00\x00" * int(seconds * rate))
+    return str(path)
+
+
+@pytest.fixture
+def audio_dir(tmp_path):
+    (tmp_path / "nested").mkdir()
+    write_wav(tmp_path / "b.wav")
+    write_wav(tmp_path / "a.wav", seconds=1.0)
+    write_wav(tmp_path / "nested" / "c.wav")
+    (tmp_path / "notes.txt").write_text("not audio")
+    return tmp_path
+
+
+@pytest.fixture
+def fake_transcribe(monkeypatch):
+    def transcribe_file(file_path, model_path, vad_threshold=None, chunk_frames=4000):
+        if "broken" in file_path:
+            raise ValueError("Audio must be mono 16-bit PCM")
+        return f"text of {os.path.basename(file_path)}"
+
+    monkeypatch.setattr(speech_to_text, "transcribe_file", transcribe_file)
+    monkeypatch.setattr(speech_to_text, "get_model", lambda model_path: None)
+
+
+def test_collect_audio_files_from_directory(audio_dir):
+    files = batch_transcribe.collect_audio_files(str(audio_dir))
+    assert [os.path.relpath(f, audio_dir) for f in files] == [
+        "a.wav", "b.wav", os.path.join("nested", "c.wav"),
+    ]
+
+
+def test_collect_audio_files_from_glob(audio_dir):
+    files = batch_transcribe.collect_audio_files(str(audio_dir / "*.wav"))
+    assert [os.path.basename(f) for f in files] == ["a.wav", "b.wav"]
+
+
+def test_records_written_as_jsonl(audio_dir, fake_transcribe, tmp_path):
+    files = batch_transcribe.collect_audio_files(str(audio_dir))
+    out = tmp_path / "out.jsonl"
+    records = list(batch_transcribe.transcribe_batch(files, "model", str(out), workers=1))
+
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert lines == records
+    first = lines[0]
+    assert first["text"] == "text of a.wav"
+    assert first["audio_seconds"] == 1.0
+    assert first["elapsed_seconds"] >= 0
+    assert first["error"] is None
+
+
+def test_failed_file_reported_not_raised(audio_dir, fake_transcribe):
+    broken = write_wav(audio_dir / "broken.wav")
+    missing = str(audio_dir / "missing.wav")
+    records = list(batch_transcribe.transcribe_batch([broken, missing], "model", workers=1))
+    assert records[0]["error"] == "ValueError: Audio must be mono 16-bit PCM"
+    assert records[1]["error"].startswith("FileNotFoundError")
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="fakes reach the workers only through fork")
+def test_pool_transcribes_every_file(audio_dir, fake_transcribe):
+    files = batch_transcribe.collect_audio_files(str(audio_dir))
+    records = list(batch_transcribe.transcribe_batch(files, "model", workers=2))
+    assert sorted(r["file"] for r in records) == files
+    assert all(r["worker"] != os.getpid() for r in records)
@@ -24,6 +24,7 @@ TestAddRoom
   test_add_room_empty_name_raises       — ValueError on blank name
   test_add_room_zero_capacity_raises    — ValueError on capacity = 0
   test_add_room_negative_capacity_raises— ValueError on capacity < 0
+  test_add_room_non_text_name_raises    — ValueError on None / number name
 
 TestRemoveRoom
   test_remove_returns_affected_usernames— returns list of usernames
@@ -40,6 +41,25 @@ TestUpdateCapacity
   test_update_nonexistent_room_raises   — ValueError on missing room
   test_update_other_fields_unchanged    — room_name/is_active untouched
 
+TestBulkOperations
+  test_add_rooms_bulk_returns_ids       — ids in input order, rows stored
+  test_add_rooms_bulk_invalid_row_aborts— one bad row → nothing written
+  test_update_capacities_bulk_persists  — every capacity updated
+  test_update_capacities_bulk_missing   — unknown id → nothing written
+
+TestRoomsWithBookingCounts
+  test_counts_match_bookings            — booking_count per room
+  test_room_without_bookings_is_listed  — LEFT JOIN keeps empty rooms
+  test_next_booking_after_now           — earliest upcoming start_time
+  test_default_now_is_utc               — default *now* compared in UTC
+
+TestConnectionManager
+  test_connection_is_reused             — same thread gets same connection
+  test_pragmas_applied                  — FK on + WAL journal mode
+  test_threads_get_own_connection       — one connection per thread
+  test_close_connections_reopens        — closed pool opens a fresh one
+  test_replaced_file_reopens            — stale handle dropped on new inode
+
 TestSaveDeletionReport
   test_report_file_created              — file exists on disk
   test_report_contains_room_name        — room name in content
@@ -55,17 +75,24 @@ import sqlite3
 import sys
 import tempfile
 import unittest
+from datetime import datetime, timezone
+from unittest import mock
 
 # Ensure project root is on the path so `db.database` imports cleanly
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.database import (  # noqa: E402
     add_room,
+    add_rooms_bulk,
+    close_connections,
+    get_connection,
     get_all_rooms,
     get_bookings_for_room,
     get_room_by_id,
+    get_rooms_with_booking_counts,
     remove_room,
     save_deletion_report,
+    update_capacities_bulk,
     update_room_capacity,
 )
 
@@ -139,6 +166,12 @@ def _make_db() -> str:
     return path
 
 
+def _drop_db(path: str) -> None:
+    """Close pooled connections (flushing the WAL) and delete the file."""
+    close_connections(path)
+    os.unlink(path)
+
+
 # =============================================================================
 # TestAddRoom
 # =============================================================================
@@ -148,7 +181,7 @@ class TestAddRoom(unittest.TestCase):
         self.db = _make_db()
 
     def tearDown(self):
-        os.unlink(self.db)
+        _drop_db(self.db)
 
     def test_add_room_returns_new_id(self):
         """add_room must return a positive integer id."""
@@ -185,6 +218,12 @@ class TestAddRoom(unittest.TestCase):
         with self.assertRaises(ValueError):
             add_room(self.db, "Room Y", -3)
 
+    def test_add_room_non_text_name_raises(self):
+        """add_room must raise ValueError (not AttributeError) for a non-str name."""
+        for name in (None, 42):
+            with self.assertRaises(ValueError):
+                add_room(self.db, name, 5)
+
 
 # =============================================================================
 # TestRemoveRoom
@@ -195,7 +234,7 @@ class TestRemoveRoom(unittest.TestCase):
         self.db = _make_db()
 
     def tearDown(self):
-        os.unlink(self.db)
+        _drop_db(self.db)
 
     def test_remove_returns_affected_usernames(self):
         """remove_room must return the list of usernames with cancelled bookings."""
@@ -242,7 +281,7 @@ class TestUpdateCapacity(unittest.TestCase):
         self.db = _make_db()
 
     def tearDown(self):
-        os.unlink(self.db)
+        _drop_db(self.db)
 
     def test_update_capacity_persists(self):
         """New capacity value must be readable back after update_room_capacity."""
@@ -273,6 +312,150 @@ class TestUpdateCapacity(unittest.TestCase):
         self.assertEqual(updated["is_active"],  original["is_active"])
 
 
+# =============================================================================
+# TestBulkOperations
+# =============================================================================
+class TestBulkOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.db = _make_db()
+
+    def tearDown(self):
+        _drop_db(self.db)
+
+    def test_add_rooms_bulk_returns_ids(self):
+        """add_rooms_bulk must return one id per room, in input order."""
+        ids = add_rooms_bulk(self.db, [("North", 4), ("  South ", 8)])
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(get_room_by_id(self.db, ids[0])["room_name"], "North")
+        self.assertEqual(get_room_by_id(self.db, ids[1])["room_name"], "South")
+        self.assertEqual(get_room_by_id(self.db, ids[1])["capacity"], 8)
+
+    def test_add_rooms_bulk_invalid_row_aborts(self):
+        """A single invalid row must raise and leave the DB unchanged."""
+        with self.assertRaises(ValueError) as ctx:
+            add_rooms_bulk(self.db, [("Ok", 4), ("", 4), ("Zero", 0)])
+        self.assertIn("row 1", str(ctx.exception))
+        self.assertIn("row 2", str(ctx.exception))
+        self.assertEqual(len(get_all_rooms(self.db)), 3)
+
+    def test_update_capacities_bulk_persists(self):
+        """update_capacities_bulk must apply every (room_id, capacity) pair."""
+        update_capacities_bulk(self.db, [(1, 11), (3, 33)])
+        self.assertEqual(get_room_by_id(self.db, 1)["capacity"], 11)
+        self.assertEqual(get_room_by_id(self.db, 3)["capacity"], 33)
+
+    def test_update_capacities_bulk_missing(self):
+        """An unknown room id must raise and leave every capacity unchanged."""
+        with self.assertRaises(ValueError):
+            update_capacities_bulk(self.db, [(1, 11), (9999, 5)])
+        self.assertEqual(get_room_by_id(self.db, 1)["capacity"], 10)
+
+
+# =============================================================================
+# TestRoomsWithBookingCounts
+# =============================================================================
+class TestRoomsWithBookingCounts(unittest.TestCase):
+
+    def setUp(self):
+        self.db = _make_db()
+
+    def tearDown(self):
+        _drop_db(self.db)
+
+    def test_counts_match_bookings(self):
+        """booking_count must equal len(get_bookings_for_room) for every room."""
+        for room in get_rooms_with_booking_counts(self.db):
+            self.assertEqual(
+                room["booking_count"],
+                len(get_bookings_for_room(self.db, room["id"])),
+            )
+
+    def test_room_without_bookings_is_listed(self):
+        """Room 3 has no bookings but must still be returned with a 0 count."""
+        rooms = {r["id"]: r for r in get_rooms_with_booking_counts(self.db)}
+        self.assertEqual(sorted(rooms), [1, 2, 3])
+        self.assertEqual(rooms[3]["booking_count"], 0)
+        self.assertIsNone(rooms[3]["next_booking"])
+
+    def test_next_booking_after_now(self):
+        """next_booking must be the earliest start_time at or after *now*."""
+        rooms = {
+            r["id"]: r
+            for r in get_rooms_with_booking_counts(
+                self.db, now="2026-03-20 12:00:00"
+            )
+        }
+        self.assertEqual(rooms[1]["next_booking"], "2026-03-21 14:00:00")
+        self.assertIsNone(rooms[2]["next_booking"])
+
+    def test_default_now_is_utc(self):
+        """Without *now*, start_time (stored in UTC) is compared with UTC, not local time."""
+        class EasternClock(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                utc = datetime(2026, 3, 21, 14, 30, tzinfo=timezone.utc)
+                # Local wall clock four hours behind, as on a US Eastern machine
+                return utc if tz is not None else datetime(2026, 3, 21, 10, 30)
+
+        with mock.patch("db.database.datetime", EasternClock):
+            rooms = {r["id"]: r for r in get_rooms_with_booking_counts(self.db)}
+        # Room 1's 14:00 UTC booking has already started
+        self.assertIsNone(rooms[1]["next_booking"])
+
+
+# =============================================================================
+# TestConnectionManager
+# =============================================================================
+class TestConnectionManager(unittest.TestCase):
+
+    def setUp(self):
+        self.db = _make_db()
+
+    def tearDown(self):
+        _drop_db(self.db)
+
+    def test_connection_is_reused(self):
+        """Repeated calls on one thread must return the same connection."""
+        self.assertIs(get_connection(self.db), get_connection(self.db))
+
+    def test_pragmas_applied(self):
+        """Pooled connections must enforce FKs and use WAL journaling."""
+        conn = get_connection(self.db)
+        self.assertEqual(
+            conn.execute("PRAGMA foreign_keys").fetchone()[0], 1
+        )
+        self.assertEqual(
+            conn.execute("PRAGMA journal_mode").fetchone()[0], "wal"
+        )
+
+    def test_threads_get_own_connection(self):
+        """Each thread must be handed its own connection."""
+        import threading
+        other = []
+        t = threading.Thread(target=lambda: other.append(get_connection(self.db)))
+        t.start()
+        t.join()
+        self.assertIsNot(other[0], get_connection(self.db))
+
+    def test_close_connections_reopens(self):
+        """After close_connections the next call must open a new connection."""
+        first = get_connection(self.db)
+        close_connections(self.db)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+        self.assertEqual(len(get_all_rooms(self.db)), 3)
+
+    def test_replaced_file_reopens(self):
+        """Replacing the DB file must not leave reads on the old file."""
+        self.assertEqual(len(get_all_rooms(self.db)), 3)
+        replacement = _make_db()
+        add_room(replacement, "Only In Replacement", 2)
+        close_connections(replacement)
+        os.replace(replacement, self.db)
+        self.assertEqual(len(get_all_rooms(self.db)), 4)
+
+
 # =============================================================================
 # TestSaveDeletionReport
 # =============================================================================
@@ -0,0 +1,97 @@
+"""
+tests/test_import_rooms.py
+==========================
+Tests for the CSV/JSON bulk import command (import_rooms.py).
+
+Each test builds its own temporary database (same schema and seed data
+as tests/test_database.py) and import file.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db.database import get_all_rooms, get_room_by_id  # noqa: E402
+from import_rooms import import_rooms  # noqa: E402
+from test_database import _drop_db, _make_db  # noqa: E402
+
+
+class TestImportRooms(unittest.TestCase):
+
+    def setUp(self):
+        self.db = _make_db()
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        _drop_db(self.db)
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, name: str, content: str, encoding: str = "utf-8") -> str:
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w", encoding=encoding) as fh:
+            fh.write(content)
+        return path
+
+    def test_csv_adds_and_updates(self):
+        """Rows without id add rooms; rows with id update capacity."""
+        path = self._write(
+            "rooms.csv",
+            "id,room_name,capacity\n"
+            ",Atrium,12\n"
+            ",Studio,4\n"
+            "2,,9\n",
+        )
+        report = import_rooms(self.db, path)
+        self.assertEqual(len(report["added"]), 2)
+        self.assertEqual(report["updated"], 1)
+        self.assertEqual(report["errors"], [])
+        self.assertEqual(len(get_all_rooms(self.db)), 5)
+        self.assertEqual(get_room_by_id(self.db, 2)["capacity"], 9)
+
+    def test_bad_rows_reported_and_skipped(self):
+        """Invalid rows are reported by row number; valid rows still load."""
+        path = self._write(
+            "rooms.json",
+            json.dumps([
+                {"room_name": "Good", "capacity": 5},
+                {"room_name": "", "capacity": 5},
+                {"room_name": "Bad Cap", "capacity": "lots"},
+                {"id": 9999, "capacity": 5},
+                {"room_name": None, "capacity": 5},
+                {"room_name": 42, "capacity": 5},
+            ]),
+        )
+        report = import_rooms(self.db, path)
+        self.assertEqual(len(report["added"]), 1)
+        self.assertEqual([row for row, _ in report["errors"]], [2, 3, 4, 5, 6])
+        self.assertEqual(len(get_all_rooms(self.db)), 4)
+
+    def test_csv_with_byte_order_mark(self):
+        """Excel's UTF-8 CSV export starts with a BOM; the first header must still be 'id'."""
+        path = self._write(
+            "excel.csv",
+            "id,room_name,capacity\n"
+            ",Atrium,12\n"
+            "2,,9\n",
+            encoding="utf-8-sig",
+        )
+        report = import_rooms(self.db, path)
+        self.assertEqual(report["errors"], [])
+        self.assertEqual(len(report["added"]), 1)
+        self.assertEqual(get_room_by_id(self.db, 2)["capacity"], 9)
+
+    def test_unsupported_extension_raises(self):
+        """Only .csv and .json files are accepted."""
+        path = self._write("rooms.txt", "room_name,capacity\n")
+        with self.assertRaises(ValueError):
+            import_rooms(self.db, path)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,132 @@
+"""
+tests/test_intent_router.py
+===========================
+Offline tests for intent_router.IntentRouter with stand-in tools.
+"""
+
+import pytest
+
+from intent_router import IntentRouter, normalize, speakable
+
+
+class FakeTool:
+    def __init__(self, name, output):
+        self.name = name
+        self.output = output
+        self.calls = []
+
+    def invoke(self, args):
+        self.calls.append(args)
+        return self.output
+
+
+@pytest.fixture
+def tools():
+    return {
+        "get_current_datetime": FakeTool("get_current_datetime", "2026-10-17T14:05:00"),
+        "get_my_bookings_today": FakeTool(
+            "get_my_bookings_today", "Your bookings today:\n• Room A  09:00 – 10:00\n• DMF 473  13:00 – 14:00"
+        ),
+        "get_bookings_for_room": FakeTool("get_bookings_for_room", "No bookings found for rooms matching 'room a'."),
+        "list_available_rooms_now_or_soon": FakeTool(
+            "list_available_rooms_now_or_soon", "Available rooms right now:\n• Room B (capacity 6)"
+        ),
+    }
+
+
+@pytest.fixture
+def router(tools):
+    return IntentRouter(tools.values())
+
+
+@pytest.mark.parametrize("question, intent", [
+    ("Do I have any bookings today?", "bookings_today"),
+    ("what are my meetings today", "bookings_today"),
+    ("What rooms are free right now?", "available_rooms"),
+    ("Are there any available rooms?", "available_rooms"),
+    ("What time is it?", "current_time"),
+    ("What's today's date?", "current_time"),
+    ("what is today", "current_time"),
+    ("Hey, what day is it today please", "current_time"),
+    ("When is my reservation for Room A?", "room_bookings"),
+    ("What are my bookings for today?", "bookings_today"),
+])
+def test_common_questions_are_recognised(router, question, intent):
+    matched, _, confidence = router.classify(question)
+    assert matched.name == intent
+    assert confidence >= router.min_confidence
+
+
+@pytest.mark.parametrize("question", [
+    "Do I have any bookings tomorrow?",
+    "Book room A today at three",
+    "Cancel my booking for Room A",
+    "Tell me a joke",
+    "Do I have meetings today with Bob?",
+    "What's today's weather like?",
+    "Show me the bookings for today",
+    "What are my bookings for tomorrow?",
+    "List my reservations for this week",
+    "When is my meeting in Room A on Friday?",
+])
+def test_other_questions_go_to_the_agent(router, question):
+    assert router.answer(question) is None
+
+
+def test_leftover_words_lower_confidence(tools):
+    from intent_router import Intent
+    import re
+    loose = Intent("bookings_today", "get_my_bookings_today", [re.compile(r"my meetings today")])
+    router = IntentRouter(tools.values(), intents=[loose])
+
+    assert router.classify("my meetings today")[2] == pytest.approx(0.9)
+    _, _, confidence = router.classify("what are my meetings today with bob")
+    assert confidence == pytest.approx(0.9 * 3 / 7)
+    assert router.answer("what are my meetings today with bob") is None
+
+
+def test_fast_path_calls_tool_and_formats_answer(router, tools):
+    answer = router.answer("do i have any bookings today")
+    assert answer == "Your bookings today: Room A  09:00 to 10:00; DMF 473  13:00 to 14:00."
+    assert tools["get_my_bookings_today"].calls == [{}]
+
+
+def test_room_name_passed_to_tool(router, tools):
+    router.answer("When is my booking for the Board Room?")
+    assert tools["get_bookings_for_room"].calls == [{"room_name": "board room"}]
+
+
+def test_available_rooms_spoken_from_api_response(monkeypatch):
+    import room_booking_client
+    # Same shape as GET /api/v1/meeting-rooms/available/
+    monkeypatch.setattr(room_booking_client, "get_available_rooms", lambda: [
+        {"id": 1, "room_name": "Room A", "capacity": 4, "is_active": True},
+        {"id": 2, "room_name": "DMF 473", "capacity": 10, "is_active": True},
+    ])
+    router = IntentRouter([room_booking_client.list_available_rooms_now_or_soon])
+    assert router.answer("what rooms are free") == (
+        "Available rooms right now: Room A (capacity 4); DMF 473 (capacity 10)."
+    )
+
+
+def test_time_is_spoken_naturally(router):
+    assert router.answer("What time is it?") == "It's 2:05 PM on Saturday, October 17."
+
+
+def test_report_has_hit_rate_and_latency_per_path(router):
+    router.answer("what rooms are free")
+    router.answer("what time is it")
+    assert router.answer("summarise my week") is None
+    router.record_agent(2.0)
+
+    report = router.report()
+    assert report["questions"] == 3
+    assert report["fast_path_hit_rate"] == pytest.approx(2 / 3)
+    assert report["fast"]["count"] == 2
+    assert report["agent"]["median_ms"] == 2000.0
+    assert report["intents"] == {"available_rooms": 1, "current_time": 1}
+
+
+def test_helpers():
+    assert normalize("  What's   FREE, now?! ") == "what's free now"
+    assert speakable("You have no bookings today.") == "You have no bookings today."
@@ -0,0 +1,63 @@
+"""
+tests/test_latency_trace.py
+===========================
+Offline tests for latency_trace.Tracer and its LangChain callback handler.
+"""
+
+import json
+import uuid
+
+import pytest
+
+from latency_trace import SpanCallbackHandler, Tracer, percentile
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) is None
+    assert percentile([5.0], 95) == 5.0
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile(list(range(1, 101)), 95) == pytest.approx(95.05)
+
+
+def test_spans_written_as_jsonl(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(str(path))
+    tracer.new_turn()
+    with tracer.span("listen", backend="text"):
+        pass
+    with pytest.raises(RuntimeError):
+        with tracer.span("recognize"):
+            raise RuntimeError("offline")
+    tracer.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["turn"], e["stage"]) for e in lines] == [(1, "listen"), (1, "recognize")]
+    assert lines[0]["backend"] == "text" and lines[0]["ms"] >= 0
+    assert lines[1]["error"] == "RuntimeError"
+
+
+def test_summary_has_p50_and_p95_per_stage():
+    tracer = Tracer()
+    for ms in range(1, 21):
+        tracer.record("tts", ms / 1000)
+    tracer.record("llm", 0.5)
+
+    summary = tracer.summary()
+    assert summary["tts"] == {"count": 20, "p50_ms": 10.5, "p95_ms": 19.1}
+    assert summary["llm"]["p95_ms"] == 500.0
+    assert "tts" in tracer.format_summary()
+
+
+def test_callback_handler_times_model_and_tool_calls():
+    tracer = Tracer()
+    handler = SpanCallbackHandler(tracer)
+    llm_run, tool_run = uuid.uuid4(), uuid.uuid4()
+
+    handler.on_chat_model_start({}, [[]], run_id=llm_run)
+    handler.on_tool_start({"name": "get_my_bookings_today"}, "", run_id=tool_run)
+    handler.on_tool_error(TimeoutError(), run_id=tool_run)
+    handler.on_llm_end(None, run_id=llm_run)
+    handler.on_llm_end(None, run_id=uuid.uuid4())      # unknown run: ignored
+
+    assert tracer.summary()["llm"]["count"] == 1
+    assert tracer.summary()["tool"]["count"] == 1
@@ -0,0 +1,94 @@
+"""
+tests/test_ollama_warmup.py
+===========================
+Tests for ollama_warmup.OllamaKeepAlive against a local fake Ollama
+HTTP server (no Ollama needed).
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ollama_warmup import OllamaKeepAlive, load_model
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    requests = []
+    delay = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append((self.path, body))
+        time.sleep(type(self).delay)
+        payload = json.dumps({"model": body["model"], "response": "", "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama():
+    FakeOllama.requests = []
+    FakeOllama.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", FakeOllama
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_load_model_sends_load_only_request(ollama):
+    url, server = ollama
+    load_model(url + "/", "granite", keep_alive="10m")
+    assert server.requests == [
+        ("/api/generate", {"model": "granite", "prompt": "", "stream": False, "keep_alive": "10m"}),
+    ]
+
+
+def test_warm_up_runs_in_background(ollama):
+    url, server = ollama
+    server.delay = 0.3                    # a slow model load
+    started = time.monotonic()
+    keeper = OllamaKeepAlive(url, "granite", interval=0).start()
+    assert time.monotonic() - started < 0.2     # start() did not wait for the load
+    assert keeper.ready.wait(3)
+    keeper.stop()
+    assert keeper.warm_up_seconds >= 0.3
+    assert len(server.requests) == 1
+
+
+def test_heartbeat_repeats_and_reports(ollama):
+    url, server = ollama
+    seen = []
+    keeper = OllamaKeepAlive(url, "granite", interval=0.05,
+                             on_request=lambda kind, seconds, error: seen.append(kind)).start()
+    wait_for(lambda: keeper.heartbeats >= 2)
+    keeper.stop()
+    assert seen[:3] == ["warm_up", "heartbeat", "heartbeat"]
+    assert keeper.stats()["failures"] == 0
+
+
+def test_unreachable_server_retried_not_raised(ollama):
+    url, server = ollama
+    keeper = OllamaKeepAlive("http://127.0.0.1:9", "granite", interval=0.05, timeout=1).start()
+    wait_for(lambda: keeper.failures >= 2)
+    keeper.base_url = url                 # Ollama comes up later
+    wait_for(keeper.ready.is_set)
+    keeper.stop()
+    assert keeper.stats()["last_error"].startswith("URLError")
@@ -0,0 +1,364 @@
+"""
+tests/test_room_booking_client.py
+=================================
+Offline tests for room_booking_client.RoomBookingClient.
+
+A tiny in-process HTTP server stands in for the booking API so the
+client's behaviour (connection reuse, auth, retries) can be checked
+without the deployed server.
+"""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import room_booking_client
+from room_booking_client import RoomBookingClient, decode_token_expiry
+
+
+def make_jwt(name: str, lifetime: float) -> str:
+    """Unsigned JWT-shaped token whose payload carries an 'exp' claim."""
+    def part(obj):
+        raw = json.dumps(obj).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+    return ".".join([part({"alg": "none"}), part({"exp": time.time() + lifetime, "n": name}), "sig"])
+
+
+class FakeBookingAPI:
+    """Records every request and replies from a small routing table."""
+
+    def __init__(self):
+        self.requests = []          # (method, path, query, body, headers)
+        self.client_ports = set()   # one entry per TCP connection
+        self.logins = 0
+        self.refreshes = 0
+        self.access_lifetime = 900  # seconds, like ACCESS_TOKEN_LIFETIME
+        self.refresh_ok = True
+        self.reject_next = 0        # answer this many API calls with 401
+        self.auth_delay = 0.0       # seconds each login/refresh takes
+        self.bookings = []
+
+    def handle(self, handler, method):
+        parsed = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length)) if length else None
+        self.client_ports.add(handler.client_address[1])
+        self.requests.append(
+            (method, parsed.path, parse_qs(parsed.query), body, dict(handler.headers))
+        )
+
+        if parsed.path in ("/api/v1/member/login/", "/api/v1/member/token/refresh/"):
+            time.sleep(self.auth_delay)
+        if parsed.path == "/api/v1/member/login/":
+            self.logins += 1
+            self.access = make_jwt(f"login-{self.logins}", self.access_lifetime)
+            return 200, {"token": {"access": self.access, "refresh": f"refresh-{self.logins}"}}
+        if parsed.path == "/api/v1/member/token/refresh/":
+            if not self.refresh_ok:
+                return 401, {"detail": "Token is invalid or expired"}
+            self.refreshes += 1
+            self.access = make_jwt(f"refresh-{self.refreshes}", self.access_lifetime)
+            return 200, {"access": self.access}
+        if self.reject_next:
+            self.reject_next -= 1
+            return 401, {"detail": "token expired"}
+        if parsed.path == "/api/v1/meeting-rooms/available/":
+            return 200, [{"id": 1, "room_name": "Room A", "capacity": 4}]
+        if parsed.path == "/api/v1/meeting-rooms/my-bookings/":
+            return self.page(parse_qs(parsed.query))
+        if parsed.path.endswith("/book/"):
+            return 201, {"message": "Meeting room booked successfully."}
+        if parsed.path.endswith("/cancel-booking/"):
+            return 204, None
+        return 404, {"error": "not found"}
+
+    def page(self, query):
+        """Mimic KeysetPagination: list body plus a Link: rel="next" header."""
+        size = int(query.get("page_size", ["100"])[0])
+        start = int(query.get("cursor", ["0"])[0])
+        rows = self.bookings[start:start + size]
+        if start + size >= len(self.bookings):
+            return 200, rows
+        link = f'</api/v1/meeting-rooms/my-bookings/?page_size={size}&cursor={start + size}>; rel="next"'
+        return 200, rows, {"Link": link}
+
+
+@pytest.fixture
+def fake_api():
+    api = FakeBookingAPI()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+
+        def _reply(self, method):
+            status, payload, *extra = api.handle(self, method)
+            data = b"" if payload is None else json.dumps(payload).encode()
+            self.send_response(status)
+            for name, value in (extra[0] if extra else {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._reply("GET")
+
+        def do_POST(self):
+            self._reply("POST")
+
+        def do_DELETE(self):
+            self._reply("DELETE")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    api.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield api
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(fake_api, monkeypatch):
+    # Cache off: these tests count the requests that reach the server
+    with RoomBookingClient(fake_api.url, "test@example.com", "password", cache_ttl=0) as c:
+        monkeypatch.setattr(room_booking_client, "_client", c)   # used by the tools
+        yield c
+
+
+@pytest.fixture
+def cached_client(fake_api, monkeypatch):
+    with RoomBookingClient(fake_api.url, "test@example.com", "password") as c:
+        monkeypatch.setattr(room_booking_client, "_client", c)
+        yield c
+
+
+def api_calls(fake_api, suffix):
+    return [r for r in fake_api.requests if r[1].endswith(suffix)]
+
+
+def test_requests_reuse_one_connection(client, fake_api):
+    for _ in range(5):
+        assert client.get_available_rooms()[0]["room_name"] == "Room A"
+    assert fake_api.logins == 1
+    assert len(fake_api.client_ports) == 1
+
+
+def test_token_sent_as_bearer(client, fake_api):
+    list(client.get_my_bookings())
+    headers = fake_api.requests[-1][4]
+    assert headers["Authorization"] == f"Bearer {fake_api.access}"
+
+
+def test_401_renews_token_and_retries_once(client, fake_api):
+    client.get_available_rooms()
+    fake_api.reject_next = 1
+    rooms = client.get_available_rooms()
+    assert rooms[0]["id"] == 1
+    assert fake_api.logins == 1
+    assert fake_api.refreshes == 1
+    assert fake_api.requests[-1][4]["Authorization"] == f"Bearer {fake_api.access}"
+
+
+def test_settings_read_from_environment_on_first_use(monkeypatch):
+    monkeypatch.setattr(room_booking_client, "load_dotenv", lambda: None)
+    monkeypatch.setenv("SERVER_URL", "http://booking.example")
+    monkeypatch.setenv("EMAIL", "me@example.com")
+    monkeypatch.setenv("PASSWORD", "secret")
+    assert room_booking_client.load_settings() == ("http://booking.example", "me@example.com", "secret")
+
+    monkeypatch.delenv("PASSWORD")
+    with pytest.raises(ValueError):
+        room_booking_client.load_settings()
+
+
+def test_decode_token_expiry():
+    token = make_jwt("x", 100)
+    assert abs(decode_token_expiry(token) - (time.time() + 100)) < 5
+    assert decode_token_expiry("not-a-jwt") is None
+
+
+def test_token_refreshed_before_expiry_without_login(client, fake_api):
+    fake_api.access_lifetime = 30   # inside the refresh margin
+    list(client.get_my_bookings())
+    list(client.get_my_bookings())
+    assert fake_api.logins == 1
+    assert fake_api.refreshes == 1
+
+
+def parallel(calls, fn):
+    """Run fn from `calls` threads released at the same moment."""
+    barrier = threading.Barrier(calls)
+
+    def run():
+        barrier.wait()
+        fn()
+    threads = [threading.Thread(target=run) for _ in range(calls)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_parallel_calls_log_in_once(client, fake_api):
+    fake_api.auth_delay = 0.2
+    parallel(4, client.get_available_rooms)
+    assert fake_api.logins == 1
+
+
+def test_parallel_calls_near_expiry_refresh_once(client, fake_api):
+    fake_api.access_lifetime = 30   # inside the refresh margin
+    client.get_available_rooms()
+    fake_api.auth_delay = 0.2
+    fake_api.access_lifetime = 900
+    parallel(4, client.get_available_rooms)
+    assert (fake_api.logins, fake_api.refreshes) == (1, 1)
+
+
+def test_parallel_401s_renew_token_once(client, fake_api):
+    client.get_available_rooms()
+    fake_api.refresh_ok = False     # force the full login path
+    fake_api.reject_next = 2
+    fake_api.auth_delay = 0.2
+    parallel(2, client.get_available_rooms)
+    assert fake_api.logins == 2
+
+
+def test_fresh_token_is_reused(client, fake_api):
+    for _ in range(3):
+        list(client.get_my_bookings())
+    assert fake_api.logins == 1
+    assert fake_api.refreshes == 0
+
+
+def test_failed_refresh_falls_back_to_login(client, fake_api):
+    fake_api.access_lifetime = 30
+    list(client.get_my_bookings())
+    fake_api.refresh_ok = False
+    list(client.get_my_bookings())
+    assert fake_api.logins == 2
+
+
+def test_my_bookings_filters_sent_as_query_params(client, fake_api):
+    list(client.get_my_bookings(date_from="2026-03-20", room="board", upcoming=True, limit=5))
+    query = fake_api.requests[-1][2]
+    assert query == {
+        "date_from": ["2026-03-20"],
+        "room": ["board"],
+        "upcoming": ["true"],
+        "limit": ["5"],
+    }
+
+
+def test_my_bookings_pages_fetched_lazily(client, fake_api):
+    fake_api.bookings = [{"id": n} for n in range(5)]
+    bookings = client.get_my_bookings(page_size=2)
+    assert [next(bookings)["id"], next(bookings)["id"]] == [0, 1]
+    page_requests = [r for r in fake_api.requests if r[1].endswith("/my-bookings/")]
+    assert len(page_requests) == 1          # second page not fetched yet
+    assert [b["id"] for b in bookings] == [2, 3, 4]
+    page_requests = [r for r in fake_api.requests if r[1].endswith("/my-bookings/")]
+    assert len(page_requests) == 3
+
+
+def test_today_tool_asks_server_for_today_only(client, fake_api):
+    fake_api.bookings = [{
+        "id": 1,
+        "meeting_room": {"id": 1, "room_name": "Room A", "capacity": 4},
+        "start_time": "2026-03-20T09:00:00Z",
+        "end_time": "2026-03-20T10:00:00Z",
+    }]
+    text = room_booking_client.get_my_bookings_today.invoke({})
+    assert "Room A  09:00 – 10:00" in text
+    query = fake_api.requests[-1][2]
+    assert set(query) == {"date_from", "date_to"}
+
+
+def test_room_tool_filters_by_room_on_server(client, fake_api):
+    room_booking_client.get_bookings_for_room.invoke({"room_name": "Room A"})
+    assert fake_api.requests[-1][2] == {"room": ["Room A"]}
+
+
+def test_post_and_delete_dispatch(client, fake_api):
+    booked = client.book_room(1, "2026-01-01 10:00 AM", "2026-01-01 11:00 AM", 3)
+    assert "successfully" in booked["message"]
+    assert fake_api.requests[-1][3]["no_of_persons"] == 3
+    assert client.cancel_booking(7) is True
+    assert fake_api.requests[-1][:2] == ("DELETE", "/api/v1/meeting-rooms/7/cancel-booking/")
+
+
+def test_unsupported_method_raises(client):
+    with pytest.raises(ValueError):
+        client.request("PATCH", "/api/v1/meeting-rooms/available/")
+
+
+def test_repeat_get_served_from_cache(cached_client, fake_api):
+    for _ in range(3):
+        room_booking_client.list_available_rooms_now_or_soon.invoke({})
+    assert len(api_calls(fake_api, "/available/")) == 1
+    stats = room_booking_client.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_cache_keyed_by_params(cached_client, fake_api):
+    list(cached_client.get_my_bookings(room="A"))
+    list(cached_client.get_my_bookings(room="B"))
+    list(cached_client.get_my_bookings(room="A"))
+    assert [r[2] for r in api_calls(fake_api, "/my-bookings/")] == [{"room": ["A"]}, {"room": ["B"]}]
+
+
+def test_cached_pages_follow_next_links(cached_client, fake_api):
+    fake_api.bookings = [{"id": n} for n in range(5)]
+    first = [b["id"] for b in cached_client.get_my_bookings(page_size=2)]
+    again = [b["id"] for b in cached_client.get_my_bookings(page_size=2)]
+    assert first == again == [0, 1, 2, 3, 4]
+    assert len(api_calls(fake_api, "/my-bookings/")) == 3
+
+
+@pytest.mark.parametrize("change", [
+    lambda c: c.book_room(1, "2026-01-01 10:00 AM", "2026-01-01 11:00 AM"),
+    lambda c: c.cancel_booking(7),
+])
+def test_booking_changes_invalidate_cache(cached_client, fake_api, change):
+    cached_client.get_available_rooms()
+    change(cached_client)
+    cached_client.get_available_rooms()
+    assert len(api_calls(fake_api, "/available/")) == 2
+    assert cached_client.cache_stats()["invalidations"] == 1
+
+
+def test_cache_entries_expire(fake_api):
+    with RoomBookingClient(fake_api.url, "test@example.com", "password", cache_ttl=0.05) as c:
+        c.get_available_rooms()
+        time.sleep(0.06)
+        c.get_available_rooms()
+        assert len(api_calls(fake_api, "/available/")) == 2
+        assert c.cache_stats()["expired"] == 1
+
+
+def test_cache_size_bounded(fake_api):
+    with RoomBookingClient(fake_api.url, "test@example.com", "password", cache_size=2) as c:
+        for room in ("A", "B", "C"):
+            list(c.get_my_bookings(room=room))
+        stats = c.cache_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_change_listeners_called_after_booking_changes(client, monkeypatch):
+    monkeypatch.setattr(room_booking_client, "_change_listeners", [])
+    changes = []
+    room_booking_client.add_change_listener(lambda: changes.append(1))
+    client.get_available_rooms()
+    assert changes == []
+    client.cancel_booking(7)
+    assert changes == [1]
@@ -1,5 +1,12 @@
-import pytest
+import asyncio
+import json
 import os
+import sys
+import wave
+
+import numpy as np
+import pytest
+import speech_to_text
 from speech_to_text import transcribe_file
 
 
@@ -34,3 +41,381 @@ def test_transcribe_known_audio(model_path):
     ]
     found = any(phrase in text for phrase in expected_phrases)
     assert found, f"None of {expected_phrases} found in: {text!r}"
+
+
+class FakeModel:
+    loads = 0
+
+    def __init__(self, path):
+        FakeModel.loads += 1
+        self.path = path
+
+
+class FakeRecognizer:
+    """Hears one word per loud chunk; a silent chunk ends the utterance."""
+
+    def __init__(self, model, sample_rate):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.words = []
+        self.heard = 0
+
+    def SetWords(self, enabled):
+        pass
+
+    def SetMaxAlternatives(self, count):
+        pass
+
+    def AcceptWaveform(self, data):
+        if any(data):
+            self.heard += 1
+            self.words.append(f"w{self.heard}")
+            return False
+        return bool(self.words)
+
+    def _take(self):
+        text, self.words = " ".join(self.words), []
+        return json.dumps({"text": text})
+
+    def Result(self):
+        return self._take()
+
+    def FinalResult(self):
+        return self._take()
+
+    def PartialResult(self):
+        return json.dumps({"partial": " ".join(self.words)})
+
+
+@pytest.fixture
+def fake_vosk(monkeypatch, tmp_path):
+    FakeModel.loads = 0
+    monkeypatch.setattr(speech_to_text, "Model", FakeModel)
+    monkeypatch.setattr(speech_to_text, "KaldiRecognizer", FakeRecognizer)
+    speech_to_text.unload_model()
+    yield str(tmp_path)
+    speech_to_text.unload_model()
+
+
+def test_model_loaded_once_per_path(fake_vosk):
+    first = speech_to_text.get_recognizer(fake_vosk, 16000)
+    second = speech_to_text.get_recognizer(fake_vosk, 8000)
+    assert FakeModel.loads == 1
+    assert first.model is second.model
+    assert second.sample_rate == 8000
+
+
+def test_unload_model_forces_reload(fake_vosk):
+    speech_to_text.get_model(fake_vosk)
+    speech_to_text.unload_model(fake_vosk)
+    speech_to_text.get_model(fake_vosk)
+    assert FakeModel.loads == 2
+
+
+def test_missing_model_not_cached(fake_vosk):
+    with pytest.raises(FileNotFoundError):
+        speech_to_text.get_model(os.path.join(fake_vosk, "missing"))
+    assert FakeModel.loads == 0
+
+
+LOUD = b"\x10\x00" * 100
+QUIET = b"\x00\x00" * 100
+
+
+def write_wav(path, chunks, rate=16000, channels=1):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"".join(chunks))
+    return str(path)
+
+
+def test_stream_yields_partials_then_finals(fake_vosk):
+    source = [LOUD, LOUD, QUIET, LOUD]
+    events = list(speech_to_text.stream_transcribe(source, fake_vosk))
+    assert [(e.kind, e.text) for e in events] == [
+        ("partial", "w1"),
+        ("partial", "w1 w2"),
+        ("final", "w1 w2"),
+        ("partial", "w3"),
+        ("final", "w3"),
+    ]
+
+
+def test_stream_without_partials(fake_vosk):
+    events = list(speech_to_text.stream_transcribe([LOUD, QUIET, QUIET], fake_vosk, partials=False))
+    assert [(e.kind, e.text) for e in events] == [("final", "w1")]
+
+
+def test_wav_source_sets_rate_and_chunks(fake_vosk, tmp_path):
+    path = write_wav(tmp_path / "a.wav", [LOUD, QUIET, LOUD], rate=8000)
+    source = speech_to_text.WavSource(path, chunk_frames=100)
+    assert source.sample_rate == 8000
+    assert len(list(source)) == 3
+    # transcribe_file reads 4000 frames at a time: the whole clip is one chunk
+    assert speech_to_text.transcribe_file(path, fake_vosk) == "w1"
+
+
+def write_raw_wav(path, frames, rate, channels, sampwidth):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sampwidth)
+        wf.setframerate(rate)
+        wf.writeframes(frames)
+    return str(path)
+
+
+def samples(data):
+    return np.frombuffer(data, dtype="<i2").tolist()
+
+
+def test_wav_source_downmixes_stereo(tmp_path):
+    frames = np.array([[1000, 3000], [-2000, 0]] * 50, dtype="<i2").tobytes()
+    path = write_raw_wav(tmp_path / "stereo.wav", frames, 16000, channels=2, sampwidth=2)
+    source = speech_to_text.WavSource(path)
+    assert source.sample_rate == 16000
+    assert samples(b"".join(source)) == [2000, -1000] * 50
+
+
+@pytest.mark.parametrize("sampwidth, raw, expected", [
+    (1, bytes([128, 255, 0]), [0, 32512, -32768]),
+    (3, bytes([0, 0x10, 0x00, 0, 0x00, 0x80]), [16, -32768]),
+    (4, np.array([65536 * 5, -65536 * 7], dtype="<i4").tobytes(), [5, -7]),
+])
+def test_converter_sample_widths(sampwidth, raw, expected):
+    converter = speech_to_text.PcmConverter(1, sampwidth, 16000)
+    assert samples(converter.convert(raw)) == expected
+
+
+def test_converter_rejects_unknown_width():
+    with pytest.raises(ValueError):
+        speech_to_text.PcmConverter(1, 5, 16000)
+
+
+def test_resampling_is_chunk_independent():
+    rate_in, rate_out = 24000, 16000
+    t = np.arange(rate_in) / rate_in
+    tone = (8000 * np.sin(2 * np.pi * 440 * t)).astype("<i2").tobytes()
+
+    converter = speech_to_text.PcmConverter(1, 2, rate_in, rate_out)
+    whole = converter.convert(tone) + converter.flush()
+    chunked = speech_to_text.PcmConverter(1, 2, rate_in, rate_out)
+    pieces = b"".join(chunked.convert(tone[i:i + 998]) for i in range(0, len(tone), 998))
+    pieces += chunked.flush()
+
+    assert pieces == whole
+    assert len(whole) // 2 == rate_out      # one second in, one second out
+
+
+def rms_after_downsampling(frequency, rate_in=96000, rate_out=16000):
+    t = np.arange(rate_in) / rate_in
+    tone = (8000 * np.sin(2 * np.pi * frequency * t)).astype("<i2").tobytes()
+    converter = speech_to_text.PcmConverter(1, 2, rate_in, rate_out)
+    out = np.array(samples(converter.convert(tone) + converter.flush()), dtype=float)
+    return np.sqrt(np.mean(out[1000:-1000] ** 2))   # skip the edges
+
+
+def test_downsampling_filters_out_tones_above_new_nyquist():
+    passed = rms_after_downsampling(1000)
+    aliased = rms_after_downsampling(12000)         # would fold down to 4 kHz
+    assert passed == pytest.approx(8000 / np.sqrt(2), rel=0.02)
+    assert aliased < passed * 0.01                  # at least 40 dB down
+
+
+def test_wav_source_resamples_unsupported_rate(tmp_path):
+    frames = np.zeros(24000 * 2, dtype="<i2").tobytes()
+    path = write_raw_wav(tmp_path / "odd.wav", frames, 24000, channels=2, sampwidth=2)
+    source = speech_to_text.WavSource(path, chunk_frames=1000)
+    assert (source.source_rate, source.sample_rate) == (24000, 16000)
+    assert len(b"".join(source)) // 2 == 16000
+
+
+def test_async_stream(fake_vosk):
+    async def collect():
+        return [e async for e in speech_to_text.astream_transcribe([LOUD, QUIET], fake_vosk)]
+
+    events = asyncio.run(collect())
+    assert [e.kind for e in events] == ["partial", "final"]
+    assert events[-1].is_final
+
+
+def test_ring_buffer_drops_oldest_when_full():
+    buffer = speech_to_text.PcmRingBuffer(capacity=2)
+    for chunk in (b"a", b"bb", b"ccc"):
+        buffer.put(chunk)
+    assert buffer.dropped_chunks == 1
+    assert buffer.dropped_bytes == 1
+    assert buffer.get() == b"bb"
+    buffer.close()
+    assert buffer.get() == b"ccc"    # drained after close
+    assert buffer.get() is None
+
+
+def test_ctrl_c_while_decoding_still_flushes_final(fake_vosk, monkeypatch):
+    class InterruptingRecognizer(FakeRecognizer):
+        def AcceptWaveform(self, data):
+            if self.heard == 2:
+                raise KeyboardInterrupt
+            return super().AcceptWaveform(data)
+
+    monkeypatch.setattr(speech_to_text, "KaldiRecognizer", InterruptingRecognizer)
+    events = speech_to_text.stream_transcribe([LOUD, LOUD, LOUD, LOUD], fake_vosk, partials=False)
+    assert next(events) == speech_to_text.RecognitionEvent("final", "w1 w2")
+    with pytest.raises(KeyboardInterrupt):
+        next(events)
+
+
+def test_listen_and_transcribe_saves_last_phrase_on_ctrl_c(fake_vosk, monkeypatch, tmp_path):
+    class InterruptingSource:
+        sample_rate = 16000
+
+        def __init__(self, *args, **kwargs):
+            self.stopped = False
+
+        def __iter__(self):
+            yield LOUD
+            yield LOUD
+            if not self.stopped:
+                raise KeyboardInterrupt     # Ctrl+C lands while the decoder runs
+            yield LOUD
+
+        def stop(self):
+            self.stopped = True
+
+        def stats(self):
+            return {"dropped_chunks": 0, "device_overflows": 0}
+
+    monkeypatch.setattr(speech_to_text, "MicrophoneSource", InterruptingSource)
+    monkeypatch.chdir(tmp_path)
+    speech_to_text.listen_and_transcribe(fake_vosk, vad_threshold=None)
+
+    [saved] = tmp_path.glob("transcription_*.txt")
+    assert saved.read_text().splitlines()[-1] == "w1 w2"
+
+
+class FakePyAudioModule:
+    """Stands in for the pyaudio module; the stream calls back from a thread."""
+    paInt16 = 8
+    paContinue = 0
+    paInputOverflow = 2
+
+    def __init__(self, chunks, statuses=None):
+        self.chunks = chunks
+        self.statuses = statuses or [0] * len(chunks)
+
+    def PyAudio(self):
+        return self
+
+    def open(self, stream_callback, frames_per_buffer, **kwargs):
+        self.callback = stream_callback
+        return self
+
+    def start_stream(self):
+        for chunk, status in zip(self.chunks, self.statuses):
+            self.callback(chunk, len(chunk) // 2, {}, status)
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def terminate(self):
+        pass
+
+
+def test_microphone_source_reads_from_ring_buffer(monkeypatch):
+    fake = FakePyAudioModule([LOUD] * 6, statuses=[0, 2, 0, 0, 0, 0])
+    monkeypatch.setitem(sys.modules, "pyaudio", fake)
+    mic = speech_to_text.MicrophoneSource(sample_rate=100, chunk_frames=100, buffer_seconds=4)
+
+    chunks = iter(mic)
+    first = next(chunks)   # capture ran ahead of us and overflowed the 4-chunk buffer
+    mic.stop()
+    rest = list(chunks)
+
+    assert [first, *rest] == [LOUD] * 4
+    stats = mic.stats()
+    assert stats["dropped_chunks"] == 2
+    assert stats["dropped_seconds"] == 2.0
+    assert stats["device_overflows"] == 1
+    assert fake.closed
+
+
+def test_energy_gate_skips_silence_after_hangover():
+    # 100-frame chunks at 100 Hz: one second each
+    source = [QUIET, QUIET, LOUD, QUIET, QUIET, QUIET, QUIET, LOUD]
+    gate = speech_to_text.EnergyGate(source, threshold=10, hangover=2, sample_rate=100)
+    passed = list(gate)
+    # leading silence dropped except the pre-roll chunk; two seconds of hangover
+    # kept after the first word; the chunk before the second word replayed
+    assert passed == [QUIET, LOUD, QUIET, QUIET, QUIET, LOUD]
+    stats = gate.stats()
+    assert stats["chunks_skipped"] == 2
+    assert stats["seconds_skipped"] == 2.0
+    assert stats["skipped_ratio"] == 0.25
+
+
+def test_energy_gate_on_all_silence():
+    gate = speech_to_text.EnergyGate([QUIET] * 3, threshold=10, hangover=0, sample_rate=100)
+    assert list(gate) == []
+    assert gate.stats()["seconds_skipped"] == 3.0
+
+
+def test_transcribe_file_with_vad(fake_vosk, tmp_path):
+    path = write_wav(tmp_path / "gated.wav", [QUIET] * 80 + [LOUD] * 40, rate=8000)
+    assert speech_to_text.transcribe_file(path, fake_vosk, vad_threshold=10) == "w1"
+
+
+def test_wav_source_yields_zero_copy_views(tmp_path):
+    path = write_wav(tmp_path / "mono.wav", [LOUD, QUIET, LOUD])
+    chunks = list(speech_to_text.WavSource(path, chunk_frames=64))
+    assert all(isinstance(c, memoryview) for c in chunks)
+    assert [len(c) for c in chunks] == [128, 128, 128, 128, 88]
+    assert b"".join(chunks) == LOUD + QUIET + LOUD
+
+
+def test_waveform_copies_when_vosk_ffi_is_missing(monkeypatch):
+    import vosk
+
+    class ModelFreeRecognizer(vosk.KaldiRecognizer):
+        def __init__(self):
+            pass
+
+        def __del__(self):
+            pass
+
+    recognizer = ModelFreeRecognizer()
+    chunk = memoryview(b"\x01\x00\x02\x00")
+    if hasattr(vosk, "_ffi"):
+        assert not isinstance(speech_to_text._waveform(recognizer, chunk), bytes)   # zero-copy
+
+    monkeypatch.delattr(vosk, "_ffi", raising=False)
+    data = speech_to_text._waveform(recognizer, chunk)
+    assert isinstance(data, bytes) and data == b"\x01\x00\x02\x00"
+
+
+def test_find_wav_data_skips_other_chunks(tmp_path):
+    path = write_wav(tmp_path / "plain.wav", [LOUD])
+    raw = open(path, "rb").read()
+    offset, size = speech_to_text.find_wav_data(raw)
+    assert raw[offset:offset + size] == LOUD
+
+    # Insert an odd-sized LIST chunk (padded to even) ahead of the data
+    extra = b"LIST" + (3).to_bytes(4, "little") + b"abc\x00"
+    tagged = raw[:36] + extra + raw[36:]
+    offset, size = speech_to_text.find_wav_data(tagged)
+    assert tagged[offset:offset + size] == LOUD
+
+    with pytest.raises(ValueError):
+        speech_to_text.find_wav_data(b"RIFF\x00\x00\x00\x00WAVEfmt ")
+
+
+def test_ring_buffer_clear_is_not_a_drop():
+    buffer = speech_to_text.PcmRingBuffer(capacity=4)
+    buffer.put(b"a")
+    buffer.put(b"b")
+    assert buffer.clear() == 2
+    assert len(buffer) == 0
+    assert buffer.dropped_chunks == 0
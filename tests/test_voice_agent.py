@@ -1,9 +1,12 @@
 import os
+import time
 
 import pytest
 from unittest.mock import patch, MagicMock
 
-from langchain_core.messages import HumanMessage
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
 
 from voice_agent import (
     agent,
@@ -105,3 +108,346 @@ def test_tools_list_is_not_empty():
     assert "list_available_rooms_now_or_soon" in tool_names
 
 
+
+
+def test_import_is_lazy_and_needs_no_env():
+    """Importing the module must not load LangChain/Ollama or read .env."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, voice_agent;"
+        "heavy = [m for m in ('langchain', 'langchain_ollama', 'room_booking_client') if m in sys.modules];"
+        "print(heavy)"
+    )
+    env = {k: v for k, v in os.environ.items() if k not in ("SERVER_URL", "EMAIL", "PASSWORD")}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def test_lazy_attributes_are_cached():
+    import voice_agent
+    assert voice_agent.agent is voice_agent.get_agent()
+    assert voice_agent.llm is voice_agent.get_llm()
+    with pytest.raises(AttributeError):
+        voice_agent.not_a_real_attribute
+
+
+def test_split_sentences_regroups_tokens():
+    from voice_agent import split_sentences
+    tokens = ["Room", " A is", " free at 10.30. ", "Room B", "? Yes", "! Done"]
+    assert list(split_sentences(tokens)) == [
+        "Room A is free at 10.30.",
+        "Room B?",
+        "Yes!",
+        "Done",
+    ]
+
+
+def test_first_sentence_spoken_while_rest_generates():
+    import threading
+    import voice_agent
+
+    first_spoken = threading.Event()
+    spoken = []
+
+    def fake_speak(text, _test_force=False):
+        spoken.append(text)
+        first_spoken.set()
+
+    def tokens():
+        yield "Room A is free. "
+        # generation of the rest stalls until the first sentence is audible
+        assert first_spoken.wait(timeout=5), "first sentence was not spoken early"
+        yield "Room B is booked."
+
+    with patch.object(voice_agent, "speak", fake_speak):
+        speaker = voice_agent.SpeechQueue()
+        for sentence in voice_agent.split_sentences(tokens()):
+            speaker.say(sentence)
+        speaker.close()
+
+    assert spoken == ["Room A is free.", "Room B is booked."]
+    assert speaker.first_audio_at is not None
+
+
+def test_answer_and_speak_streams_agent_reply():
+    from langchain.agents import create_agent
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+    import voice_agent
+
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Room A is free. Enjoy!")]))
+    fake_agent = create_agent(llm, [])
+    speaker = MagicMock()
+
+    answer = voice_agent.answer_and_speak("any rooms?", speaker, agent=fake_agent)
+
+    assert answer == "Room A is free. Enjoy!"
+    assert [c.args[0] for c in speaker.say.call_args_list] == ["Room A is free.", "Enjoy!"]
+
+
+def fake_sr_recognizer(threshold=300.0):
+    from types import SimpleNamespace
+    return SimpleNamespace(energy_threshold=threshold, dynamic_energy_ratio=1.5)
+
+
+class FakeSource:
+    """An open speech_recognition source whose stream returns loud audio."""
+    SAMPLE_RATE = 400
+
+    def __init__(self):
+        self.reads = 0
+        self.stream = self
+
+    def read(self, frames):
+        self.reads += 1
+        time.sleep(0.005)
+        return b"\x58\x02" * frames      # constant 600 RMS
+
+
+def test_ambient_monitor_recalibrates_only_on_sustained_drift():
+    from voice_agent import AmbientMonitor
+    recognizer = fake_sr_recognizer()          # calibrated ambient level: 200
+    monitor = AmbientMonitor(FakeSource(), recognizer, smoothing=1.0,
+                             drift_ratio=0.5, settle_seconds=2.0)
+
+    assert not monitor.observe(250, now=0)     # within 50 % of 200
+    assert not monitor.observe(600, now=1)     # drift starts
+    assert not monitor.observe(200, now=2)     # back to normal: drift forgotten
+    assert not monitor.observe(600, now=3)
+    assert monitor.observe(600, now=5.5)       # sustained for 2.5 s
+    assert recognizer.energy_threshold == 900
+    assert monitor.recalibrations == 1
+
+
+def test_ambient_monitor_pauses_for_listening_and_ignores_busy_audio():
+    from voice_agent import AmbientMonitor
+    source = FakeSource()
+    monitor = AmbientMonitor(source, fake_sr_recognizer(), chunk_seconds=0.01).start()
+    try:
+        deadline = time.monotonic() + 5
+        while monitor.level is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert monitor.level is not None
+
+        with monitor.paused():
+            reads = source.reads
+            time.sleep(0.05)
+            assert source.reads == reads       # the listener owns the stream
+    finally:
+        monitor.stop()
+
+    busy = AmbientMonitor(FakeSource(), fake_sr_recognizer(), is_busy=lambda: True,
+                          chunk_seconds=0.01).start()
+    time.sleep(0.05)
+    busy.stop()
+    assert busy.level is None
+
+
+class FailingSource(FakeSource):
+    """A source whose first failures reads raise, like a dropped input device."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def read(self, frames):
+        if self.failures:
+            self.failures -= 1
+            self.reads += 1
+            raise OSError("Input overflowed")
+        return super().read(frames)
+
+
+def wait_for(condition, seconds=5):
+    deadline = time.monotonic() + seconds
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_ambient_monitor_retries_after_read_error(capsys):
+    from voice_agent import AmbientMonitor
+    monitor = AmbientMonitor(FailingSource(2), fake_sr_recognizer(), chunk_seconds=0.01,
+                             retry_seconds=0, max_read_errors=3).start()
+    try:
+        assert wait_for(lambda: monitor.level is not None)
+    finally:
+        monitor.stop()
+    assert monitor.read_errors == 2
+    assert monitor.failed is None
+    assert "Input overflowed" in capsys.readouterr().out
+
+
+def test_ambient_monitor_stops_visibly_after_repeated_read_errors(capsys):
+    from voice_agent import AmbientMonitor
+    source = FailingSource(100)
+    monitor = AmbientMonitor(source, fake_sr_recognizer(), chunk_seconds=0.01,
+                             retry_seconds=0, max_read_errors=3).start()
+    assert wait_for(lambda: not monitor._thread.is_alive())
+    assert source.reads == 3
+    assert monitor.failed == "OSError: Input overflowed"
+    assert "ambient monitor stopped" in capsys.readouterr().out
+    monitor.stop()
+
+
+def test_only_google_backend_needs_speech_recognition_errors():
+    import voice_agent
+    backend = voice_agent.make_speech_backend("text")
+    assert backend.not_understood == () and backend.service_errors == ()
+    assert voice_agent.VoskStreamingBackend.not_understood == ()
+
+
+def test_vosk_backend_returns_text_at_endpoint(monkeypatch):
+    import speech_to_text
+    import voice_agent
+    from speech_to_text import RecognitionEvent
+
+    class FakeMic:
+        def __init__(self, sample_rate, chunk_frames):
+            self.buffer = MagicMock()
+            self.stopped = False
+
+        def __iter__(self):
+            while True:
+                yield b"\x00" * 20
+
+        def stop(self):
+            self.stopped = True
+
+    consumed = []
+
+    def fake_stream(source, model_path, sample_rate):
+        consumed.extend(source)
+        yield RecognitionEvent("partial", "room")
+        yield RecognitionEvent("final", "room a")
+
+    monkeypatch.setattr(speech_to_text, "get_model", lambda path: None)
+    monkeypatch.setattr(speech_to_text, "MicrophoneSource", FakeMic)
+    monkeypatch.setattr(speech_to_text, "stream_transcribe", fake_stream)
+
+    partials = []
+    backend = voice_agent.VoskStreamingBackend(
+        "model", sample_rate=100, timeout=0.1, phrase_time_limit=0.1, on_partial=partials.append
+    )
+    assert backend.listen() == "room a"
+    assert partials == ["room"]
+    assert len(consumed) == 2                  # 0.2 s of 100 Hz audio, then the turn ends
+    backend.microphone.buffer.clear.assert_called_once()
+    backend.close()
+    assert backend.microphone.stopped
+
+
+def test_make_speech_backend_choices():
+    import voice_agent
+    assert isinstance(voice_agent.make_speech_backend("text"), voice_agent.TypedInputBackend)
+    with pytest.raises(ValueError):
+        voice_agent.make_speech_backend("carrier-pigeon")
+
+
+def test_answer_question_uses_fast_path_before_agent():
+    import voice_agent
+    router = MagicMock()
+    router.answer.return_value = "It's noon. Have lunch."
+    speaker = MagicMock()
+    fake_agent = MagicMock()
+
+    answer = voice_agent.answer_question("what time is it", speaker, fake_agent, router)
+
+    assert answer == "It's noon. Have lunch."
+    assert [c.args[0] for c in speaker.say.call_args_list] == ["It's noon.", "Have lunch."]
+    fake_agent.stream.assert_not_called()
+    router.record_agent.assert_not_called()
+
+
+def test_answer_question_falls_back_to_agent():
+    import voice_agent
+    router = MagicMock()
+    router.answer.return_value = None
+
+    cache = MagicMock()
+    cache.get.return_value = None
+
+    with patch.object(voice_agent, "answer_and_speak", return_value="From the LLM.") as slow:
+        answer = voice_agent.answer_question("summarise my week", MagicMock(), "agent", router, cache)
+
+    assert answer == "From the LLM."
+    slow.assert_called_once()
+    router.record_agent.assert_called_once()
+    cache.put.assert_called_once()
+
+
+class FakeToolModel(FakeMessagesListChatModel):
+    """Replays canned messages; bind_tools is a no-op so create_agent accepts it."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def make_room_agent(rooms_free, questions=1):
+    """
+    A real create_agent() graph whose model calls the free_rooms tool and
+    then answers "Room A is free." once per question. rooms_free["value"]
+    is what the tool returns. Returns (agent, llm, free_rooms).
+    """
+    from langchain.agents import create_agent
+
+    @tool
+    def free_rooms() -> str:
+        """Free rooms."""
+        return rooms_free["value"]
+
+    llm = FakeToolModel(responses=[
+        AIMessage(content="", tool_calls=[{"name": "free_rooms", "args": {}, "id": "1"}]),
+        AIMessage(content="Room A is free."),
+    ] * (questions + 1))                   # one spare turn: the list wraps around at its end
+    return create_agent(llm, [free_rooms]), llm, free_rooms
+
+
+def test_repeat_question_answered_from_cache_without_llm():
+    from answer_cache import AnswerCache
+    import voice_agent
+
+    rooms_free = {"value": "Room A"}
+    fake_agent, llm, free_rooms = make_room_agent(rooms_free, questions=2)
+    cache = AnswerCache(lambda name, args: free_rooms.invoke(args))
+    router = MagicMock()
+    router.answer.return_value = None
+
+    def ask(question):
+        return voice_agent.answer_question(question, MagicMock(), fake_agent, router, cache)
+
+    assert ask("Which rooms can I use?") == "Room A is free."
+    assert ask("which rooms can I use") == "Room A is free."
+    assert llm.i == 2                      # second answer never reached the model
+    assert cache.stats()["hits"] == 1
+
+    rooms_free["value"] = "Room B"         # bookings changed: the cached answer is stale
+    ask("which rooms can I use")
+    assert llm.i == 4
+    assert cache.stats()["stale"] == 1
+
+
+def test_agent_turn_traced_per_stage(tmp_path):
+    from latency_trace import Tracer
+    import json
+    import voice_agent
+
+    fake_agent, _, _ = make_room_agent({"value": "Room A"})
+    router = MagicMock()
+    router.answer.return_value = None
+    cache = MagicMock()
+    cache.get.return_value = None
+    trace = tmp_path / "trace.jsonl"
+    tracer = Tracer(str(trace))
+
+    voice_agent.answer_question("which rooms can I use", MagicMock(), fake_agent, router, cache, tracer)
+    tracer.close()
+
+    stages = [json.loads(line)["stage"] for line in trace.read_text().splitlines()]
+    assert stages == ["fast_path", "cache", "llm", "tool", "llm", "agent"]
+    assert json.loads(trace.read_text().splitlines()[3])["tool"] == "free_rooms"
@@ -18,9 +18,9 @@ from textual.widgets import (
 sys.path.insert(0, os.path.dirname(__file__))
 from db.database import (  # noqa: E402
     add_room,
-    get_all_rooms,
     get_bookings_for_room,
     get_room_by_id,
+    get_rooms_with_booking_counts,
     remove_room,
     save_deletion_report,
     update_room_capacity,
@@ -283,7 +283,7 @@ class RoomAdminApp(App):
     def on_mount(self) -> None:
         tbl = self.query_one("#rooms-table", DataTable)
         tbl.add_columns(
-            "ID", "Name", "Capacity", "Active", "Bookings"
+            "ID", "Name", "Capacity", "Active", "Bookings", "Next Booking"
         )
         self._reload()
         self._log(f"[bold green]Room Admin started.[/]  DB: {self.db_path}")
@@ -293,14 +293,14 @@ class RoomAdminApp(App):
     def _reload(self) -> None:
         tbl = self.query_one("#rooms-table", DataTable)
         tbl.clear()
-        for r in get_all_rooms(self.db_path):
-            bkgs = get_bookings_for_room(self.db_path, r["id"])
+        for r in get_rooms_with_booking_counts(self.db_path):
             tbl.add_row(
                 str(r["id"]),
                 r["room_name"],
                 str(r["capacity"]),
                 "✅" if r["is_active"] else "❌",
-                str(len(bkgs)),
+                str(r["booking_count"]),
+                r["next_booking"] or "—",
                 key=str(r["id"]),
             )
 
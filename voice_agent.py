@@ -1,39 +1,137 @@
-
 import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from dotenv import load_dotenv
-
-from langchain.agents import create_agent
-from langchain_core.messages import HumanMessage
-from langchain_ollama import ChatOllama
-
-from room_booking_client import (
-    get_current_datetime,
-    get_my_bookings_today,
-    get_bookings_for_room,
-    list_available_rooms_now_or_soon,
-)
-
-load_dotenv()
-
-
-llm = ChatOllama(
-    model="ibm/granite4:1b-h",
-    temperature=0.1,
-    base_url="http://localhost:11434"
-)
-
-
-tools = [
-    get_current_datetime,
-    get_my_bookings_today,
-    get_bookings_for_room,
-    list_available_rooms_now_or_soon,
-]
-
-
-agent = create_agent(llm, tools)
-
+from typing import Callable, Iterable, Iterator, Optional
+
+
+# ---------------------------------------------------------------------------
+# Lazily built LLM, tools and agent
+# ---------------------------------------------------------------------------
+# Nothing heavy happens at import time: LangChain, Ollama and the booking
+# client (with its .env check) are only loaded by the first get_*() call.
+# voice_agent.llm / .tools / .agent still work and resolve through
+# __getattr__ below.
+
+OLLAMA_MODEL = "ibm/granite4:1b-h"
+OLLAMA_BASE_URL = "http://localhost:11434"
+OLLAMA_KEEP_ALIVE = "30m"        # how long Ollama keeps the model loaded after a request
+OLLAMA_HEARTBEAT_SECONDS = 240   # background re-load interval; 0 warms up once only
+
+_llm = None
+def get_llm():
+    global _llm
+    if _llm is None:
+        from langchain_ollama import ChatOllama
+        _llm = ChatOllama(
+            model=OLLAMA_MODEL,
+            temperature=0.1,
+            base_url=OLLAMA_BASE_URL,
+            keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", OLLAMA_KEEP_ALIVE),
+        )
+    return _llm
+
+
+_tools = None
+def get_tools():
+    global _tools
+    if _tools is None:
+        from room_booking_client import (
+            get_current_datetime,
+            get_my_bookings_today,
+            get_bookings_for_room,
+            list_available_rooms_now_or_soon,
+        )
+        _tools = [
+            get_current_datetime,
+            get_my_bookings_today,
+            get_bookings_for_room,
+            list_available_rooms_now_or_soon,
+        ]
+    return _tools
+
+
+_agent = None
+def get_agent():
+    global _agent
+    if _agent is None:
+        from langchain.agents import create_agent
+        _agent = create_agent(get_llm(), get_tools())
+    return _agent
+
+
+_router = None
+def get_router():
+    global _router
+    if _router is None:
+        from intent_router import IntentRouter
+        _router = IntentRouter(get_tools())
+    return _router
+
+
+_answer_cache = None
+def get_answer_cache():
+    global _answer_cache
+    if _answer_cache is None:
+        from answer_cache import AnswerCache
+        from room_booking_client import add_change_listener
+
+        tools = {t.name: t for t in get_tools()}
+        _answer_cache = AnswerCache(lambda name, args: str(tools[name].invoke(args)))
+        add_change_listener(_answer_cache.invalidate)
+    return _answer_cache
+
+
+_tracer = None
+def get_tracer():
+    """Latency tracer; spans go to $VOICE_TRACE_FILE (JSONL) when it is set."""
+    global _tracer
+    if _tracer is None:
+        from latency_trace import Tracer
+        _tracer = Tracer(os.getenv("VOICE_TRACE_FILE") or None)
+    return _tracer
+
+
+def start_keep_alive(base_url: str = OLLAMA_BASE_URL, model: str = OLLAMA_MODEL, interval=None):
+    """
+    Warm the Ollama model up and keep it loaded from a background thread.
+    interval defaults to $OLLAMA_HEARTBEAT_SECONDS; requests are traced.
+    """
+    from ollama_warmup import OllamaKeepAlive
+
+    if interval is None:
+        interval = float(os.getenv("OLLAMA_HEARTBEAT_SECONDS", OLLAMA_HEARTBEAT_SECONDS))
+    tracer = get_tracer()
+
+    def on_request(kind, seconds, error):
+        if error is None:
+            tracer.record(kind, seconds)
+        else:
+            tracer.record(kind, seconds, error=type(error).__name__)
+
+    return OllamaKeepAlive(
+        base_url, model, os.getenv("OLLAMA_KEEP_ALIVE", OLLAMA_KEEP_ALIVE), interval, on_request=on_request
+    ).start()
+
+
+_LAZY_ATTRIBUTES = {
+    "llm": get_llm,
+    "tools": get_tools,
+    "agent": get_agent,
+    "router": get_router,
+    "answer_cache": get_answer_cache,
+    "tracer": get_tracer,
+}
+
+
+def __getattr__(name):
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
 
 
 _recognizer = None
@@ -82,6 +180,414 @@ def speak(text: str, _test_force: bool = False):
 
 
 
+# ---------------------------------------------------------------------------
+# Streaming answers → sentence-level TTS
+# ---------------------------------------------------------------------------
+
+# A sentence ends at . ! or ? (optionally closed by a quote/bracket) followed
+# by whitespace, so "3.5" or "10.30" inside a sentence do not split it.
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+def split_sentences(tokens: Iterable[str]) -> Iterator[str]:
+    """Regroup a stream of text fragments into whole sentences."""
+    buffer = ""
+    for token in tokens:
+        buffer += token
+        while True:
+            match = _SENTENCE_END.search(buffer)
+            if match is None:
+                break
+            sentence, buffer = buffer[:match.end()].strip(), buffer[match.end():]
+            if sentence:
+                yield sentence
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def stream_answer(text: str, agent=None, callbacks=None) -> Iterator[str]:
+    """
+    Yield the text of the agent's reply token by token as the model produces it.
+    Turns in which the model calls a tool are skipped; only its answer is streamed.
+    callbacks are LangChain callback handlers for the run (e.g. a ToolRecorder).
+    """
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    agent = agent or get_agent()
+    config = {"callbacks": callbacks} if callbacks else None
+    stream = agent.stream({"messages": [HumanMessage(content=text)]}, config, stream_mode="messages")
+    for chunk, metadata in stream:
+        # Streaming models send AIMessageChunks; others a single whole AIMessage
+        if not isinstance(chunk, AIMessage) or chunk.tool_calls or getattr(chunk, "tool_call_chunks", None):
+            continue
+        if isinstance(chunk.content, str) and chunk.content:
+            yield chunk.content
+
+
+class SpeechQueue:
+    """
+    Speaks queued sentences one after another on a background thread, so
+    the next sentence can be generated while the current one is playing.
+    The TTS engine is only ever driven from this worker thread.
+    """
+
+    def __init__(self, _test_force: bool = False):
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._force = _test_force
+        self.first_audio_at: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            sentence = self._queue.get()
+            try:
+                if sentence is None:
+                    return
+                if self.first_audio_at is None:
+                    self.first_audio_at = time.monotonic()
+                with get_tracer().span("tts", chars=len(sentence)):
+                    speak(sentence, _test_force=self._force)
+            finally:
+                self._queue.task_done()
+
+    def say(self, sentence: str) -> None:
+        self._queue.put(sentence)
+
+    def wait(self) -> None:
+        """Block until everything queued so far has been spoken."""
+        self._queue.join()
+
+    @property
+    def busy(self) -> bool:
+        """True while anything queued is still waiting to be, or being, spoken."""
+        return self._queue.unfinished_tasks > 0
+
+    def reset_timer(self) -> None:
+        self.first_audio_at = None
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+
+NO_ANSWER = "Sorry, I couldn't generate an answer."
+
+
+def answer_and_speak(text: str, speaker: SpeechQueue, agent=None, callbacks=None) -> str:
+    """
+    Stream the agent's answer to text into speaker sentence by sentence and
+    return the full answer once generation has finished.
+    """
+    sentences = []
+    for sentence in split_sentences(stream_answer(text, agent, callbacks)):
+        speaker.say(sentence)
+        sentences.append(sentence)
+    if not sentences:
+        speaker.say(NO_ANSWER)
+        return NO_ANSWER
+    return " ".join(sentences)
+
+
+def _speak_all(answer: str, speaker: SpeechQueue) -> str:
+    for sentence in split_sentences([answer]):
+        speaker.say(sentence)
+    return answer
+
+
+def answer_question(text: str, speaker: SpeechQueue, agent=None, router=None, cache=None,
+                    tracer=None) -> str:
+    """
+    Answer text, cheapest path first: the intent fast path, then a cached
+    answer whose tool data is unchanged, then the streaming agent (whose
+    answer is cached). Whichever path answers, the answer is spoken.
+    Each path is traced as a span; inside the agent every model and tool
+    call gets its own span too.
+    """
+    from answer_cache import ToolRecorder
+    from latency_trace import SpanCallbackHandler
+
+    router = router or get_router()
+    tracer = tracer or get_tracer()
+    started = time.perf_counter()
+    with tracer.span("fast_path") as span:
+        answer = router.answer(text)
+        span["hit"] = answer is not None
+    if answer is not None:
+        return _speak_all(answer, speaker)
+
+    cache = cache or get_answer_cache()
+    with tracer.span("cache") as span:
+        answer = cache.get(text)
+        span["hit"] = answer is not None
+    if answer is not None:
+        router.stats.record("cache", time.perf_counter() - started)
+        return _speak_all(answer, speaker)
+
+    recorder = ToolRecorder()
+    with tracer.span("agent"):
+        answer = answer_and_speak(text, speaker, agent, callbacks=[recorder, SpanCallbackHandler(tracer)])
+    router.record_agent(time.perf_counter() - started)
+    if answer != NO_ANSWER:
+        cache.put(text, answer, recorder.calls)
+    return answer
+
+
+# ---------------------------------------------------------------------------
+# Speech input backends
+# ---------------------------------------------------------------------------
+# Each backend keeps its microphone open across turns and exposes
+# listen() -> text (None when nothing was said) and close(), plus the
+# exception tuples not_understood and service_errors that listen() may
+# raise (only Google's are non-empty, so speech_recognition is imported
+# for that backend alone).
+# make_speech_backend() picks one from VOICE_BACKEND: "google" (default),
+# "vosk" (offline, streaming) or "text" (typed input).
+
+VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
+
+
+class AmbientMonitor:
+    """
+    Tracks the ambient noise level on an open speech_recognition source
+    between turns and recalibrates the recognizer only when it drifts.
+
+    While the main thread is not listening, a background thread reads short
+    chunks (which also keeps stale audio from piling up in the open stream)
+    and keeps a smoothed RMS level. When that level stays more than
+    drift_ratio away from the calibrated one for settle_seconds, the energy
+    threshold is reset the same way adjust_for_ambient_noise would set it.
+    Audio heard while is_busy() is true (e.g. our own TTS) is ignored.
+    A failed stream read is logged and retried after a growing pause;
+    after max_read_errors failures in a row the monitor gives up and
+    records why in failed.
+    """
+
+    def __init__(self, source, recognizer, is_busy: Optional[Callable[[], bool]] = None,
+                 chunk_seconds: float = 0.25, drift_ratio: float = 0.5,
+                 settle_seconds: float = 2.0, smoothing: float = 0.2,
+                 retry_seconds: float = 0.5, max_read_errors: int = 5):
+        self.source = source
+        self.recognizer = recognizer
+        self.is_busy = is_busy
+        self.chunk_frames = max(1, int(source.SAMPLE_RATE * chunk_seconds))
+        self.drift_ratio = drift_ratio
+        self.settle_seconds = settle_seconds
+        self.smoothing = smoothing
+        self.reference = recognizer.energy_threshold / recognizer.dynamic_energy_ratio
+        self.level: Optional[float] = None
+        self.recalibrations = 0
+        self.retry_seconds = retry_seconds
+        self.max_read_errors = max_read_errors
+        self.read_errors = 0
+        self.failed: Optional[str] = None
+        self._drift_since: Optional[float] = None
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._active.set()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="ambient-monitor", daemon=True)
+
+    def start(self) -> "AmbientMonitor":
+        self._thread.start()
+        return self
+
+    @contextmanager
+    def paused(self):
+        """Hold the source exclusively, e.g. for recognizer.listen()."""
+        self._active.clear()
+        with self._lock:
+            try:
+                yield
+            finally:
+                self._active.set()
+
+    def observe(self, rms: float, now: Optional[float] = None) -> bool:
+        """Fold one RMS reading into the level; returns True if it recalibrated."""
+        now = time.monotonic() if now is None else now
+        self.level = rms if self.level is None else self.level + self.smoothing * (rms - self.level)
+        if abs(self.level - self.reference) <= self.drift_ratio * self.reference:
+            self._drift_since = None
+            return False
+        if self._drift_since is None:
+            self._drift_since = now
+        if now - self._drift_since < self.settle_seconds:
+            return False
+        self.reference = self.level
+        self.recognizer.energy_threshold = self.level * self.recognizer.dynamic_energy_ratio
+        self.recalibrations += 1
+        self._drift_since = None
+        return True
+
+    def _run(self) -> None:
+        import numpy as np
+
+        failures = 0
+        while not self._stopped:
+            self._active.wait()
+            with self._lock:
+                if self._stopped or not self._active.is_set():
+                    continue
+                try:
+                    data = self.source.stream.read(self.chunk_frames)
+                except Exception as e:
+                    data, error = None, e
+            if data is None:
+                failures += 1
+                self.read_errors += 1
+                if failures >= self.max_read_errors:
+                    self.failed = f"{type(error).__name__}: {error}"
+                    self._stopped = True
+                    print(f"Warning: ambient monitor stopped, recalibration is off ({self.failed})")
+                    return
+                print(f"Warning: ambient monitor read failed ({type(error).__name__}: {error}), retrying")
+                time.sleep(self.retry_seconds * failures)
+                continue
+            failures = 0
+            if self.is_busy is not None and self.is_busy():
+                self._drift_since = None
+                continue
+            samples = np.frombuffer(data, dtype="<i2").astype(np.float32)
+            if samples.size:
+                self.observe(float(np.sqrt(np.mean(samples * samples))))
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._active.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2)
+
+
+class GoogleSpeechBackend:
+    """
+    speech_recognition + Google Web Speech. The microphone is opened and
+    calibrated once; an AmbientMonitor recalibrates it when the room changes.
+    """
+
+    not_understood: tuple = ()
+    service_errors: tuple = ()
+
+    def __init__(self, recognizer, is_busy: Optional[Callable[[], bool]] = None,
+                 calibrate_seconds: float = 1.0, timeout: float = 8, phrase_time_limit: float = 12):
+        import speech_recognition as sr
+
+        self.sr = sr
+        self.not_understood = (sr.UnknownValueError,)
+        self.service_errors = (sr.RequestError,)
+        self.recognizer = recognizer
+        self.timeout = timeout
+        self.phrase_time_limit = phrase_time_limit
+        self.microphone = sr.Microphone()
+        self.source = self.microphone.__enter__()
+        print("Calibrating for ambient noise...")
+        with get_tracer().span("calibrate"):
+            recognizer.adjust_for_ambient_noise(self.source, duration=calibrate_seconds)
+        self.monitor = AmbientMonitor(self.source, recognizer, is_busy).start()
+
+    def listen(self) -> Optional[str]:
+        with self.monitor.paused():
+            print("\nListening...")
+            try:
+                with get_tracer().span("listen", backend="google"):
+                    audio = self.recognizer.listen(
+                        self.source, timeout=self.timeout, phrase_time_limit=self.phrase_time_limit
+                    )
+            except self.sr.WaitTimeoutError:
+                return None
+        with get_tracer().span("recognize", backend="google"):
+            return self.recognizer.recognize_google(audio)
+
+    def close(self) -> None:
+        self.monitor.stop()
+        self.microphone.__exit__(None, None, None)
+
+
+class VoskStreamingBackend:
+    """
+    Offline recognition with Vosk (see speech_to_text). Audio is decoded
+    while the user speaks and the text is returned as soon as Vosk's
+    endpointing closes the utterance — no upload after the fact.
+    """
+
+    not_understood: tuple = ()
+    service_errors: tuple = ()
+
+    def __init__(self, model_path: str = VOSK_MODEL_PATH, sample_rate: int = 16000,
+                 timeout: float = 8, phrase_time_limit: float = 12,
+                 on_partial: Optional[Callable[[str], None]] = None):
+        import speech_to_text
+
+        self.stt = speech_to_text
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.max_turn_bytes = int((timeout + phrase_time_limit) * sample_rate) * 2
+        self.on_partial = on_partial
+        with get_tracer().span("load_model"):
+            speech_to_text.get_model(model_path)   # load now rather than on the first question
+        # 100 ms chunks so endpointing is noticed quickly
+        self.microphone = speech_to_text.MicrophoneSource(sample_rate, chunk_frames=sample_rate // 10)
+        self._chunks = iter(self.microphone)
+
+    def _turn(self) -> Iterator[bytes]:
+        heard = 0
+        for data in self._chunks:
+            yield data
+            heard += len(data)
+            if heard >= self.max_turn_bytes:
+                return
+
+    def listen(self) -> Optional[str]:
+        self.microphone.buffer.clear()      # drop whatever was captured while we were talking
+        print("\nListening...")
+        # Recognition runs while the user speaks, so one span covers both
+        with get_tracer().span("listen", backend="vosk"):
+            events = self.stt.stream_transcribe(self._turn(), self.model_path, self.sample_rate)
+            for event in events:
+                if event.is_final:
+                    return event.text
+                if self.on_partial is not None:
+                    self.on_partial(event.text)
+            return None
+
+    def close(self) -> None:
+        self.microphone.stop()
+        self._chunks.close()
+
+
+class TypedInputBackend:
+    """Keyboard fallback when no speech input is available."""
+
+    not_understood: tuple = ()
+    service_errors: tuple = ()
+
+    def listen(self) -> Optional[str]:
+        with get_tracer().span("listen", backend="text"):
+            return input("Speech not available - enter text: ").strip() or None
+
+    def close(self) -> None:
+        pass
+
+
+def make_speech_backend(kind: Optional[str] = None, is_busy: Optional[Callable[[], bool]] = None):
+    """Build the speech input backend named by kind or $VOICE_BACKEND."""
+    kind = (kind or os.getenv("VOICE_BACKEND", "google")).lower()
+    try:
+        if kind == "vosk":
+            return VoskStreamingBackend(
+                os.getenv("VOSK_MODEL_PATH", VOSK_MODEL_PATH),
+                on_partial=lambda text: print(f"  … {text}", end="\r", flush=True),
+            )
+        if kind == "google":
+            recognizer = get_recognizer()
+            if recognizer is not None:
+                return GoogleSpeechBackend(recognizer, is_busy)
+        elif kind != "text":
+            raise ValueError(f"Unknown VOICE_BACKEND: {kind!r} (use google, vosk or text)")
+    except (ImportError, OSError, AttributeError) as e:  # no PyAudio / no input device
+        print(f"Warning: {kind} speech input unavailable: {e}")
+    return TypedInputBackend()
+
+
 if __name__ == "__main__":
     print("Voice agent started (updated LangChain/LangGraph + local Ollama).")
     print("Make sure Ollama is running with your model pulled.")
@@ -91,51 +597,67 @@ if __name__ == "__main__":
     print("  - What rooms are available right now?")
     print("  - When is my reservation for Room A?")
 
-    import speech_recognition as sr   # only imported here – safe for normal runs
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    keep_alive = start_keep_alive()   # model loads while the microphone is set up
+    agent = get_agent()
+    tracer = get_tracer()
+    speaker = SpeechQueue()
+
+    backend = make_speech_backend(is_busy=lambda: speaker.busy)
 
     while True:
+        speaker.wait()   # finish any pending speech before listening again
         try:
             # CI/test fallback – never reached in pytest
             if 'CI' in os.environ or 'GITHUB_ACTIONS' in os.environ or 'PYTEST_CURRENT_TEST' in os.environ:
                 text = ""
                 break
-            else:
-                recognizer = get_recognizer()
-                if recognizer is None:
-                    text = input("Speech not available - enter text: ").strip()
-                else:
-                    with sr.Microphone() as source:
-                        print("\nListening...")
-                        recognizer.adjust_for_ambient_noise(source, duration=1)
-                        audio = recognizer.listen(source, timeout=8, phrase_time_limit=12)
-                    text = recognizer.recognize_google(audio)
+
+            tracer.new_turn()
+            text = backend.listen()
+            if not text:
+                continue
 
             print(f"You said: {text}")
 
             if any(word in text.lower() for word in ["exit", "quit", "stop", "bye"]):
-                speak("Goodbye!")
+                speaker.say("Goodbye!")
                 break
 
-            # Run agent
-            response = agent.invoke({"messages": [HumanMessage(content=text)]})
-
-            messages = response.get("messages", [])
-            if messages:
-                final_msg = messages[-1]
-                answer = final_msg.content.strip() if hasattr(final_msg, "content") else str(final_msg)
-            else:
-                answer = "Sorry, I couldn't generate an answer."
-
+            # Stream the answer; the first sentence is spoken while the rest generates
+            speaker.reset_timer()
+            asked_at = time.monotonic()
+            with tracer.span("answer"):
+                answer = answer_question(text, speaker, agent)
             print("Answer:", answer)
-            speak(answer)
-
-        except sr.WaitTimeoutError:
-            continue
-        except sr.UnknownValueError:
-            speak("Sorry, I didn't catch that. Could you repeat?")
-        except sr.RequestError as e:
+            speaker.wait()
+            if speaker.first_audio_at is not None:
+                tracer.record("first_audio", speaker.first_audio_at - asked_at)
+                print(f"(first audio after {speaker.first_audio_at - asked_at:.2f}s)")
+
+        except backend.not_understood:
+            speaker.say("Sorry, I didn't catch that. Could you repeat?")
+        except backend.service_errors as e:
             print(f"Speech recognition error: {e}")
-            speak("Problem with speech recognition right now.")
+            speaker.say("Problem with speech recognition right now.")
         except Exception as e:
             print(f"Error: {type(e).__name__}: {str(e)}")
-            speak("Something went wrong. Please try again.")
\ No newline at end of file
+            speaker.say("Something went wrong. Please try again.")
+
+    backend.close()
+    speaker.close()
+    keep_alive.stop()
+
+    report = get_router().report()
+    if report["questions"]:
+        print(f"\nFast path answered {report['fast_path_hit_rate']:.0%} of {report['questions']} questions")
+        for path in ("fast", "cache", "agent"):
+            if report.get(path, {}).get("count"):
+                print(f"  {path:<5}: {report[path]['count']} × median {report[path]['median_ms']} ms")
+
+    if os.getenv("VOICE_TRACE_SUMMARY"):
+        print("\nLatency per stage:")
+        print(tracer.format_summary())
+    tracer.close()